@@ -1,15 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from jobspy import scrape_jobs
 import csv
-from datetime import datetime
-import pandas as pd
-from langchain_ollama.llms import OllamaLLM
-from langchain_core.prompts import ChatPromptTemplate
-import PyPDF2
-from docx import Document  # Updated import
-import openpyxl
-from openpyxl.styles import PatternFill
+from exporter import FORMATS
+from pipeline import JobPipeline, build_search, RUN_MODULES, SITES
+from worker import TaskRunner, Cancelled, warm_imports
+
+# LangChain, PyPDF2 and python-docx load in the background after the window appears
+LLM_MODULES = ['scoring', 'prefilter', 'condense', 'resume']
 
 class JobSearchApp:
     def __init__(self, root):
@@ -19,6 +16,12 @@ class JobSearchApp:
         
         # Initialize resume content
         self.resume_content = None
+        self.resume_profile = None
+        
+        # Shared scorer reuses one LLM chain across all jobs; created on first use
+        self._scorer = None
+        self._prefilter = None
+        self._condenser = None
         
         # Create main frame
         main_frame = ttk.Frame(root, padding="10")
@@ -26,7 +29,7 @@ class JobSearchApp:
         
         # Job Sites
         ttk.Label(main_frame, text="Job Sites:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.sites = ["indeed", "linkedin", "zip_recruiter", "glassdoor", "google"]
+        self.sites = SITES
         self.site_vars = {}
         site_frame = ttk.Frame(main_frame)
         site_frame.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
@@ -72,17 +75,89 @@ class JobSearchApp:
         self.resume_label.grid(row=8, column=1, sticky=tk.W, pady=5)
         ttk.Button(main_frame, text="Upload Resume", command=self.upload_resume).grid(row=8, column=2, pady=5)
         
+        # Concurrent LLM requests
+        ttk.Label(main_frame, text="Parallel LLM requests:").grid(row=9, column=0, sticky=tk.W, pady=5)
+        self.llm_workers = ttk.Entry(main_frame, width=10)
+        self.llm_workers.insert(0, "4")
+        self.llm_workers.grid(row=9, column=1, sticky=tk.W, pady=5)
+        
+        # Cache bypass for this run
+        self.skip_cache = tk.BooleanVar()
+        ttk.Checkbutton(main_frame, text="Skip LLM cache", variable=self.skip_cache).grid(row=10, column=0, columnspan=2, sticky=tk.W, pady=5)
+        
+        # Embedding prefilter cutoffs
+        ttk.Label(main_frame, text="Min. resume similarity:").grid(row=11, column=0, sticky=tk.W, pady=5)
+        self.similarity_threshold = ttk.Entry(main_frame, width=10)
+        self.similarity_threshold.insert(0, "0.35")
+        self.similarity_threshold.grid(row=11, column=1, sticky=tk.W, pady=5)
+        
+        ttk.Label(main_frame, text="Top-K jobs for LLM (blank = all):").grid(row=12, column=0, sticky=tk.W, pady=5)
+        self.top_k = ttk.Entry(main_frame, width=10)
+        self.top_k.grid(row=12, column=1, sticky=tk.W, pady=5)
+        
+        # Jobs packed into each LLM prompt
+        ttk.Label(main_frame, text="Jobs per LLM prompt:").grid(row=13, column=0, sticky=tk.W, pady=5)
+        self.batch_size = ttk.Entry(main_frame, width=10)
+        self.batch_size.insert(0, "1")
+        self.batch_size.grid(row=13, column=1, sticky=tk.W, pady=5)
+        
+        # Token budget for each condensed description
+        ttk.Label(main_frame, text="Description token budget (blank = full):").grid(row=14, column=0, sticky=tk.W, pady=5)
+        self.token_budget = ttk.Entry(main_frame, width=10)
+        self.token_budget.insert(0, "600")
+        self.token_budget.grid(row=14, column=1, sticky=tk.W, pady=5)
+        
+        # Export Format
+        ttk.Label(main_frame, text="Export format:").grid(row=15, column=0, sticky=tk.W, pady=5)
+        self.export_format = ttk.Combobox(main_frame, values=FORMATS, state="readonly")
+        self.export_format.set("xlsx")
+        self.export_format.grid(row=15, column=1, sticky=tk.W, pady=5)
+        
         # Progress Text
         self.progress_text = tk.Text(main_frame, height=10, width=60)
-        self.progress_text.grid(row=9, column=0, columnspan=3, pady=10)
+        self.progress_text.grid(row=16, column=0, columnspan=3, pady=10)
         
-        # Search Button
-        ttk.Button(main_frame, text="Search Jobs", command=self.search_jobs).grid(row=10, column=0, columnspan=3, pady=10)
+        # Search and Cancel Buttons
+        self.search_button = ttk.Button(main_frame, text="Search Jobs", command=self.search_jobs)
+        self.search_button.grid(row=17, column=0, pady=10)
+        self.cancel_button = ttk.Button(main_frame, text="Cancel", command=self.cancel_search, state=tk.DISABLED)
+        self.cancel_button.grid(row=17, column=1, sticky=tk.W, pady=10)
+        
+        # Search runs on a worker thread; the Tk loop drains its progress queue
+        self.tasks = TaskRunner(root, self.show_progress, on_finished=self.search_finished)
+
+        # Load the LLM stack and jobspy while the user fills in the form
+        warm_imports(root, LLM_MODULES + RUN_MODULES)
+
+    @property
+    def scorer(self):
+        if self._scorer is None:
+            from llm_cache import VerdictCache
+            from scoring import JobScorer
+            self._scorer = JobScorer(log=self.log_progress, cache=VerdictCache())
+        return self._scorer
+
+    @property
+    def prefilter(self):
+        if self._prefilter is None:
+            from prefilter import EmbeddingCache, EmbeddingPrefilter
+            self._prefilter = EmbeddingPrefilter(cache=EmbeddingCache(), log=self.log_progress)
+        return self._prefilter
+
+    @property
+    def condenser(self):
+        if self._condenser is None:
+            from condense import DescriptionCondenser
+            self._condenser = DescriptionCondenser()
+        return self._condenser
 
     def log_progress(self, message):
-        self.progress_text.insert(tk.END, f"{message}\n")
+        self.tasks.log(message)
+
+    def show_progress(self, messages):
+        # One insert and one scroll for every batch of queued lines
+        self.progress_text.insert(tk.END, "\n".join(messages) + "\n")
         self.progress_text.see(tk.END)
-        self.root.update()
 
     def upload_resume(self):
         file_path = filedialog.askopenfilename(
@@ -92,147 +167,81 @@ class JobSearchApp:
             self.resume_content = self.parse_resume(file_path)
             self.resume_label.config(text=file_path.split("/")[-1])
             self.log_progress("Resume uploaded successfully")
+            if self.resume_profile is not None and not self.resume_profile.is_empty():
+                self.log_progress("Resume profile:\n" + self.resume_profile.summary())
 
     def parse_resume(self, file_path):
-        """Parse resume content from PDF or DOCX file"""
-        if file_path.endswith('.pdf'):
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
-        elif file_path.endswith('.docx'):
-            # Updated DOCX parsing using python-docx
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            # Also extract text from tables if present
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
-            return text
-        return None
-
-    def analyze_job_fit(self, job_description):
-        """Use Ollama to analyze job fit based on resume"""
-        if not self.resume_content:
-            return "Not Apply (No Resume)"
-        
-        try:
-            llm = OllamaLLM(model="llama3.2:latest")
-            template = """
-            Based on the following resume and job description, categorize this job as either:
-            1. "Not Apply" (clear mismatches)
-            2. "Should Apply" (good fit with some gaps)
-            3. "Must Apply" (excellent fit)
-            
-            Resume:
-            {resume}
-            
-            Job Description:
-            {job_description}
-            
-            Respond with only one of the three categories listed above.
-            """
-            
-            prompt = ChatPromptTemplate.from_template(template)
-            chain = prompt | llm
-            
-            result = chain.invoke({
-                "resume": self.resume_content,
-                "job_description": job_description
-            })
-            
-            return result.strip()
-        except Exception as e:
-            self.log_progress(f"Error in job analysis: {str(e)}")
-            return "Analysis Error"
+        """Parse resume content from PDF or DOCX file (cached by file content)"""
+        from resume import load_resume
+        self.resume_content, self.resume_profile = load_resume(file_path)
+        return self.resume_content
 
     def search_jobs(self):
+        """Read the form on the Tk thread, then search in the background"""
+        if self.tasks.running:
+            return
+        try:
+            # Validate inputs and build the saved search
+            top_k = self.top_k.get().strip()
+            budget = self.token_budget.get().strip()
+            search = build_search(
+                sites=[site for site, var in self.site_vars.items() if var.get()],
+                search_term=self.search_term.get(),
+                location=self.location.get(),
+                results_wanted=int(self.results_wanted.get()),
+                country=self.country.get(),
+                job_type=self.job_type.get() or None,
+                is_remote=self.is_remote.get(),
+                analyze=True,
+                resume_text=self.resume_content,
+                resume_profile=self.resume_profile,
+                llm_workers=max(1, int(self.llm_workers.get())),
+                batch_size=max(1, int(self.batch_size.get())),
+                use_cache=not self.skip_cache.get(),
+                similarity_threshold=float(self.similarity_threshold.get() or 0),
+                top_k=int(top_k) if top_k else None,
+                token_budget=int(budget) if budget else 0,
+                export_format=self.export_format.get(),
+            )
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {str(e)}")
+            return
+        
+        self.search_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.tasks.start(lambda: self.run_search(search))
+
+    def cancel_search(self):
+        self.log_progress("Cancelling: waiting for in-flight requests to finish...")
+        self.cancel_button.config(state=tk.DISABLED)
+        self.tasks.cancel()
+
+    def search_finished(self):
+        self.search_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def run_search(self, search):
+        """Scrape, analyze and export on the worker thread"""
+        pipeline = JobPipeline(
+            log=self.log_progress, cancel_event=self.tasks.cancel_event,
+            scorer=self.scorer, prefilter=self.prefilter, condenser=self.condenser
+        )
         try:
-            # Validate inputs and create parameters dict
-            params = {
-                'site': [site for site, var in self.site_vars.items() if var.get()],
-                'search_term': self.search_term.get(),
-                'location': self.location.get(),
-                'results_wanted': int(self.results_wanted.get()),
-                'country': self.country.get(),
-            }
-            
-            if self.job_type.get():
-                params['job_type'] = self.job_type.get()
-            if self.is_remote.get():
-                params['remote'] = True
-                
             self.log_progress("Starting job search...")
-            jobs = scrape_jobs(**params)
-            
-            if len(jobs) == 0:
-                self.log_progress("No jobs found matching your criteria.")
+            summary = pipeline.run(search)
+            if not summary['filename']:
                 return
             
-            # Create DataFrame with additional category column
-            jobs_filtered = pd.DataFrame(columns=[
-                'site', 'title', 'company', 'location', 'date_posted',
-                'salary_min', 'salary_max', 'salary_interval', 'job_url',
-                'description', 'category'
-            ])
-            
-            # Analyze each job
-            total_jobs = len(jobs)
-            for index, job in jobs.iterrows():
-                self.log_progress(f"Analyzing job {index + 1}/{total_jobs}")
-                category = self.analyze_job_fit(job['description'])
-                job['category'] = category
-                jobs_filtered = pd.concat([jobs_filtered, pd.DataFrame([job])], ignore_index=True)
-            
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"job_search_results_{timestamp}.xlsx"
-            
-            # Export to Excel with colors
-            writer = pd.ExcelWriter(filename, engine='openpyxl')
-            jobs_filtered.to_excel(writer, index=False, sheet_name='Jobs')
-            
-            # Apply conditional formatting
-            workbook = writer.book
-            worksheet = writer.sheets['Jobs']
-            
-            # Define colors for categories
-            category_colors = {
-                'Not Apply': 'FFB6C1',  # Light red
-                'Should Apply': 'FFFACD',  # Light yellow
-                'Must Apply': '90EE90'  # Light green
-            }
-            
-            # Apply colors based on category
-            category_col = jobs_filtered.columns.get_loc('category') + 1
-            for row in range(2, len(jobs_filtered) + 2):
-                category = worksheet.cell(row=row, column=category_col).value
-                if category in category_colors:
-                    fill = PatternFill(start_color=category_colors[category],
-                                     end_color=category_colors[category],
-                                     fill_type='solid')
-                    for col in range(1, len(jobs_filtered.columns) + 1):
-                        worksheet.cell(row=row, column=col).fill = fill
-            
-            writer.close()
-            
-            self.log_progress(f"Found {len(jobs_filtered)} jobs")
-            self.log_progress(f"Results exported to: {filename}")
-            
             # Show success message
-            messagebox.showinfo("Success", 
-                              f"Search completed!\nFound {len(jobs_filtered)} jobs\n"
-                              f"Results saved to {filename}")
+            self.tasks.call(messagebox.showinfo, "Success", 
+                            f"Search completed!\nFound {summary['jobs']} jobs\n"
+                            f"Results saved to {summary['filename']}")
             
+        except Cancelled:
+            raise
         except Exception as e:
             self.log_progress(f"Error: {str(e)}")
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            self.tasks.call(messagebox.showerror, "Error", f"An error occurred: {str(e)}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,60 @@
+"""Pages per second of the blocking and async JobScrapers against a local stub.
+
+Usage: python benchmarks/bench_async_scrape.py [--pages 20] [--latency 0.1] [--per-site 4]
+
+Both scrapers hit the same localhost server (benchmarks/stub_site.py),
+which delays every response by --latency seconds to stand in for network
+round trips. Rate limits are lifted so only fetching and parsing is timed.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "outdated"))
+from async_jobs import AsyncJobScraper  # noqa: E402
+from jobs import JobScraper  # noqa: E402
+from rate_limit import DomainRateLimiter  # noqa: E402
+from stub_site import StubSite  # noqa: E402
+
+
+def unlimited() -> DomainRateLimiter:
+    return DomainRateLimiter(default_rate=1e6, default_burst=1e6)
+
+
+def pointed_at(stub: StubSite) -> JobScraper:
+    scraper = JobScraper(rate_limiter=unlimited(), use_cache=False)
+    scraper.LINKEDIN_URL = f"{stub.url}/linkedin"
+    scraper.INDEED_URL = f"{stub.url}/indeed"
+    return scraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="pages per site")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub server delay per request, seconds")
+    parser.add_argument("--per-site", type=int, default=4, help="async requests in flight per site")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'scraper':<8} {'pages':>6} {'jobs':>6} {'seconds':>9} {'pages/s':>9}")
+    with StubSite(latency=args.latency) as stub:
+        scraper = pointed_at(stub)
+        start = time.perf_counter()
+        scraper.scrape_linkedin("data engineer", "Austin, TX", args.pages)
+        scraper.scrape_indeed("data engineer", "Austin, TX", args.pages)
+        elapsed = time.perf_counter() - start
+        print(f"{'sync':<8} {2 * args.pages:>6} {len(scraper.jobs_data):>6} {elapsed:>9.2f} {2 * args.pages / elapsed:>9.1f}")
+
+        scraper = AsyncJobScraper(parser=pointed_at(stub), per_site=args.per_site, rate_limiter=unlimited())
+        start = time.perf_counter()
+        jobs = scraper.run("data engineer", "Austin, TX", args.pages)
+        elapsed = time.perf_counter() - start
+        print(f"{'async':<8} {scraper.pages_fetched:>6} {len(jobs):>6} {elapsed:>9.2f} {scraper.pages_fetched / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
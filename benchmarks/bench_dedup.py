@@ -0,0 +1,84 @@
+"""Time cross-site deduplication on synthetic postings with known duplicates.
+
+Usage: python benchmarks/bench_dedup.py [--rows 10000 100000] [--copies 3]
+
+Each synthetic posting is copied to up to --copies boards with the kind of
+noise boards add (title abbreviations, company suffixes, country suffixes on
+the location, a trailing "apply" line, a few dropped words). Precision and
+recall are measured against the known clusters.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dedup import JobDeduplicator  # noqa: E402
+
+SITES = ["indeed", "linkedin", "zip_recruiter", "glassdoor", "google"]
+
+
+def make_postings(rows: int, copies: int = 3, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{n}" for n in range(5000)])
+    levels = ["Senior", "Sr.", "Junior", "Lead", "Staff", ""]
+    roles = ["Data Engineer", "Software Engineer", "ML Engineer", "Data Analyst", "Product Manager"]
+    suffixes = ["", " Inc.", " LLC", ", Inc"]
+
+    records = []
+    posting = 0
+    while len(records) < rows:
+        company = f"Company {rng.integers(0, max(rows // 20, 1))}"
+        title = f"{rng.choice(levels)} {rng.choice(roles)}".strip()
+        location = rng.choice(["Austin, TX", "New York, NY", "Remote", "Toronto, ON"])
+        words = rng.choice(vocabulary, rng.integers(80, 300))
+        for copy in range(rng.integers(1, copies + 1)):
+            text = words if copy == 0 else np.delete(words, rng.integers(0, len(words), 3))
+            records.append({
+                'site': SITES[copy % len(SITES)],
+                'title': title.replace("Senior", "Sr.") if copy == 1 else title,
+                'company': company + suffixes[copy % len(suffixes)],
+                'location': location + (", US" if copy == 2 else ""),
+                'job_url': f"https://example.com/{posting}/{copy}",
+                'description': " ".join(text) + ("\nApply today!" if copy else ""),
+                'truth': posting,
+            })
+        posting += 1
+    return pd.DataFrame(records[:rows])
+
+
+def pair_scores(truth: np.ndarray, clusters: np.ndarray):
+    """Pairwise precision and recall of predicted clusters against the truth."""
+    def pairs(labels):
+        counts = pd.Series(labels).value_counts().to_numpy()
+        return int((counts * (counts - 1) // 2).sum())
+
+    both = pairs(pd.Series(truth).astype(str) + "/" + pd.Series(clusters).astype(str))
+    predicted, actual = pairs(clusters), pairs(truth)
+    return (both / predicted if predicted else 1.0), (both / actual if actual else 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--copies", type=int, default=3, help="maximum boards per posting")
+    args = parser.parse_args()
+
+    deduplicator = JobDeduplicator()
+    print(f"{'rows':>8} {'unique':>8} {'kept':>8} {'seconds':>9} {'rows/s':>10} {'precision':>10} {'recall':>8}")
+    for rows in args.rows:
+        jobs = make_postings(rows, args.copies)
+        start = time.perf_counter()
+        clusters = deduplicator.cluster(jobs)
+        result = deduplicator.dedupe(jobs, clusters)
+        elapsed = time.perf_counter() - start
+        precision, recall = pair_scores(jobs['truth'].to_numpy(), clusters)
+        print(f"{rows:>8} {jobs['truth'].nunique():>8} {len(result):>8} {elapsed:>9.2f} "
+              f"{rows / elapsed:>10.0f} {precision:>10.3f} {recall:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
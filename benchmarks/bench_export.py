@@ -0,0 +1,85 @@
+"""Compare export formats on synthetic scored job tables.
+
+Usage: python benchmarks/bench_export.py [--rows 1000 10000 100000] [--legacy-max 10000]
+
+The "xlsx-legacy" row reproduces the old exporter (pd.ExcelWriter plus one
+PatternFill per coloured row, assigned cell by cell) for comparison.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles import PatternFill
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from exporter import CATEGORY_COLORS, export_jobs  # noqa: E402
+
+
+def make_jobs(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    words = np.array("python data engineer remote senior cloud team build api sql ml platform".split())
+    return pd.DataFrame({
+        'site': rng.choice(["indeed", "linkedin", "zip_recruiter", "glassdoor", "google"], rows),
+        'title': [" ".join(rng.choice(words, 3)) for _ in range(rows)],
+        'company': [f"Company {n}" for n in rng.integers(0, rows // 5 + 1, rows)],
+        'location': rng.choice(["New York, NY", "Austin, TX", "Remote", "Toronto, ON"], rows),
+        'date_posted': pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 30, rows), unit="D"),
+        'salary_min': rng.integers(50, 150, rows) * 1000.0,
+        'salary_max': rng.integers(150, 250, rows) * 1000.0,
+        'salary_interval': "yearly",
+        'job_url': [f"https://example.com/jobs/{n}" for n in range(rows)],
+        'description': [" ".join(rng.choice(words, 150)) for _ in range(rows)],
+        'category': rng.choice(list(CATEGORY_COLORS), rows),
+    })
+
+
+def legacy_xlsx(df: pd.DataFrame, filename: str):
+    writer = pd.ExcelWriter(filename, engine='openpyxl')
+    df.to_excel(writer, index=False, sheet_name='Jobs')
+    worksheet = writer.sheets['Jobs']
+    category_col = df.columns.get_loc('category') + 1
+    for row in range(2, len(df) + 2):
+        category = worksheet.cell(row=row, column=category_col).value
+        if category in CATEGORY_COLORS:
+            fill = PatternFill(start_color=CATEGORY_COLORS[category],
+                               end_color=CATEGORY_COLORS[category],
+                               fill_type='solid')
+            for col in range(1, len(df.columns) + 1):
+                worksheet.cell(row=row, column=col).fill = fill
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="skip the legacy exporter above this many rows")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench_export_")
+    print(f"{'rows':>8} {'format':<12} {'seconds':>9} {'rows/s':>10} {'MB':>8}")
+    for rows in args.rows:
+        df = make_jobs(rows)
+        runs = [(fmt, lambda path, fmt=fmt: export_jobs(df, path, fmt)) for fmt in ("xlsx", "csv", "parquet", "jsonl")]
+        if rows <= args.legacy_max:
+            runs.insert(0, ("xlsx-legacy", lambda path: legacy_xlsx(df, path)))
+        for name, run in runs:
+            path = os.path.join(directory, f"jobs_{rows}.{name.split('-')[0]}")
+            start = time.perf_counter()
+            try:
+                run(path)
+            except ImportError as e:
+                print(f"{rows:>8} {name:<12} skipped: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path) / 1e6
+            print(f"{rows:>8} {name:<12} {elapsed:>9.2f} {rows / elapsed:>10.0f} {size:>8.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
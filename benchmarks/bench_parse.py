@@ -0,0 +1,92 @@
+"""Cards per second of JobScraper's page parsers on saved fixture pages.
+
+Usage: python benchmarks/bench_parse.py [--repeat 200]
+
+The "legacy" rows reproduce the old parsers (whole page through
+BeautifulSoup's html.parser, every field looked up twice per card) so the
+lxml single-pass parsers can be compared against them. Both must produce
+identical records.
+"""
+import argparse
+from datetime import datetime
+import logging
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, os.path.join(ROOT, "outdated"))
+from jobs import JobScraper  # noqa: E402
+
+
+def legacy_linkedin(scraper: JobScraper, page_html: str) -> list:
+    soup = BeautifulSoup(page_html, 'html.parser')
+    jobs = []
+    for card in soup.find_all('div', class_='job-search-card'):
+        jobs.append({
+            'platform': 'LinkedIn',
+            'title': scraper.clean_text(card.find('h3', class_='base-search-card__title').text if card.find('h3', class_='base-search-card__title') else 'N/A'),
+            'company': scraper.clean_text(card.find('h4', class_='base-search-card__subtitle').text if card.find('h4', class_='base-search-card__subtitle') else 'N/A'),
+            'location': scraper.clean_text(card.find('span', class_='job-search-card__location').text if card.find('span', class_='job-search-card__location') else 'N/A'),
+            'date_posted': scraper.format_date(card.find('time')['datetime'] if card.find('time') else datetime.now().strftime('%Y-%m-%d')),
+            'link': card.find('a', class_='base-card__full-link')['href'] if card.find('a', class_='base-card__full-link') else 'N/A',
+            'salary': scraper.clean_text(card.find('span', class_='job-search-card__salary-info').text if card.find('span', class_='job-search-card__salary-info') else 'Not specified')
+        })
+    return jobs
+
+
+def legacy_indeed(scraper: JobScraper, page_html: str) -> list:
+    soup = BeautifulSoup(page_html, 'html.parser')
+    job_cards = soup.find_all('div', class_='job_seen_beacon') or soup.find_all('div', class_='tapItem')
+    jobs = []
+    for card in job_cards:
+        title_elem = card.find('h2', class_='jobTitle') or card.find('a', class_='jcs-JobTitle')
+        company_elem = card.find('span', class_='companyName') or card.find('div', class_='company_location')
+        location_elem = card.find('div', class_='companyLocation') or card.find('div', class_='company_location')
+        date_elem = card.find('span', class_='date') or card.find('span', class_='date-posted')
+        jobs.append({
+            'platform': 'Indeed',
+            'title': scraper.clean_text(title_elem.text if title_elem else 'N/A'),
+            'company': scraper.clean_text(company_elem.text if company_elem else 'N/A'),
+            'location': scraper.clean_text(location_elem.text if location_elem else 'N/A'),
+            'date_posted': scraper.format_date(date_elem.text if date_elem else datetime.now().strftime('%Y-%m-%d')),
+            'link': 'https://www.indeed.com' + card.find('a')['href'] if card.find('a') else 'N/A',
+            'salary': scraper.clean_text(card.find('div', class_='salary-snippet').text if card.find('div', class_='salary-snippet') else 'Not specified')
+        })
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="times each fixture page is parsed")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    scraper = JobScraper(use_cache=False)
+
+    runs = [
+        ("linkedin_search.html", "legacy", lambda page: legacy_linkedin(scraper, page)),
+        ("linkedin_search.html", "lxml", scraper.parse_linkedin),
+        ("indeed_search.html", "legacy", lambda page: legacy_indeed(scraper, page)),
+        ("indeed_search.html", "lxml", scraper.parse_indeed),
+    ]
+    print(f"{'fixture':<22} {'parser':<8} {'cards':>6} {'seconds':>9} {'cards/s':>10}")
+    expected = {}
+    for fixture, name, parse in runs:
+        with open(os.path.join(FIXTURES, fixture), encoding="utf-8") as file:
+            page = file.read()
+        records = parse(page)
+        if expected.setdefault(fixture, records) != records:
+            raise SystemExit(f"{name} parser disagrees with legacy on {fixture}")
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            parse(page)
+        elapsed = time.perf_counter() - start
+        cards = len(records) * args.repeat
+        print(f"{fixture:<22} {name:<8} {cards:>6} {elapsed:>9.2f} {cards / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Check that the entry points start within an import-time budget.
+
+Usage: python benchmarks/check_import_time.py [--budget-ms 150] [--repeat 3] [entry.py ...]
+
+Each entry point is loaded in a fresh interpreter under ``-X importtime``
+without running its ``main()``. The time its own imports take (beyond a
+bare interpreter's) must stay under the budget, and none of the heavy
+libraries in HEAVY_MODULES may be imported at startup. Exits with status 1
+on any violation, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ["main2.py", "agentic-main.py", "cli.py"]
+
+# Libraries that must load on first use, never before the window appears
+HEAVY_MODULES = [
+    "pandas", "numpy", "jobspy", "tls_client", "langchain_core", "langchain_ollama",
+    "PyPDF2", "docx", "openpyxl", "lxml", "pyarrow",
+]
+
+# Loads a script as a module (so its __main__ block does not run) and reports what got imported
+LOADER = """
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location("startup_check", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def import_times(stderr: str) -> dict:
+    """Cumulative microseconds per top-level import from ``-X importtime`` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Nested imports are indented further under their parent
+        if not name[1:].startswith(" "):
+            name = name.strip()
+            if cumulative.strip().isdigit():
+                times[name] = times.get(name, 0) + int(cumulative)
+    return times
+
+
+def measure(code: str, *args) -> tuple:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed")
+    return import_times(result.stderr), result.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entries", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="allowed import time per entry point beyond a bare interpreter")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point; the fastest counts")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per entry point")
+    args = parser.parse_args()
+
+    baseline = set(measure("pass")[0])
+    failures = 0
+    print(f"{'entry point':<18} {'ms':>8} {'budget':>8}  slowest imports")
+    for entry in args.entries:
+        best = None
+        for _ in range(max(1, args.repeat)):
+            try:
+                times, stdout = measure(LOADER, os.path.join(ROOT, entry))
+            except RuntimeError as e:
+                print(f"{entry:<18} failed to import: {e}")
+                failures += 1
+                break
+            own = {name: us for name, us in times.items() if name not in baseline}
+            total = sum(own.values()) / 1000
+            if best is None or total < best[0]:
+                best = (total, own, json.loads(stdout.strip().splitlines()[-1]))
+        if best is None:
+            continue
+
+        total, own, modules = best
+        slowest = sorted(own.items(), key=lambda item: -item[1])[:args.top]
+        print(f"{entry:<18} {total:>8.1f} {args.budget_ms:>8.0f}  "
+              + ", ".join(f"{name} {us / 1000:.1f}" for name, us in slowest))
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+        if heavy:
+            failures += 1
+            print(f"  FAIL: imports {', '.join(heavy)} at startup")
+        if total > args.budget_ms:
+            failures += 1
+            print(f"  FAIL: {total:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    print("OK" if not failures else f"{failures} startup budget violation(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
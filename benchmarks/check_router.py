@@ -0,0 +1,90 @@
+"""Check the Ollama router's failover and load balancing against fake servers.
+
+Usage: python benchmarks/check_router.py [--timeout 2]
+
+Scores through JobScorer's routed chain against FakeOllama instances, so the
+real OllamaLLM client and its timeout are exercised:
+
+- with one hanging and one healthy host, a call first sent to the hanging
+  host times out and is answered by the healthy one;
+- after two timeouts in a row the hanging host is out of rotation and gets
+  no further calls;
+- with two healthy hosts, concurrent calls go to the host with fewer calls
+  in flight, so four simultaneous calls split two and two.
+
+Exits with status 1 on any failed check, so it can gate CI.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_ollama import CATEGORIES, FakeOllama  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout", type=float, default=2.0, help="per-call LLM timeout in seconds")
+    args = parser.parse_args()
+    # Read when llm_router is imported, so set it first
+    os.environ["JOB_SEARCH_OLLAMA_TIMEOUT"] = str(args.timeout)
+    from scoring import JobScorer
+
+    failures = 0
+
+    def check(name: str, ok: bool, detail: str = ""):
+        nonlocal failures
+        print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+        failures += not ok
+
+    def invoke(scorer, number: int) -> str:
+        return scorer.chain.invoke({'resume': "Python developer", 'job_description': f"Job {number}"})
+
+    with FakeOllama(latency=0.05, hang_rate=1.0, hang_seconds=args.timeout * 10) as hanging, \
+            FakeOllama(latency=0.05) as healthy:
+        # The hanging host is listed first, so it wins the tie for the first calls
+        scorer = JobScorer(hosts=[hanging.url, healthy.url])
+        scorer.use_cache = False
+        try:
+            first = invoke(scorer, 1)
+            hang = scorer.router.hosts[hanging.url]
+            check("hanging host times out", hang.timeouts == 1, f"{hang.timeouts} timeouts")
+            check("call retried on the healthy host", first in CATEGORIES and healthy.requests == 1,
+                  f"reply {first!r}, {healthy.requests} requests")
+            check("hanging host stays in rotation after one failure", hang.healthy)
+
+            invoke(scorer, 2)
+            check("hanging host leaves rotation after two failures", not hang.healthy and hang.timeouts == 2,
+                  f"healthy={hang.healthy}, {hang.timeouts} timeouts")
+            for number in range(3, 6):
+                invoke(scorer, number)
+            check("no more calls reach the hanging host", hanging.requests == 2, f"{hanging.requests} requests")
+            check("healthy host answers every call", healthy.requests == 5, f"{healthy.requests} requests")
+        finally:
+            if scorer.router is not None:
+                scorer.router.close()
+
+    with FakeOllama(latency=1.0, parallel=4) as first_host, FakeOllama(latency=1.0, parallel=4) as second_host:
+        scorer = JobScorer(hosts=[first_host.url, second_host.url])
+        scorer.use_cache = False
+        try:
+            with ThreadPoolExecutor(4) as executor:
+                replies = list(executor.map(lambda number: invoke(scorer, number), range(4)))
+            check("concurrent calls all answered", all(reply in CATEGORIES for reply in replies), str(replies))
+            check("calls go to the least-loaded host", first_host.requests == 2 and second_host.requests == 2,
+                  f"{first_host.requests} and {second_host.requests} requests")
+            for line in scorer.router.report():
+                print(f"     {line}")
+        finally:
+            if scorer.router is not None:
+                scorer.router.close()
+
+    print("OK" if not failures else f"{failures} router check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""A local stand-in for an Ollama server, for testing the LLM router offline.
+
+Usage: python benchmarks/fake_ollama.py [--port 11434] [--latency 0.5] [--tokens-per-second 20]
+                                        [--parallel 1] [--hang-rate 0] [--fail-rate 0]
+
+Answers /api/tags (health checks), /api/generate (streamed like the real
+server) and /api/embed. Replies are a scoring category picked from a hash
+of the prompt, or a JSON verdict per job for JSON-format requests.
+Generation takes ``latency`` seconds plus the reply's tokens at
+``tokens_per_second``, and only ``parallel`` requests generate at once,
+the rest queue, like a CPU box. ``hang_rate`` of requests never answer
+within any sensible timeout and ``fail_rate`` get a 500.
+"""
+import argparse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+import zlib
+
+CATEGORIES = ["Not Apply", "Should Apply", "Must Apply"]
+JOB_NUMBER = re.compile(r"^Job (\d+):", re.MULTILINE)
+
+
+def reply_for(prompt: str, json_format: bool) -> str:
+    if json_format:
+        numbers = JOB_NUMBER.findall(prompt) or ["1"]
+        return json.dumps({number: CATEGORIES[zlib.crc32(f"{number}{prompt}".encode()) % 3] for number in numbers})
+    return CATEGORIES[zlib.crc32(prompt.encode()) % len(CATEGORIES)]
+
+
+class FakeOllama:
+    """Serve the Ollama endpoints the scorer and router use on localhost."""
+
+    def __init__(self, latency: float = 0.5, tokens_per_second: float = 20.0, parallel: int = 1,
+                 hang_rate: float = 0.0, fail_rate: float = 0.0, hang_seconds: float = 600.0,
+                 port: int = 0, seed: int = 0):
+        fake = self
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.hang_rate = hang_rate
+        self.fail_rate = fail_rate
+        self.hang_seconds = hang_seconds
+        self.requests = 0
+        self.up = True
+        self._slots = threading.Semaphore(max(1, int(parallel)))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def send_json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if not fake.up:
+                    return self.send_json(503, {'error': 'down'})
+                if self.path == '/api/tags':
+                    return self.send_json(200, {'models': [{'name': 'llama3.2:latest'}]})
+                self.send_json(404, {'error': 'not found'})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+                    roll = fake._random.random()
+                if not fake.up or roll < fake.fail_rate:
+                    return self.send_json(500, {'error': 'model runner crashed'})
+                if self.path == '/api/embed':
+                    inputs = request.get('input') or []
+                    inputs = [inputs] if isinstance(inputs, str) else inputs
+                    vectors = [[((zlib.crc32(f"{i}{text}".encode()) % 2000) - 1000) / 1000 for i in range(16)]
+                               for text in inputs]
+                    return self.send_json(200, {'model': request.get('model'), 'embeddings': vectors})
+                if self.path != '/api/generate':
+                    return self.send_json(404, {'error': 'not found'})
+
+                reply = reply_for(request.get('prompt', ''), request.get('format') == 'json')
+                tokens = max(1, len(reply) // 4)
+                with fake._slots:
+                    if roll < fake.fail_rate + fake.hang_rate:
+                        time.sleep(fake.hang_seconds)
+                    time.sleep(fake.latency + tokens / fake.tokens_per_second)
+                created = datetime.now(timezone.utc).isoformat()
+                model = request.get('model', 'llama3.2:latest')
+                lines = [{'model': model, 'created_at': created, 'response': reply, 'done': False}]
+                if request.get('stream', True) is False:
+                    lines = []
+                lines.append({'model': model, 'created_at': created, 'response': '' if lines else reply,
+                              'done': True, 'done_reason': 'stop', 'eval_count': tokens,
+                              'prompt_eval_count': len(request.get('prompt', '')) // 4})
+                body = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before each reply starts")
+    parser.add_argument("--tokens-per-second", type=float, default=20.0)
+    parser.add_argument("--parallel", type=int, default=1, help="requests generated at once")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of requests that never answer")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    args = parser.parse_args()
+
+    with FakeOllama(args.latency, args.tokens_per_second, args.parallel, args.hang_rate, args.fail_rate,
+                    port=args.port) as fake:
+        print(f"Fake Ollama listening on {fake.url}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
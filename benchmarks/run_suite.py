@@ -0,0 +1,309 @@
+"""Time every pipeline stage in isolation on synthetic jobspy tables.
+
+Usage: python benchmarks/run_suite.py [--rows 1000 10000 100000] [--stages normalize dedupe ...]
+                                      [--output results.json] [--compare baseline.json]
+
+Stages run on the output of the stage before them, but each is timed on
+its own: normalize, dedupe, compact (column pruning, categoricals and the
+description store), index (incremental new/seen check and record),
+filter_columns (main2's unscored column drop), condense, prefilter, score
+(the JobScorer thread pool), export_<format> and legacy_excel
+(``JobScraper.export_to_excel`` from outdated/jobs.py). The LLM and the
+embedding model are replaced by deterministic stubs, so only this
+repository's code is measured. Peak memory is taken with tracemalloc in a
+second, separate run of each stage so it does not skew the timings.
+
+Results are written as JSON tagged with the current commit; pass an
+earlier file to --compare to print the speedup per stage.
+"""
+import argparse
+from datetime import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "outdated"))
+from compact import DescriptionStore, compact_jobs  # noqa: E402
+from condense import DescriptionCondenser  # noqa: E402
+from dedup import JobDeduplicator  # noqa: E402
+from exporter import export_jobs  # noqa: E402
+from job_index import JobIndex, search_key  # noqa: E402
+from normalize import normalize_jobs  # noqa: E402
+from pipeline import COLUMNS_TO_DROP, EXPORT_COLUMNS  # noqa: E402
+from prefilter import EmbeddingPrefilter  # noqa: E402
+from scoring import CATEGORIES, JobScorer  # noqa: E402
+from synthetic import make_jobs  # noqa: E402
+
+RESUME = ("Senior data engineer with eight years of Python, SQL, Spark and Airflow experience, "
+          "building batch and streaming pipelines on AWS and Kubernetes.")
+EXPORT_FORMATS = ["xlsx", "csv", "parquet", "jsonl"]
+
+
+class StubChain:
+    """Stands in for ``prompt | llm``: a fixed category per description, after ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def invoke(self, inputs: dict) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return CATEGORIES[zlib.crc32(str(inputs["job_description"]).encode("utf-8")) % len(CATEGORIES)]
+
+
+class StubEmbeddings:
+    """Stands in for OllamaEmbeddings with a cheap hash-derived vector per text."""
+
+    def embed_documents(self, texts):
+        return [
+            np.frombuffer(zlib.crc32(text.encode("utf-8")).to_bytes(4, "little") * 16, dtype=np.uint8)
+            .astype(np.float32) - 127.5
+            for text in texts
+        ]
+
+
+def legacy_records(jobs: pd.DataFrame) -> list:
+    """Rows in the shape outdated/jobs.py scrapes them."""
+    dates = pd.to_datetime(jobs['date_posted']).dt.strftime('%Y-%m-%d').fillna('N/A')
+    return [
+        {'platform': site.title(), 'title': title, 'company': company, 'location': location,
+         'date_posted': posted, 'link': url, 'salary': 'Not specified'}
+        for site, title, company, location, posted, url in zip(
+            jobs['site'], jobs['title'], jobs['company'], jobs['location'], dates, jobs['job_url'])
+    ]
+
+
+def scored_table(data: "Inputs") -> pd.DataFrame:
+    jobs = data['deduped'].copy()
+    jobs['similarity'] = data['similarities'].round(3)
+    jobs['category'] = data['categories']
+    return jobs[[col for col in EXPORT_COLUMNS if col in jobs.columns] +
+                [col for col in jobs.columns if col not in EXPORT_COLUMNS]]
+
+
+def run_normalize(data):
+    return normalize_jobs(data['raw'])
+
+
+def run_dedupe(data):
+    return JobDeduplicator().dedupe(data['normalized'])
+
+
+def run_compact(data):
+    store = DescriptionStore(os.path.join(data.directory, f"descriptions_{time.perf_counter_ns()}.bin"))
+    try:
+        return compact_jobs(data['normalized'], store, drop=COLUMNS_TO_DROP)
+    finally:
+        store.close()
+
+
+def run_index(data):
+    index = JobIndex(os.path.join(data.directory, f"index_{time.perf_counter_ns()}.sqlite"))
+    try:
+        jobs = data['deduped']
+        key = search_key({'search_term': 'data engineer'}, RESUME)
+        hashes = index.hashes(jobs)
+        new = index.new_mask(key, jobs, hashes)
+        index.record(key, jobs, hashes=hashes)
+        return new
+    finally:
+        index.close()
+
+
+def run_filter_columns(data):
+    jobs = data['deduped']
+    return jobs.drop(columns=[col for col in COLUMNS_TO_DROP if col in jobs.columns])
+
+
+def run_condense(data):
+    return DescriptionCondenser(token_budget=600).condense_all(data['deduped']['description'].tolist())
+
+
+def run_prefilter(data):
+    prefilter = EmbeddingPrefilter()
+    prefilter._embeddings = StubEmbeddings()
+    return prefilter.similarities(RESUME, data['condensed'])
+
+
+def run_score(data):
+    scorer = JobScorer(max_workers=data.args.llm_workers)
+    scorer._chain = StubChain(data.args.llm_latency)
+    return scorer.score_all(RESUME, data['condensed'])
+
+
+def run_export(fmt):
+    def run(data):
+        path = os.path.join(data.directory, f"jobs.{fmt}")
+        export_jobs(data['scored'], path)
+        size = os.path.getsize(path)
+        os.remove(path)
+        return size
+    return run
+
+
+def run_legacy_excel(data):
+    from jobs import JobScraper
+    scraper = JobScraper(use_cache=False)
+    scraper.logger.disabled = True
+    scraper.jobs_data = data['legacy_records']
+    path = os.path.join(data.directory, "legacy.xlsx")
+    scraper.export_to_excel(path)
+    os.remove(path)
+
+
+# name: (function, output key or None, input key whose length is the row count)
+STAGES = {
+    'normalize': (run_normalize, 'normalized', 'raw'),
+    'dedupe': (run_dedupe, 'deduped', 'normalized'),
+    'compact': (run_compact, None, 'normalized'),
+    'index': (run_index, None, 'deduped'),
+    'filter_columns': (run_filter_columns, None, 'deduped'),
+    'condense': (run_condense, 'condensed', 'deduped'),
+    'prefilter': (run_prefilter, 'similarities', 'condensed'),
+    'score': (run_score, 'categories', 'condensed'),
+    **{f"export_{fmt}": (run_export(fmt), None, 'scored') for fmt in EXPORT_FORMATS},
+    'legacy_excel': (run_legacy_excel, None, 'legacy_records'),
+}
+
+# Inputs assembled outside any timed stage
+BUILDERS = {
+    'scored': scored_table,
+    'legacy_records': lambda data: legacy_records(data['raw']),
+}
+
+
+class Inputs(dict):
+    """Stage inputs, computing missing ones (untimed) from the stage that makes them."""
+
+    def __init__(self, raw: pd.DataFrame, directory: str, args):
+        super().__init__(raw=raw)
+        self.directory = directory
+        self.args = args
+
+    def __missing__(self, key):
+        if key in BUILDERS:
+            self[key] = BUILDERS[key](self)
+        else:
+            function = next(stage[0] for stage in STAGES.values() if stage[1] == key)
+            self[key] = function(self)
+        return self[key]
+
+
+def measure(function, data, memory: bool) -> dict:
+    start = time.perf_counter()
+    result = function(data)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            function(data)
+            peak = (tracemalloc.get_traced_memory()[1] - baseline) / 1e6
+        finally:
+            tracemalloc.stop()
+    return {'result': result, 'seconds': seconds, 'peak_mb': peak}
+
+
+def commit_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {'commit': git("rev-parse", "HEAD"), 'dirty': bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def compare(results: dict, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(entry['rows'], entry['stage']): entry for entry in baseline['results']}
+    print(f"\nAgainst {baseline_path} ({(baseline.get('commit') or 'unknown')[:10]}):")
+    print(f"{'rows':>8} {'stage':<16} {'before s':>10} {'after s':>10} {'speedup':>8} {'before MB':>10} {'after MB':>10}")
+    for entry in results['results']:
+        old = before.get((entry['rows'], entry['stage']))
+        if old is None:
+            continue
+        speedup = old['seconds'] / entry['seconds'] if entry['seconds'] else float('inf')
+        memory = (f"{old['peak_mb']:>10.1f} {entry['peak_mb']:>10.1f}"
+                  if old.get('peak_mb') is not None and entry.get('peak_mb') is not None else "")
+        print(f"{entry['rows']:>8} {entry['stage']:<16} {old['seconds']:>10.3f} {entry['seconds']:>10.3f} "
+              f"{speedup:>7.2f}x {memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--legacy-max", type=int, default=100000,
+                        help="skip the legacy Excel export above this many rows")
+    parser.add_argument("--llm-workers", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="seconds each stubbed LLM call sleeps")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = {
+        **commit_info(),
+        'created': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'results': [],
+    }
+
+    print(f"{'rows':>8} {'stage':<16} {'input':>8} {'seconds':>9} {'rows/s':>10} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as directory:
+        for rows in args.rows:
+            data = Inputs(make_jobs(rows, args.duplicate_rate), directory, args)
+            for name in args.stages:
+                if name == 'legacy_excel' and rows > args.legacy_max:
+                    print(f"{rows:>8} {name:<16} skipped above --legacy-max")
+                    continue
+                function, output, source = STAGES[name]
+                count = len(data[source])
+                try:
+                    outcome = measure(function, data, not args.no_memory)
+                except ImportError as e:
+                    print(f"{rows:>8} {name:<16} skipped: {e}")
+                    continue
+                if output is not None:
+                    data[output] = outcome['result']
+                entry = {
+                    'rows': rows, 'stage': name, 'input_rows': count,
+                    'seconds': round(outcome['seconds'], 6),
+                    'rows_per_s': round(count / outcome['seconds']) if outcome['seconds'] else None,
+                    'peak_mb': None if outcome['peak_mb'] is None else round(outcome['peak_mb'], 2),
+                }
+                results['results'].append(entry)
+                peak = f"{entry['peak_mb']:>9.1f}" if entry['peak_mb'] is not None else f"{'-':>9}"
+                print(f"{rows:>8} {name:<16} {count:>8} {entry['seconds']:>9.3f} {entry['rows_per_s'] or 0:>10} {peak}")
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{(results['commit'] or 'unknown')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
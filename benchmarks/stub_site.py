@@ -0,0 +1,104 @@
+"""Synthetic LinkedIn/Indeed result pages and a local HTTP server that serves them.
+
+Used by the scraper benchmarks so they never touch the real sites. Pages
+carry the markup JobScraper's selectors look for, plus the navigation and
+script noise of a real results page.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+NOISE = "".join(
+    f'<li class="nav-item"><a href="/nav/{n}">Link {n}</a><script>var x{n} = {{"a": {n}}};</script></li>'
+    for n in range(60)
+)
+
+
+def linkedin_page(start: int = 0, cards: int = 25) -> str:
+    items = "".join(f"""
+        <li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{start + n}">
+          <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{start + n}">
+            <span class="sr-only">Data Engineer {start + n}</span></a>
+          <div class="base-search-card__info">
+            <h3 class="base-search-card__title">  Senior Data Engineer &amp; Analyst {start + n} </h3>
+            <h4 class="base-search-card__subtitle"><a href="/company/{n}">Company {n % 7}</a></h4>
+            <div class="base-search-card__metadata">
+              <span class="job-search-card__location">Austin, TX</span>
+              {'<span class="job-search-card__salary-info">$120,000 - $150,000</span>' if n % 3 == 0 else ''}
+              <time class="job-search-card__listdate" datetime="2024-01-{n % 28 + 1:02d}">{n % 5 + 1} days ago</time>
+            </div>
+          </div>
+        </div></li>""" for n in range(cards))
+    return f"""<!DOCTYPE html><html><head><title>Jobs</title><script>window.config = {{}};</script></head>
+<body><header><ul>{NOISE}</ul></header><main><ul class="jobs-search__results-list">{items}</ul></main>
+<footer><ul>{NOISE}</ul></footer></body></html>"""
+
+
+def indeed_page(start: int = 0, cards: int = 10) -> str:
+    items = "".join(f"""
+        <li><div class="cardOutline tapItem"><div class="job_seen_beacon"><table><tbody><tr><td>
+          <h2 class="jobTitle"><a class="jcs-JobTitle" href="/rc/clk?jk={start + n:x}"><span>ML Engineer {start + n}</span></a></h2>
+          <div class="company_location">
+            <span class="companyName">Company {n % 5}</span>
+            <div class="companyLocation">New York, NY</div>
+          </div>
+          {'<div class="salary-snippet">$90 an hour</div>' if n % 2 == 0 else ''}
+          <span class="date">Posted {n % 9 + 1} days ago</span>
+        </td></tr></tbody></table></div></div></li>""" for n in range(cards))
+    return f"""<!DOCTYPE html><html><head><title>Jobs</title><script>window.mosaic = {{}};</script></head>
+<body><header><ul>{NOISE}</ul></header><div id="mosaic-jobResults"><ul>{items}</ul></div>
+<footer><ul>{NOISE}</ul></footer></body></html>"""
+
+
+class StubSite:
+    """Serve result pages on localhost with a fixed delay per request.
+
+    /linkedin and /indeed honour the ``start`` query parameter, so
+    pagination returns distinct cards.
+    """
+
+    def __init__(self, latency: float = 0.05):
+        stub = self
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.latency)
+                url = urlsplit(self.path)
+                start = int(parse_qs(url.query).get('start', ['0'])[0])
+                if url.path == '/linkedin':
+                    body = linkedin_page(start).encode()
+                elif url.path == '/indeed':
+                    body = indeed_page(start).encode()
+                else:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
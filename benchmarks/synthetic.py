@@ -0,0 +1,199 @@
+"""Synthetic job tables shaped like python-jobspy's ``scrape_jobs`` output.
+
+Usage: python benchmarks/synthetic.py [--rows 1000] [--output jobs.parquet]
+
+Rows carry every column jobspy returns, in its order and with its types:
+object columns of ``datetime.date`` posting dates, float salaries with
+gaps, markdown descriptions with requirement, responsibility and
+boilerplate sections, and a share of postings listed on several boards
+(same description, different site and URL). Generation is vectorised
+where it can be and deterministic for a given seed.
+"""
+import argparse
+from datetime import date, timedelta
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from exporter import export_jobs  # noqa: E402
+
+# Column order of jobspy.scrape_jobs
+JOBSPY_COLUMNS = [
+    'id', 'site', 'job_url', 'job_url_direct', 'title', 'company', 'location', 'date_posted',
+    'job_type', 'salary_source', 'interval', 'min_amount', 'max_amount', 'currency', 'is_remote',
+    'job_level', 'job_function', 'listing_type', 'emails', 'description', 'company_industry',
+    'company_url', 'company_logo', 'company_url_direct', 'company_addresses',
+    'company_num_employees', 'company_revenue', 'company_description',
+]
+
+SITES = ['indeed', 'linkedin', 'zip_recruiter', 'glassdoor', 'google']
+SITE_WEIGHTS = [0.35, 0.3, 0.15, 0.1, 0.1]
+SITE_URLS = {
+    'indeed': 'https://www.indeed.com/viewjob?jk={:016x}',
+    'linkedin': 'https://www.linkedin.com/jobs/view/{}',
+    'zip_recruiter': 'https://www.ziprecruiter.com/jobs/{:x}',
+    'glassdoor': 'https://www.glassdoor.com/job-listing/j?jl={}',
+    'google': 'https://www.google.com/search?q=jobs&htidocid={:x}',
+}
+
+LEVELS = ['', 'Senior ', 'Sr. ', 'Junior ', 'Lead ', 'Staff ', 'Principal ']
+ROLES = ['Data Engineer', 'Software Engineer', 'Machine Learning Engineer', 'Data Analyst',
+         'Product Manager', 'Backend Developer', 'Frontend Developer', 'DevOps Engineer',
+         'Data Scientist', 'QA Engineer', 'Site Reliability Engineer', 'Solutions Architect']
+CITIES = ['New York, NY', 'Austin, TX', 'San Francisco, CA', 'Seattle, WA', 'Chicago, IL',
+          'Boston, MA', 'Denver, CO', 'Atlanta, GA', 'Toronto, ON', 'Remote']
+INDUSTRIES = ['Software Development', 'Financial Services', 'Hospital & Health Care',
+              'Retail', 'IT Services and IT Consulting', 'Staffing and Recruiting', None]
+JOB_TYPES = ['fulltime', 'parttime', 'contract', 'internship', None]
+COMPANY_SUFFIXES = ['', ' Inc.', ' LLC', ' Corp', ' Group', ' Technologies']
+
+VERBS = ['Design', 'Build', 'Maintain', 'Own', 'Improve', 'Scale', 'Monitor', 'Document',
+         'Automate', 'Review', 'Deploy', 'Debug', 'Migrate', 'Optimise', 'Test', 'Support']
+OBJECTS = ['data pipelines', 'REST APIs', 'batch jobs', 'dashboards', 'ML models', 'CI/CD workflows',
+           'cloud infrastructure', 'customer-facing features', 'internal tooling', 'SQL warehouses',
+           'event streams', 'microservices', 'reporting suites', 'search ranking', 'billing systems']
+QUALIFIERS = ['with the platform team', 'across several business units', 'in a fast-paced environment',
+              'for millions of users', 'using Python and SQL', 'on AWS and Kubernetes', 'end to end',
+              'with minimal supervision', 'alongside product managers', 'to strict SLAs']
+SKILLS = ['Python', 'SQL', 'Java', 'Go', 'TypeScript', 'Spark', 'Airflow', 'Kafka', 'dbt', 'AWS',
+          'GCP', 'Azure', 'Docker', 'Kubernetes', 'Terraform', 'PyTorch', 'pandas', 'React', 'Snowflake']
+BOILERPLATE = [
+    "We are an equal opportunity employer and value diversity at our company. We do not discriminate "
+    "on the basis of race, religion, color, national origin, gender, sexual orientation, age, marital "
+    "status, veteran status, or disability status.",
+    "Reasonable accommodation will be provided for qualified individuals with disabilities.",
+    "Medical, dental and vision insurance, 401(k) matching and generous paid time off.",
+    "This position may require a background check. We participate in E-Verify.",
+    "We do not accept unsolicited resumes from recruitment agencies.",
+]
+
+
+def _sentence_bank(rng: np.random.Generator, size: int = 4000) -> np.ndarray:
+    verbs = rng.choice(VERBS, size)
+    objects = rng.choice(OBJECTS, size)
+    qualifiers = rng.choice(QUALIFIERS, size)
+    return np.array([f"{v} {o} {q}." for v, o, q in zip(verbs, objects, qualifiers)], dtype=object)
+
+
+def make_descriptions(count: int, rng: np.random.Generator) -> list:
+    """Markdown descriptions of roughly 150-400 words, as jobspy returns them."""
+    bank = _sentence_bank(rng)
+    skills = np.array(SKILLS, dtype=object)
+    summary = rng.integers(0, len(bank), (count, 3))
+    duties = rng.integers(0, len(bank), (count, 6))
+    duty_counts = rng.integers(3, 7, count)
+    required = rng.integers(0, len(skills), (count, 5))
+    years = rng.integers(1, 10, count)
+    boiler = rng.random((count, len(BOILERPLATE))) < 0.6
+    descriptions = []
+    for row in range(count):
+        parts = [
+            "**About the role**\n\n" + " ".join(bank[summary[row]]),
+            "**Responsibilities**\n\n" + "\n".join(f"* {line}" for line in bank[duties[row, :duty_counts[row]]]),
+            f"**Requirements**\n\n* {years[row]}+ years of professional experience\n"
+            + "\n".join(f"* Strong experience with {skill}" for skill in dict.fromkeys(skills[required[row]])),
+        ]
+        blurbs = [text for text, keep in zip(BOILERPLATE, boiler[row]) if keep]
+        if blurbs:
+            parts.append("**Benefits & EEO**\n\n" + "\n\n".join(blurbs))
+        descriptions.append("\n\n".join(parts))
+    return descriptions
+
+
+def make_jobs(rows: int, duplicate_rate: float = 0.1, seed: int = 0,
+              today: date = date(2025, 1, 15)) -> pd.DataFrame:
+    """A jobspy-shaped table of ``rows`` postings.
+
+    About ``duplicate_rate`` of the rows re-list an earlier posting on
+    another board, the way one job shows up on Indeed, LinkedIn and Google.
+    """
+    rng = np.random.default_rng(seed)
+    unique = max(1, int(round(rows * (1 - duplicate_rate))))
+    # Rows past ``unique`` copy a random earlier posting
+    source = np.concatenate([np.arange(unique), rng.integers(0, unique, rows - unique)])
+
+    companies_pool = np.array(
+        [f"Company {n}{COMPANY_SUFFIXES[n % len(COMPANY_SUFFIXES)]}" for n in range(max(rows // 20, 10))],
+        dtype=object
+    )
+    company_ids = rng.integers(0, len(companies_pool), unique)[source]
+    companies = companies_pool[company_ids]
+    titles = (np.char.add(rng.choice(LEVELS, unique), rng.choice(ROLES, unique)).astype(object))[source]
+    locations = rng.choice(CITIES, unique).astype(object)[source]
+    descriptions = np.array(make_descriptions(unique, rng), dtype=object)[source]
+
+    sites = rng.choice(SITES, rows, p=SITE_WEIGHTS)
+    ids = rng.integers(10 ** 9, 10 ** 10, rows)
+    job_urls = [SITE_URLS[site].format(number) for site, number in zip(sites, ids)]
+
+    days = [today - timedelta(days=int(n)) for n in range(31)]
+    date_posted = np.array(days, dtype=object)[rng.integers(0, 31, rows)]
+    date_posted[rng.random(rows) < 0.05] = None
+
+    has_salary = rng.random(rows) < 0.45
+    yearly = rng.random(rows) < 0.8
+    min_amount = np.where(yearly, rng.integers(50, 160, rows) * 1000.0, rng.integers(20, 80, rows) * 1.0)
+    max_amount = min_amount * rng.uniform(1.1, 1.6, rows).round(2)
+    interval = np.where(yearly, 'yearly', 'hourly').astype(object)
+    for column in (min_amount, max_amount):
+        column[~has_salary] = np.nan
+    interval[~has_salary] = None
+
+    company_slugs = np.char.replace(np.char.lower(companies.astype(str)), ' ', '-')
+    remote = np.array([location == 'Remote' for location in locations]) | (rng.random(rows) < 0.1)
+
+    jobs = pd.DataFrame({
+        'id': [f"{site[:2]}-{number}" for site, number in zip(sites, ids)],
+        'site': sites.astype(object),
+        'job_url': job_urls,
+        'job_url_direct': np.where(rng.random(rows) < 0.5, np.char.add('https://careers.example.com/', ids.astype(str)), None),
+        'title': titles,
+        'company': companies,
+        'location': locations,
+        'date_posted': date_posted,
+        'job_type': rng.choice(np.array(JOB_TYPES, dtype=object), rows),
+        'salary_source': np.where(has_salary, 'direct_data', None),
+        'interval': interval,
+        'min_amount': min_amount,
+        'max_amount': max_amount,
+        'currency': np.where(has_salary, 'USD', None),
+        'is_remote': remote,
+        'job_level': np.where(sites == 'linkedin', rng.choice(['mid-senior level', 'entry level', 'associate'], rows), None),
+        'job_function': np.where(sites == 'linkedin', 'Engineering and Information Technology', None),
+        'listing_type': None,
+        'emails': np.where(rng.random(rows) < 0.05, 'jobs@example.com', None),
+        'description': descriptions,
+        'company_industry': rng.choice(np.array(INDUSTRIES, dtype=object), rows),
+        'company_url': np.char.add('https://www.linkedin.com/company/', company_slugs).astype(object),
+        'company_logo': np.char.add(np.char.add('https://media.example.com/', company_slugs), '.png').astype(object),
+        'company_url_direct': np.char.add(np.char.add('https://www.', company_slugs), '.com').astype(object),
+        'company_addresses': None,
+        'company_num_employees': rng.choice(np.array(['11-50', '51-200', '201-500', '1,001-5,000', '10,001+', None], dtype=object), rows),
+        'company_revenue': None,
+        'company_description': np.where(rng.random(rows) < 0.3, 'A company that builds things people use.', None),
+    }, columns=JOBSPY_COLUMNS)
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the table (.parquet, .csv or .jsonl) instead of a summary")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.rows, args.duplicate_rate, args.seed)
+    if args.output:
+        export_jobs(jobs, args.output)
+        print(f"Wrote {len(jobs)} rows to {args.output}")
+    else:
+        print(jobs.head())
+        print(f"{len(jobs)} rows, {jobs.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from llm_cache import CACHE_DIR
+
+
+def job_key(job_url, index: int) -> str:
+    """Stable identity for a scraped job, falling back to its row position."""
+    if isinstance(job_url, str) and job_url:
+        return job_url
+    return f"row-{index}"
+
+
+class ScoringCheckpoint:
+    """Append-only JSONL log of scored jobs so an interrupted run can resume.
+
+    Each row is flushed and fsynced as soon as it is scored. A rerun of the
+    same search with the same resume and analysis settings reloads the log
+    and skips every job already in it. The file is removed once the run finishes and exports.
+    """
+
+    def __init__(self, run_id: str, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(CACHE_DIR, "checkpoints")
+        self.path = os.path.join(self.directory, f"{run_id}.jsonl")
+        self._lock = threading.Lock()
+        self._file = None
+
+    @staticmethod
+    def make_run_id(params: dict, resume: str, settings: Optional[dict] = None) -> str:
+        """Identity of a run: scrape params, resume and the analysis settings (threshold,
+        top-k, budgets, model, prompts), so changing any of them starts a fresh checkpoint."""
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+        if settings:
+            digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+            digest.update(b"\0")
+        digest.update((resume or "").encode("utf-8"))
+        return digest.hexdigest()[:24]
+
+    def load(self) -> Dict[str, dict]:
+        """Rows from a previous, unfinished run keyed by job key."""
+        rows = {}
+        if not os.path.exists(self.path):
+            return rows
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    # A crash mid-write can leave a truncated last line
+                    continue
+                rows[row["key"]] = row
+        return rows
+
+    def append(self, key: str, row: dict):
+        record = json.dumps({"key": key, **row}, default=str)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(record + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def complete(self):
+        """Close and delete the log after the results are safely exported."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
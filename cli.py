@@ -0,0 +1,192 @@
+"""Run saved job searches from the command line, without the Tk UI.
+
+Usage: python cli.py searches.json [--workers 4] [--output-dir results] [--no-cache]
+                     [--metrics-dir metrics] [--profile]
+       python cli.py --matrix matrix.json [--workers 8] [--output-dir results]
+
+The searches file is a JSON (or YAML) list of saved searches, or an object
+with a "searches" list. Each entry uses the keys of pipeline.DEFAULT_SEARCH:
+
+    [
+        {"name": "data-nyc", "search_term": "data engineer", "location": "New York, NY",
+         "sites": ["indeed", "linkedin"], "hours_old": 24,
+         "analyze": true, "resume": "resume.pdf"}
+    ]
+
+With --matrix the file is one object whose "search_terms", "locations" and
+"countries" lists (plus "sites") are crossed into one scrape task per
+combination. Tasks run under a global cap of --workers, with a token-bucket
+rate limit per job-board domain:
+
+    {"search_terms": ["data engineer", "ml engineer"], "locations": ["Austin, TX", "Remote"],
+     "countries": ["USA"], "sites": ["indeed", "linkedin"], "results_wanted": 50,
+     "default_rate": 0.5, "default_burst": 5,
+     "rate_limits": {"linkedin.com": {"rate": 0.2, "burst": 2}}}
+
+Matrix results are kept compact while tasks run (see compact.py); add
+"compact": false to keep full rows in memory instead.
+"""
+import argparse
+from datetime import datetime
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from metrics import METRICS_DIR
+from pipeline import COLUMNS_TO_DROP, JobPipeline, build_search
+
+
+def load_file(path: str):
+    with open(path, encoding="utf-8") as file:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+def load_searches(path: str) -> list:
+    data = load_file(path)
+    if isinstance(data, dict):
+        data = data.get("searches", [])
+    if not isinstance(data, list):
+        raise ValueError(f"{path} must contain a list of searches")
+    return data
+
+
+def run_search(search: dict) -> dict:
+    """Run one saved search; the top-level function so it can run in a worker process."""
+    name = search.get('name')
+    pipeline = JobPipeline(log=lambda message: print(f"[{name}] {message}", flush=True))
+    return pipeline.run(search)
+
+
+def run_matrix(path: str, workers: int, output_dir) -> int:
+    """Scrape a search matrix under per-domain rate limits into one export.
+
+    Each task's results are normalised and compacted as they arrive: unused
+    columns are dropped, repetitive ones become categoricals and descriptions
+    move to a compressed side store, read back only for deduplication and
+    export. Set "compact": false in the matrix to keep everything in memory.
+    """
+    from compact import DescriptionStore, categorize, compact_jobs, descriptions, expand_jobs
+    from dedup import JobDeduplicator
+    from exporter import export_jobs
+    from normalize import normalize_jobs
+    from rate_limit import DomainRateLimiter
+    from scheduler import SearchScheduler, expand_matrix
+
+    matrix = load_file(path)
+    if not isinstance(matrix, dict):
+        raise ValueError(f"{path} must contain a search matrix object")
+    tasks = expand_matrix(matrix)
+    limiter = DomainRateLimiter(
+        default_rate=matrix.get('default_rate', 0.5),
+        default_burst=matrix.get('default_burst', 5),
+        limits=matrix.get('rate_limits'),
+    )
+    store = DescriptionStore() if matrix.get('compact', True) else None
+
+    def ingest(frame):
+        return compact_jobs(normalize_jobs(frame), store, drop=COLUMNS_TO_DROP)
+
+    try:
+        print(f"Running {len(tasks)} scrape tasks with up to {workers} at a time", flush=True)
+        scheduler = SearchScheduler(max_concurrency=workers, limiter=limiter,
+                                    log=lambda message: print(message, flush=True))
+        jobs = scheduler.run(tasks, ingest=ingest if store is not None else None)
+        if len(jobs) == 0:
+            print("No jobs found")
+            return 1
+
+        if store is None:
+            jobs = normalize_jobs(jobs)
+        else:
+            # Merged columns stay categorical; this catches ones too varied within a single task
+            jobs = categorize(jobs)
+            print(store.stats(), flush=True)
+        if matrix.get('dedupe', True):
+            deduplicator = JobDeduplicator()
+            jobs = deduplicator.dedupe(jobs, descriptions=descriptions(jobs, store))
+            print(deduplicator.report(), flush=True)
+
+        jobs = jobs.drop(columns=[col for col in COLUMNS_TO_DROP if col in jobs.columns])
+        output_dir = output_dir or matrix.get('output_dir', '.')
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(output_dir, f"job_matrix_results_{timestamp}.{matrix.get('export_format', 'xlsx')}")
+        export_jobs(jobs, filename, expand=None if store is None else lambda chunk: expand_jobs(chunk, store))
+        print(f"Exported {len(jobs)} jobs to {filename}")
+        return 0
+    finally:
+        if store is not None:
+            store.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run saved job searches headlessly.")
+    parser.add_argument("searches", help="JSON or YAML file of saved searches (or a matrix with --matrix)")
+    parser.add_argument("--workers", type=int,
+                        help="searches run in parallel processes (default: 1), "
+                             "or concurrent scrape tasks with --matrix (default: 4)")
+    parser.add_argument("--output-dir", help="directory for exported results (overrides the file)")
+    parser.add_argument("--no-cache", action="store_true", help="skip the LLM verdict cache for this run")
+    parser.add_argument("--matrix", action="store_true", help="treat the file as a search matrix")
+    parser.add_argument("--metrics-dir", help="write per-search JSON metrics and Prometheus text files here")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile every stage and dump the slowest one to --metrics-dir")
+    args = parser.parse_args(argv)
+
+    if args.matrix:
+        try:
+            return run_matrix(args.searches, args.workers or 4, args.output_dir)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    args.workers = args.workers or 1
+    if args.profile and not (args.metrics_dir or METRICS_DIR):
+        parser.error("--profile needs --metrics-dir (or JOB_SEARCH_METRICS_DIR) for the profile dump")
+
+    # Validate every search before starting any of them
+    searches = []
+    try:
+        for number, entry in enumerate(load_searches(args.searches), start=1):
+            entry = dict(entry)
+            entry.setdefault('name', f"search{number}")
+            if args.output_dir:
+                entry['output_dir'] = args.output_dir
+            if args.no_cache:
+                entry['use_cache'] = False
+            if args.metrics_dir:
+                entry['metrics_dir'] = args.metrics_dir
+            if args.profile:
+                entry['profile'] = True
+            searches.append(build_search(**entry))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    failures = 0
+    if args.workers <= 1:
+        for search in searches:
+            try:
+                summary = run_search(search)
+                print(f"[{search['name']}] done: {summary}", flush=True)
+            except Exception as e:
+                failures += 1
+                print(f"[{search['name']}] failed: {e}", file=sys.stderr, flush=True)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = {executor.submit(run_search, search): search['name'] for search in searches}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    print(f"[{name}] done: {future.result()}", flush=True)
+                except Exception as e:
+                    failures += 1
+                    print(f"[{name}] failed: {e}", file=sys.stderr, flush=True)
+
+    print(f"{len(searches) - failures}/{len(searches)} searches succeeded")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
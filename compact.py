@@ -0,0 +1,236 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+import zlib
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from llm_cache import CACHE_DIR
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['site', 'company', 'location', 'job_type', 'interval', 'currency',
+                       'salary_source', 'job_level', 'job_function', 'listing_type',
+                       'query_term', 'query_location', 'query_country']
+
+# Column holding each row's id in a DescriptionStore
+DESCRIPTION_ID = 'description_id'
+
+
+def prune_columns(jobs: pd.DataFrame, drop: Iterable[str]) -> pd.DataFrame:
+    """``jobs`` without the ``drop`` columns it has; drop them as each frame arrives, not after merging."""
+    drop = [col for col in drop if col in jobs.columns]
+    return jobs.drop(columns=drop) if drop else jobs
+
+
+def categorize(jobs: pd.DataFrame, columns: Iterable[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Store repetitive text columns as categoricals: one copy per distinct value plus small integer codes.
+
+    Columns whose values are mostly distinct are left alone, since a
+    categorical would only add codes on top of the strings.
+    """
+    converted = {}
+    for col in columns:
+        if col not in jobs.columns or isinstance(jobs[col].dtype, pd.CategoricalDtype):
+            continue
+        values = jobs[col]
+        if values.dtype == object and values.nunique(dropna=True) <= max(1, len(values) // 2):
+            converted[col] = values.astype('category')
+    return jobs.assign(**converted) if converted else jobs
+
+
+def concat_jobs(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """``pd.concat`` that keeps categorical columns categorical.
+
+    Frames categorized one at a time have different category sets, and
+    concatenating those falls back to full object columns, at peak size.
+    Each categorical column is given the union of every frame's categories
+    first, so the merge only copies the integer codes.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    columns = [col for col in dict.fromkeys(col for frame in frames for col in frame.columns)
+               if any(col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)]
+    if columns:
+        dtypes = {}
+        for col in columns:
+            categories = {}
+            for frame in frames:
+                if col not in frame.columns:
+                    continue
+                values = frame[col]
+                values = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values.dropna().unique()
+                categories.update(dict.fromkeys(values))
+            dtypes[col] = pd.CategoricalDtype(list(categories))
+        frames = [
+            frame.assign(**{
+                col: frame[col].astype(dtype) if col in frame.columns
+                else pd.Categorical([None] * len(frame), dtype=dtype)
+                for col, dtype in dtypes.items()
+            })
+            for frame in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+class DescriptionStore:
+    """Append-only file of zlib-compressed descriptions, read back through mmap.
+
+    Each distinct text is stored once and gets an integer id. Rows keep only
+    that id, so the text stays out of the Python heap until a stage asks for
+    it; reads come from the OS page cache. The file is temporary and removed
+    by ``close``.
+    """
+
+    def __init__(self, path: Optional[str] = None, level: int = 6):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            handle, path = tempfile.mkstemp(prefix="descriptions_", suffix=".bin", dir=CACHE_DIR)
+            os.close(handle)
+        self.path = path
+        self.level = level
+        self._file = open(path, "wb+")
+        self._offsets = []
+        self._sizes = []
+        self._lengths = []
+        self._ids = {}
+        self._map = None
+        self._mapped_size = 0
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def add(self, texts: Iterable) -> np.ndarray:
+        """Store texts and return their ids; missing values get -1."""
+        ids = []
+        with self._lock:
+            for text in texts:
+                if not isinstance(text, str):
+                    ids.append(-1)
+                    continue
+                raw = text.encode("utf-8")
+                digest = hashlib.blake2b(raw, digest_size=16).digest()
+                known = self._ids.get(digest)
+                if known is None:
+                    blob = zlib.compress(raw, self.level)
+                    self._file.write(blob)
+                    known = self._ids[digest] = len(self._offsets)
+                    self._offsets.append(self._written)
+                    self._sizes.append(len(blob))
+                    self._lengths.append(len(text))
+                    self._written += len(blob)
+                ids.append(known)
+        return np.asarray(ids, dtype=np.int64)
+
+    def _view(self) -> mmap.mmap:
+        # Remap only when appends have grown the file past the mapped part
+        if self._map is None or self._mapped_size < self._written:
+            self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), self._written, access=mmap.ACCESS_READ)
+            self._mapped_size = self._written
+        return self._map
+
+    def get_many(self, ids: Sequence[int]) -> List[Optional[str]]:
+        with self._lock:
+            if not self._written:
+                return [None] * len(ids)
+            view = self._view()
+            texts = []
+            for text_id in ids:
+                if text_id < 0:
+                    texts.append(None)
+                    continue
+                start = self._offsets[text_id]
+                texts.append(zlib.decompress(view[start:start + self._sizes[text_id]]).decode("utf-8"))
+            return texts
+
+    def get(self, text_id: int) -> Optional[str]:
+        return self.get_many([text_id])[0]
+
+    def lengths(self, ids: Sequence[int]) -> np.ndarray:
+        """Character count per id without decompressing anything."""
+        with self._lock:
+            known = np.asarray(self._lengths + [0], dtype=np.int64)
+        return known[np.asarray(ids, dtype=np.int64)]
+
+    def stats(self) -> str:
+        raw = sum(self._lengths)
+        return (f"Description store: {len(self)} distinct texts, "
+                f"{raw / 1e6:.1f} MB of text in {self._written / 1e6:.1f} MB on disk")
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if not self._file.closed:
+                self._file.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class Descriptions:
+    """Read-only sequence of description texts for some store ids.
+
+    Indexing or slicing decompresses only the requested rows, so stages
+    such as MinHash deduplication can walk the texts chunk by chunk.
+    """
+
+    def __init__(self, store: DescriptionStore, ids: Sequence[int]):
+        self.store = store
+        self.ids = np.asarray(ids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.store.get_many(self.ids[item])
+        return self.store.get(int(self.ids[item]))
+
+    def __iter__(self):
+        for start in range(0, len(self.ids), 5000):
+            yield from self.store.get_many(self.ids[start:start + 5000])
+
+    def lengths(self) -> np.ndarray:
+        return self.store.lengths(self.ids)
+
+
+def compact_jobs(jobs: pd.DataFrame, store: Optional[DescriptionStore] = None,
+                 drop: Iterable[str] = ()) -> pd.DataFrame:
+    """Pruned, categorical copy of ``jobs``; with a store, descriptions move out to it."""
+    jobs = categorize(prune_columns(jobs, drop))
+    if store is not None and 'description' in jobs.columns:
+        position = jobs.columns.get_loc('description')
+        ids = store.add(jobs['description'])
+        jobs = jobs.drop(columns=['description'])
+        jobs.insert(position, DESCRIPTION_ID, ids)
+    return jobs
+
+
+def descriptions(jobs: pd.DataFrame, store: Optional[DescriptionStore] = None):
+    """Description texts of ``jobs``, lazily from the store when they were moved there."""
+    if store is not None and DESCRIPTION_ID in jobs.columns:
+        return Descriptions(store, jobs[DESCRIPTION_ID].to_numpy())
+    if 'description' in jobs.columns:
+        return jobs['description'].tolist()
+    return None
+
+
+def expand_jobs(jobs: pd.DataFrame, store: DescriptionStore) -> pd.DataFrame:
+    """``jobs`` with the description text back in place of its store id."""
+    if DESCRIPTION_ID not in jobs.columns:
+        return jobs
+    position = jobs.columns.get_loc(DESCRIPTION_ID)
+    texts = store.get_many(jobs[DESCRIPTION_ID].to_numpy())
+    jobs = jobs.drop(columns=[DESCRIPTION_ID])
+    jobs.insert(position, 'description', texts)
+    return jobs
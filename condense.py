@@ -0,0 +1,206 @@
+from collections import OrderedDict
+import hashlib
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from scoring import estimate_tokens
+
+# Section headings whose whole section is dropped
+BOILERPLATE_HEADINGS = re.compile(
+    r"equal (employment )?opportunit|eeo|benefits|perks|what we offer|why (join|work)|"
+    r"about (us|the company|the team|our company)|who we are|our (culture|values|mission)|"
+    r"compensation|pay transparency|salary range|accommodation|privacy|disclaimer|"
+    r"e-?verify|how to apply|diversity",
+    re.IGNORECASE
+)
+
+# Legal sentences dropped wherever they appear. Benefit words (dental, 401k, ...) are
+# left out on purpose: they also turn up in requirements and are only dropped under
+# a benefits heading.
+BOILERPLATE_SENTENCES = re.compile(
+    r"equal opportunity employer|without regard to (race|age|sex)|reasonable accommodation|"
+    r"protected veteran|e-?verify|drug[- ]free|privacy (policy|notice)|recruitment agencies|"
+    r"we are an? (affirmative action|equal)",
+    re.IGNORECASE
+)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+REQUIREMENT_HEADINGS = re.compile(
+    r"requirement|qualification|what you('|’)?ll (need|bring)|what we('|’)?re looking for|"
+    r"must have|skills|experience|you have|about you|who you are",
+    re.IGNORECASE
+)
+
+RESPONSIBILITY_HEADINGS = re.compile(
+    r"responsibilit|what you('|’)?ll do|duties|the role|your role|day[- ]to[- ]day|"
+    r"key tasks|what you will do|position summary|job summary|overview",
+    re.IGNORECASE
+)
+
+MARKDOWN_HEADING = re.compile(r"^\s*(#{1,6}\s+|\*\*[^*]{1,80}\*\*\s*:?\s*$)")
+PLAIN_HEADING = re.compile(r"^[^.!?]{1,60}:\s*$")
+WHITESPACE = re.compile(r"\s+")
+
+# Lower rank is kept first
+REQUIREMENTS, RESPONSIBILITIES, OTHER = 0, 1, 2
+
+
+def _is_heading(line: str) -> bool:
+    return bool(MARKDOWN_HEADING.match(line) or PLAIN_HEADING.match(line.strip()))
+
+
+def _section_rank(heading: str) -> Optional[int]:
+    """Rank for a section heading, or None if the section is boilerplate."""
+    if BOILERPLATE_HEADINGS.search(heading):
+        return None
+    if REQUIREMENT_HEADINGS.search(heading):
+        return REQUIREMENTS
+    if RESPONSIBILITY_HEADINGS.search(heading):
+        return RESPONSIBILITIES
+    return OTHER
+
+
+def _without_boilerplate(paragraph: str) -> str:
+    """The paragraph minus its legal boilerplate sentences; empty if that is all it was."""
+    if not BOILERPLATE_SENTENCES.search(paragraph):
+        return paragraph
+    return " ".join(sentence for sentence in SENTENCE_END.split(paragraph)
+                    if not BOILERPLATE_SENTENCES.search(sentence))
+
+
+def _truncate_words(text: str, tokens: int) -> str:
+    words = text.split()
+    kept = []
+    used = 0
+    for word in words:
+        cost = estimate_tokens(word + " ")
+        if used + cost > tokens:
+            break
+        kept.append(word)
+        used += cost
+    return " ".join(kept)
+
+
+class DescriptionCondenser:
+    """Shrink job descriptions to a token budget before they reach the LLM.
+
+    Boilerplate sections (EEO, benefits, company blurbs) are dropped up to
+    the next blank line, legal boilerplate sentences are removed, repeated
+    paragraphs are removed, and what remains is packed into the budget
+    with requirements first, then responsibilities, then the rest. If
+    nothing is left, the original text is cut to the budget instead. The
+    output depends only on the input text and the budget.
+    """
+
+    def __init__(self, token_budget: int = 600, cache_size: int = 10000):
+        self.token_budget = token_budget
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.descriptions = 0
+
+    def _paragraphs(self, text: str) -> List[Tuple[int, int, str]]:
+        """Split into (rank, position, paragraph) with boilerplate removed."""
+        paragraphs = []
+        rank = OTHER
+        seen = set()
+        block = []
+        section_lines = 0
+
+        def flush():
+            if not block:
+                return
+            paragraph = " ".join(block).strip()
+            block.clear()
+            if rank is None:
+                return
+            paragraph = _without_boilerplate(paragraph)
+            if not paragraph:
+                return
+            fingerprint = WHITESPACE.sub(" ", paragraph.lower())
+            if fingerprint in seen:
+                return
+            seen.add(fingerprint)
+            paragraphs.append((rank, len(paragraphs), paragraph))
+
+        for line in text.splitlines():
+            if not line.strip():
+                flush()
+                # A boilerplate section ends at its first blank line; an unmarked
+                # requirements list often follows without a heading of its own
+                if rank is None and section_lines:
+                    rank = OTHER
+            elif _is_heading(line):
+                flush()
+                rank = _section_rank(line)
+                section_lines = 0
+            elif line.lstrip().startswith(("-", "*", "•")):
+                # Keep bullet points as separate paragraphs so they dedupe individually
+                flush()
+                block.append(line.strip())
+                flush()
+                section_lines += 1
+            else:
+                block.append(line.strip())
+                section_lines += 1
+        flush()
+        return paragraphs
+
+    def _condense(self, text: str) -> str:
+        kept = []
+        used = 0
+        for rank, position, paragraph in sorted(self._paragraphs(text)):
+            cost = estimate_tokens(paragraph) + 1
+            if used + cost <= self.token_budget:
+                kept.append(paragraph)
+                used += cost
+                continue
+            remaining = self.token_budget - used
+            if remaining > 8:
+                kept.append(_truncate_words(paragraph, remaining))
+            break
+        if not kept:
+            # Everything looked like boilerplate; an empty description would be scored "Not Apply"
+            return _truncate_words(text, self.token_budget)
+        return "\n".join(kept)
+
+    def condense(self, text) -> str:
+        """Return the condensed description, reusing earlier results by content hash."""
+        if not isinstance(text, str) or not text:
+            return text
+        if not self.token_budget:
+            return text
+
+        key = hashlib.sha256(f"{self.token_budget}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            condensed = self._cache.get(key)
+            if condensed is not None:
+                self._cache.move_to_end(key)
+
+        if condensed is None:
+            condensed = self._condense(text)
+            with self._lock:
+                self._cache[key] = condensed
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        with self._lock:
+            self.descriptions += 1
+            self.tokens_before += estimate_tokens(text)
+            self.tokens_after += estimate_tokens(condensed)
+        return condensed
+
+    def condense_all(self, texts: List[str]) -> List[str]:
+        return [self.condense(text) for text in texts]
+
+    def report(self) -> str:
+        saved = self.tokens_before - self.tokens_after
+        percent = (saved / self.tokens_before * 100) if self.tokens_before else 0.0
+        return (f"Condensed {self.descriptions} descriptions: saved ~{saved} tokens "
+                f"({percent:.0f}%, {self.tokens_before} -> {self.tokens_after})")
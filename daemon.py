@@ -0,0 +1,328 @@
+"""Run saved watch-lists on a schedule and alert on new "Must Apply" matches.
+
+Usage: python daemon.py watchlists.json [--alerts alerts.jsonl] [--webhook URL]
+                        [--max-rss-mb 1024] [--keep-alive 90m] [--once]
+
+The watch-list file holds saved searches in the format cli.py reads, each
+with two optional scheduling keys:
+
+    [
+        {"name": "data-nyc", "search_term": "data engineer", "location": "New York, NY",
+         "analyze": true, "resume": "resume.pdf", "interval_minutes": 60, "jitter": 0.2}
+    ]
+
+Each watch reruns every ``interval_minutes``, randomly stretched or shrunk
+by up to ``jitter`` of the interval so the boards never see a fixed
+beat. Watches always run incrementally, so only postings the watch has not
+handled before are scored and exported. Every new "Must Apply" match is
+appended to the --alerts JSON-lines file and, with --webhook, POSTed as
+JSON. The file is re-read whenever it changes.
+
+One pipeline (warm LLM chain, caches, job index) and one pool of HTTP
+sessions serve every run. Memory is released after each run; with
+--max-rss-mb the daemon exits with status 75 once a run leaves it above
+the limit, so a supervisor such as systemd (Restart=on-failure) can
+restart it clean.
+"""
+import argparse
+from datetime import date, datetime
+import gc
+import json
+import math
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from cli import load_searches
+from pipeline import JobPipeline, build_search
+from session_pool import SessionPool
+from worker import Cancelled
+
+# Scheduling keys of a watch, with their defaults
+WATCH_DEFAULTS = {'interval_minutes': 60, 'jitter': 0.2}
+
+ALERT_CATEGORY = 'Must Apply'
+ALERT_FIELDS = ['title', 'company', 'location', 'date_posted', 'job_url', 'similarity']
+
+# Exit status asking a supervisor to restart the daemon (EX_TEMPFAIL)
+RESTART_EXIT_CODE = 75
+
+
+def load_watchlists(path: str) -> Dict[str, dict]:
+    """Watches by name: the saved search plus its interval and jitter."""
+    watches = {}
+    for number, entry in enumerate(load_searches(path), start=1):
+        entry = dict(entry)
+        entry.setdefault('name', f"watch{number}")
+        schedule = {key: entry.pop(key, default) for key, default in WATCH_DEFAULTS.items()}
+        if float(schedule['interval_minutes']) <= 0:
+            raise ValueError(f"{entry['name']}: interval_minutes must be positive")
+        if not 0 <= float(schedule['jitter']) < 1:
+            raise ValueError(f"{entry['name']}: jitter must be between 0 and 1")
+        entry['incremental'] = True
+        watches[entry['name']] = {
+            'search': build_search(**entry),
+            'interval': float(schedule['interval_minutes']) * 60,
+            'jitter': float(schedule['jitter']),
+        }
+    return watches
+
+
+def next_delay(watch: dict, rng: random.Random) -> float:
+    return watch['interval'] * (1 + rng.uniform(-watch['jitter'], watch['jitter']))
+
+
+def rss_mb() -> float:
+    """Current resident set size; the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def release_memory():
+    """Collect cycles and hand freed heap pages back to the OS.
+
+    glibc keeps freed arenas mapped, so without the trim the resident size
+    ratchets up to the largest run seen and stays there.
+    """
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def _plain(value):
+    """JSON-friendly cell value: dates as YYYY-MM-DD, NaN and NaT as None."""
+    try:
+        if value != value:
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, 'item'):
+        # numpy scalars, e.g. float32 similarities
+        value = value.item()
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        return round(value, 3)
+    return value
+
+
+class AlertWriter:
+    """Record new "Must Apply" matches in a JSON-lines file and optionally a webhook.
+
+    Used as the pipeline's ``on_results`` hook, so it sees exactly the jobs
+    each run exported, which for an incremental watch are the unseen ones.
+    A failing webhook is logged and never fails the run; the file still has
+    every alert.
+    """
+
+    def __init__(self, path: str, webhook: Optional[str] = None, timeout: float = 10,
+                 log: Optional[Callable[[str], None]] = None):
+        self.path = path
+        self.webhook = webhook
+        self.timeout = timeout
+        self.log = log or print
+        self.sent = 0
+
+    def alerts(self, search: dict, jobs) -> List[dict]:
+        if 'category' not in jobs.columns:
+            return []
+        matches = jobs[(jobs['category'] == ALERT_CATEGORY).to_numpy()]
+        fields = [field for field in ALERT_FIELDS if field in matches.columns]
+        found = datetime.now().isoformat(timespec="seconds")
+        return [
+            dict({'watch': search['name'], 'found': found},
+                 **{field: _plain(value) for field, value in zip(fields, row)})
+            for row in matches[fields].itertuples(index=False, name=None)
+        ]
+
+    def __call__(self, search: dict, jobs):
+        alerts = self.alerts(search, jobs)
+        if not alerts:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, default=str, ensure_ascii=False) + "\n")
+        self.sent += len(alerts)
+        self.log(f"{len(alerts)} new {ALERT_CATEGORY} matches written to {self.path}")
+        if self.webhook:
+            self.post(search['name'], alerts)
+
+    def post(self, name: str, alerts: List[dict]):
+        import requests
+        try:
+            response = requests.post(self.webhook, json={'watch': name, 'alerts': alerts}, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.log(f"Webhook failed, alerts are only in {self.path}: {str(e)}")
+
+
+class WatchDaemon:
+    """Run every watch on its own jittered schedule with one shared pipeline.
+
+    Watches run one at a time: a run that overlaps another watch's due time
+    delays it rather than competing for the same boards and LLM.
+    """
+
+    def __init__(self, path: str, alerts_path: str, webhook: Optional[str] = None,
+                 max_rss_mb: Optional[float] = None, session_max_age: float = 3600,
+                 keep_alive: Optional[str] = None, log: Optional[Callable[[str], None]] = None,
+                 rng: Optional[random.Random] = None):
+        self.path = path
+        self.max_rss_mb = max_rss_mb
+        self.keep_alive = keep_alive
+        self.rng = rng or random.Random()
+        self.stop_event = threading.Event()
+        self.watches = {}
+        self.current = None
+        self._print = log or (lambda message: print(message, flush=True))
+        self._mtime = None
+        self.alerts = AlertWriter(alerts_path, webhook, log=self.log)
+        self.sessions = SessionPool(max_age=session_max_age)
+        self.pipeline = JobPipeline(log=self.log, cancel_event=self.stop_event, on_results=self.alerts)
+
+    def log(self, message: str):
+        prefix = f"[{self.current}] " if self.current else ""
+        self._print(f"{datetime.now():%Y-%m-%d %H:%M:%S} {prefix}{message}")
+
+    def reload(self):
+        """Re-read the watch-list file if it changed, keeping the schedule of unchanged watches."""
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return
+            watches = load_watchlists(self.path)
+            if not watches:
+                raise ValueError(f"{self.path} has no saved searches")
+        except (OSError, ValueError) as e:
+            if not self.watches:
+                raise
+            self.log(f"Keeping the current watch-lists, could not reload {self.path}: {str(e)}")
+            return
+        self._mtime = mtime
+
+        now = time.time()
+        for name, watch in watches.items():
+            previous = self.watches.get(name)
+            # New watches start at staggered times so they do not all hit the boards at once
+            stagger = self.rng.uniform(0, watch['interval'] * watch['jitter'])
+            watch['due'] = previous['due'] if previous else now + stagger
+        added = sorted(set(watches) - set(self.watches))
+        removed = sorted(set(self.watches) - set(watches))
+        self.watches = watches
+        self.log(f"Loaded {len(watches)} watch-lists from {self.path}"
+                 + (f", added {', '.join(added)}" if added and len(added) < len(watches) else "")
+                 + (f", removed {', '.join(removed)}" if removed else ""))
+
+        analyzed = [watch for watch in watches.values() if watch['search']['analyze']]
+        if analyzed:
+            # Keep the model loaded through the longest gap between runs
+            longest = max(watch['interval'] * (1 + watch['jitter']) for watch in analyzed)
+            self.pipeline.scorer.use_keep_alive(self.keep_alive or f"{math.ceil(longest / 60) + 5}m")
+
+    def run_watch(self, watch: dict):
+        self.current = watch['search']['name']
+        try:
+            summary = self.pipeline.run(watch['search'])
+            categories = summary.get('categories') or {}
+            self.log(f"Done: {summary['jobs']} new jobs, {summary.get('seen', 0)} seen before"
+                     + (f", {categories.get(ALERT_CATEGORY, 0)} {ALERT_CATEGORY}" if categories else ""))
+        except Cancelled:
+            raise
+        except Exception as e:
+            # The watch stays scheduled; its index window only closes on success
+            self.log(f"Run failed: {str(e)}")
+        finally:
+            watch['due'] = time.time() + next_delay(watch, self.rng)
+            self.current = None
+
+    def housekeeping(self) -> bool:
+        """Release memory after a run; False once the RSS limit is exceeded."""
+        release_memory()
+        resident = rss_mb()
+        self.log(f"Resident memory {resident:.0f} MB; {self.sessions.stats(reset=True)}; "
+                 f"{self.alerts.sent} alerts so far")
+        if self.max_rss_mb and resident > self.max_rss_mb:
+            self.log(f"Resident memory over the {self.max_rss_mb:.0f} MB limit, exiting for a restart")
+            return False
+        return True
+
+    def serve(self, once: bool = False) -> int:
+        self.reload()
+        self.sessions.install()
+        try:
+            if once:
+                for watch in list(self.watches.values()):
+                    self.run_watch(watch)
+                self.housekeeping()
+                return 0
+
+            while not self.stop_event.is_set():
+                self.reload()
+                watch = min(self.watches.values(), key=lambda item: item['due'])
+                wait = watch['due'] - time.time()
+                if wait > 0:
+                    # Wake at least once a minute to pick up watch-list edits
+                    self.stop_event.wait(min(wait, 60))
+                    continue
+                self.run_watch(watch)
+                if not self.housekeeping():
+                    return RESTART_EXIT_CODE
+                upcoming = min(self.watches.values(), key=lambda item: item['due'])
+                self.log(f"Next: {upcoming['search']['name']} at "
+                         f"{datetime.fromtimestamp(upcoming['due']):%H:%M:%S}")
+        except Cancelled:
+            pass
+        finally:
+            self.sessions.uninstall()
+            self.sessions.clear()
+        self.log("Stopped")
+        return 0
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("watchlists", help="JSON or YAML file of saved searches with interval_minutes/jitter")
+    parser.add_argument("--alerts", default="alerts.jsonl", help="JSON-lines file new matches are appended to")
+    parser.add_argument("--webhook", help="URL to POST each run's new matches to as JSON")
+    parser.add_argument("--max-rss-mb", type=float,
+                        help=f"exit with status {RESTART_EXIT_CODE} when a run leaves more memory resident than this")
+    parser.add_argument("--session-max-age", type=float, default=60,
+                        help="minutes before a pooled HTTP session is replaced")
+    parser.add_argument("--keep-alive",
+                        help="how long Ollama keeps the model loaded between runs, e.g. 90m "
+                             "(default: the longest watch interval)")
+    parser.add_argument("--once", action="store_true", help="run every watch once and exit")
+    args = parser.parse_args(argv)
+
+    daemon = WatchDaemon(args.watchlists, args.alerts, args.webhook, max_rss_mb=args.max_rss_mb,
+                         session_max_age=args.session_max_age * 60, keep_alive=args.keep_alive)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    try:
+        return daemon.serve(once=args.once)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
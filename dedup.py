@@ -0,0 +1,288 @@
+import re
+import zlib
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words that vary between boards without changing the job
+TITLE_ABBREVIATIONS = {
+    r"\bsr\b": "senior",
+    r"\bjr\b": "junior",
+    r"\bmgr\b": "manager",
+    r"\beng\b": "engineer",
+    r"\bdev\b": "developer",
+}
+COMPANY_SUFFIXES = re.compile(
+    r"\b(inc|incorporated|llc|l l c|ltd|limited|corp|corporation|co|company|plc|gmbh|ag|sa|lp|llp)\b\s*$"
+)
+COUNTRY_NAMES = {"us", "usa", "united states", "united states of america", "ca", "canada", "uk",
+                 "united kingdom", "gb", "anywhere"}
+
+
+def normalize_title(titles: pd.Series) -> pd.Series:
+    text = titles.fillna("").astype(str).str.lower()
+    text = text.str.replace(r"\([^)]*\)|\[[^\]]*\]", " ", regex=True)
+    text = text.str.replace(r"[^a-z0-9+#]+", " ", regex=True)
+    for pattern, replacement in TITLE_ABBREVIATIONS.items():
+        text = text.str.replace(pattern, replacement, regex=True)
+    return text.str.split().str.join(" ")
+
+
+def normalize_company(companies: pd.Series) -> pd.Series:
+    text = companies.fillna("").astype(str).str.lower()
+    text = text.str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+    # Twice, for names like "Acme Holdings Co. Ltd."
+    text = text.str.replace(COMPANY_SUFFIXES, "", regex=True).str.strip()
+    text = text.str.replace(COMPANY_SUFFIXES, "", regex=True).str.strip()
+    return text.str.split().str.join(" ")
+
+
+def normalize_location(locations: pd.Series) -> pd.Series:
+    def clean(value):
+        parts = [part.strip() for part in re.sub(r"[^a-z0-9,]+", " ", value).split(",")]
+        parts = [part for part in parts if part and part not in COUNTRY_NAMES]
+        return ",".join(parts)
+
+    text = locations.fillna("").astype(str).str.lower()
+    return text.map(clean)
+
+
+def _normalized(jobs: pd.DataFrame, col: str, normalize) -> np.ndarray:
+    """Normalised values of a column; categoricals are normalised once per category."""
+    if col not in jobs:
+        return np.full(len(jobs), "", dtype=object)
+    values = jobs[col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Missing values have code -1, which picks the trailing empty string
+        distinct = normalize(pd.Series(values.cat.categories.astype(object))).to_list() + [""]
+        return np.asarray(distinct, dtype=object)[values.cat.codes.to_numpy()]
+    return normalize(values).to_numpy()
+
+
+def _token_set(text: str) -> set:
+    return set(text.split())
+
+
+class JobDeduplicator:
+    """Collapse the same posting scraped from several boards into one row.
+
+    Rows whose normalised title, company and location match are merged
+    unless their descriptions agree less than ``key_threshold``. Rows whose descriptions are near-duplicates (MinHash estimate of
+    word-shingle Jaccard similarity at or above ``threshold``) are merged when
+    their companies match, their titles share most words and their locations
+    do not conflict. Candidate pairs come from locality-sensitive hashing of
+    the MinHash signatures, so the work grows roughly linearly with the rows.
+    """
+
+    def __init__(self, threshold: float = 0.7, key_threshold: float = 0.3, num_perm: int = 64,
+                 bands: int = 16, shingle_size: int = 3, max_words: int = 800, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.key_threshold = key_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.max_words = max_words
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make (a * x + b) mod 2**64 a permutation of x
+        self._a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.last_input = 0
+        self.last_output = 0
+        self.last_duplicates = 0
+
+    def _shingles(self, texts: List[str]):
+        """Hashed word shingles of every text, concatenated, with per-text counts.
+
+        Words are hashed once per distinct word and shingles are built over
+        the whole chunk at once; repeated shingles are kept since they do not
+        change a minimum.
+        """
+        size = self.shingle_size
+        tokens = [TOKEN.findall(text.lower())[:self.max_words] if isinstance(text, str) else [] for text in texts]
+        lengths = np.fromiter((len(words) for words in tokens), dtype=np.int64, count=len(tokens))
+        counts = np.maximum(lengths - size + 1, 0)
+        if not counts.any():
+            return np.zeros(0, dtype=np.uint64), counts
+
+        codes, vocabulary = pd.factorize(np.fromiter(
+            (word for words in tokens for word in words), dtype=object, count=int(lengths.sum())
+        ))
+        word_hashes = np.fromiter((zlib.crc32(word.encode()) | 1 for word in vocabulary),
+                                  dtype=np.uint64, count=len(vocabulary))
+        ids = word_hashes[codes]
+
+        windows = len(ids) - size + 1
+        hashed = ids[:windows].copy()
+        with np.errstate(over="ignore"):
+            for offset in range(1, size):
+                hashed = hashed * np.uint64(0x100000001B3) ^ ids[offset:windows + offset]
+        # Keep only windows that start and end inside the same text
+        ends = np.cumsum(lengths)
+        position = np.arange(windows)
+        owner = np.searchsorted(ends, position, side="right")
+        return hashed[position + size <= ends[owner]], counts
+
+    def signatures(self, texts: Sequence[str], chunk_rows: int = 5000) -> np.ndarray:
+        """MinHash signature per text (num_perm x uint32); all-max rows for empty texts."""
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(texts), chunk_rows):
+            flat, counts = self._shingles(texts[start:start + chunk_rows])
+            filled = np.flatnonzero(counts)
+            if not len(filled):
+                continue
+            offsets = np.concatenate(([0], np.cumsum(counts[filled])[:-1]))
+            with np.errstate(over="ignore"):
+                for perm in range(self.num_perm):
+                    hashed = (flat * self._a[perm] + self._b[perm]) >> np.uint64(32)
+                    signatures[start + filled, perm] = np.minimum.reduceat(hashed, offsets)
+        return signatures
+
+    def cluster(self, jobs: pd.DataFrame, descriptions: Optional[Sequence] = None) -> np.ndarray:
+        """Cluster id per row; rows with the same id are the same posting.
+
+        ``descriptions`` stands in for the description column, e.g. a lazy
+        ``compact.Descriptions`` view when the text lives out of the frame.
+        """
+        n = len(jobs)
+        parent = list(range(n))
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        def union(x, y):
+            x, y = find(x), find(y)
+            if x != y:
+                parent[max(x, y)] = min(x, y)
+
+        titles = _normalized(jobs, 'title', normalize_title)
+        companies = _normalized(jobs, 'company', normalize_company)
+        locations = _normalized(jobs, 'location', normalize_location)
+
+        if descriptions is None and 'description' in jobs:
+            descriptions = jobs['description'].tolist()
+        if descriptions is not None:
+            signatures = self.signatures(descriptions)
+        else:
+            signatures = np.full((n, self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        has_text = signatures[:, 0] != np.iinfo(np.uint32).max
+        title_words = {}
+        rows_per_band = self.num_perm // self.bands
+
+        def agreement(x, y):
+            return np.mean(signatures[x] == signatures[y])
+
+        # Same normalised title, company and location: merged unless both
+        # descriptions exist and clearly differ (e.g. two openings of one role)
+        keys = pd.Series(titles) + "\x00" + pd.Series(companies) + "\x00" + pd.Series(locations)
+        exact = keys.groupby(keys, sort=False).ngroup().to_numpy()
+        first = {}
+        for row, group in enumerate(exact):
+            if not (titles[row] or companies[row]):
+                continue
+            head = first.setdefault(group, row)
+            if head != row and (not has_text[row] or not has_text[head]
+                                or agreement(row, head) >= self.key_threshold):
+                union(row, head)
+
+        def similar(x, y):
+            if companies[x] != companies[y]:
+                return False
+            if locations[x] and locations[y] and locations[x] != locations[y]:
+                return False
+            if titles[x] != titles[y]:
+                tx = title_words.setdefault(x, _token_set(titles[x]))
+                ty = title_words.setdefault(y, _token_set(titles[y]))
+                if not tx or not ty or len(tx & ty) / len(tx | ty) < 0.5:
+                    return False
+            return agreement(x, y) >= self.threshold
+
+        candidates = np.flatnonzero(has_text)
+        for band in range(self.bands):
+            block = np.ascontiguousarray(signatures[candidates, band * rows_per_band:(band + 1) * rows_per_band])
+            buckets = block.view(np.dtype((np.void, block.dtype.itemsize * rows_per_band))).ravel()
+            _, inverse, sizes = np.unique(buckets, return_inverse=True, return_counts=True)
+            shared = sizes[inverse] > 1
+            if not shared.any():
+                continue
+            rows = candidates[shared]
+            order = np.argsort(inverse[shared], kind="stable")
+            rows, groups = rows[order], inverse[shared][order]
+            # Compare each bucket member with the bucket's first row and its predecessor
+            head = rows[0]
+            for position in range(1, len(rows)):
+                if groups[position] != groups[position - 1]:
+                    head = rows[position]
+                    continue
+                row = rows[position]
+                for other in (head, rows[position - 1]):
+                    if find(row) != find(other) and similar(row, other):
+                        union(row, other)
+
+        return np.array([find(row) for row in range(n)])
+
+    def dedupe(self, jobs: pd.DataFrame, clusters: Optional[np.ndarray] = None,
+               descriptions: Optional[Sequence] = None) -> pd.DataFrame:
+        """One row per cluster, with every copy's URL in ``source_urls``.
+
+        The representative is the copy with the longest description; clusters
+        keep the order in which their first copy was scraped.
+        """
+        self.last_input = len(jobs)
+        if len(jobs) == 0:
+            self.last_output = 0
+            self.last_duplicates = 0
+            return jobs
+        if clusters is None:
+            clusters = self.cluster(jobs, descriptions)
+
+        frame = jobs.reset_index(drop=True)
+        if descriptions is not None:
+            length = (descriptions.lengths() if hasattr(descriptions, 'lengths')
+                      else [len(text) if isinstance(text, str) else 0 for text in descriptions])
+        elif 'description' in frame:
+            length = frame['description'].fillna("").astype(str).str.len()
+        else:
+            length = 0
+        order = pd.DataFrame({'cluster': clusters, 'length': length, 'row': np.arange(len(frame))})
+        representatives = (
+            order.sort_values(['cluster', 'length', 'row'], ascending=[True, False, True])
+            .drop_duplicates('cluster')
+            .sort_values('cluster')
+        )
+
+        urls = frame['job_url'] if 'job_url' in frame else pd.Series([None] * len(frame))
+        # Representative's URL first, then the others in scrape order
+        rep_row = pd.Series(representatives['row'].to_numpy(), index=representatives['cluster'].to_numpy())
+        url_order = order.assign(rep=order['row'].to_numpy() != rep_row.loc[clusters].to_numpy())
+        url_order = url_order.sort_values(['cluster', 'rep', 'row'])
+        sources = (
+            urls.iloc[url_order['row'].to_numpy()]
+            .groupby(url_order['cluster'].to_numpy(), sort=True)
+            # The same posting returned by several queries appears once
+            .agg(lambda values: list(dict.fromkeys(value for value in values if isinstance(value, str) and value)))
+        )
+        # Copies without a URL cannot be told apart, so each counts as a posting of its own
+        missing = (~urls.map(lambda value: isinstance(value, str) and bool(value))).groupby(clusters).sum()
+
+        result = frame.iloc[representatives['row'].to_numpy()].copy()
+        result['source_urls'] = sources.loc[representatives['cluster'].to_numpy()].to_numpy()
+        postings = result['source_urls'].map(len).to_numpy() + missing.loc[representatives['cluster'].to_numpy()].to_numpy()
+        result['duplicates'] = np.maximum(postings - 1, 0)
+        self.last_output = len(result)
+        self.last_duplicates = int(result['duplicates'].sum())
+        return result.reset_index(drop=True)
+
+    def report(self) -> str:
+        removed = self.last_input - self.last_output
+        return (f"Deduplicated {self.last_input} jobs to {self.last_output} "
+                f"({removed} rows merged, {self.last_duplicates} cross-site duplicates)")
@@ -0,0 +1,157 @@
+import os
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+# pandas and openpyxl load on first export, so the GUIs can import FORMATS at startup
+if TYPE_CHECKING:
+    import pandas as pd
+
+FORMATS = ["xlsx", "csv", "parquet", "jsonl"]
+
+# Rows expanded at a time when descriptions are restored from a side store
+CHUNK_ROWS = 10000
+
+# Define colors for categories
+CATEGORY_COLORS = {
+    'Not Apply': 'FFB6C1',  # Light red
+    'Should Apply': 'FFFACD',  # Light yellow
+    'Must Apply': '90EE90'  # Light green
+}
+
+
+def _as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float) and value != value:
+        return None
+    return str(value)
+
+
+def _as_text_list(value):
+    if isinstance(value, (list, tuple)):
+        return [_as_text(item) for item in value]
+    return None
+
+
+def _is_list_column(series: 'pd.Series') -> bool:
+    """True for object columns whose values are all lists (e.g. ``source_urls``) or missing."""
+    values = series.dropna()
+    return len(values) > 0 and values.map(lambda value: isinstance(value, (list, tuple))).all()
+
+
+def _chunks(df: 'pd.DataFrame', expand: Optional[Callable] = None) -> Iterator['pd.DataFrame']:
+    """``df`` as it should be written, ``CHUNK_ROWS`` rows at a time when ``expand`` restores columns."""
+    if expand is None:
+        yield df
+        return
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield expand(df.iloc[start:start + CHUNK_ROWS])
+
+
+def _excel_ready(df: 'pd.DataFrame') -> 'pd.DataFrame':
+    """Convert columns to values openpyxl can write without per-cell fixes."""
+    import pandas as pd
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            series = series.dt.tz_localize(None)
+        if pd.api.types.is_datetime64_dtype(series) and (series.dropna() == series.dropna().dt.normalize()).all():
+            # Whole days (normalised posting dates) are written as plain dates
+            series = series.dt.date
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            # On a categorical this runs once per category
+            series = series.map(
+                lambda value: ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str)
+                else str(value) if isinstance(value, (list, dict, set, tuple)) else value
+            )
+        series = series.astype(object)
+        out[col] = series.where(series.notna(), None)
+    return pd.DataFrame(out, columns=df.columns)
+
+
+def write_xlsx(df: 'pd.DataFrame', filename: str, sheet_name: str = 'Jobs',
+               category_column: Optional[str] = 'category', expand: Optional[Callable] = None):
+    """Stream rows into a write-only workbook and colour them by category.
+
+    Row colours come from one conditional-formatting rule per category over
+    the whole sheet, so no fill is created or assigned per cell.
+    """
+    from openpyxl import Workbook
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.styles import PatternFill
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.freeze_panes = 'A2'
+
+    columns = expand(df.iloc[:0]).columns if expand is not None else df.columns
+    worksheet.append([str(col) for col in columns])
+    for chunk in _chunks(df, expand):
+        for row in _excel_ready(chunk).itertuples(index=False, name=None):
+            worksheet.append(row)
+
+    if category_column in columns and len(df):
+        last_col = get_column_letter(len(columns))
+        category_col = get_column_letter(columns.get_loc(category_column) + 1)
+        cell_range = f"A2:{last_col}{len(df) + 1}"
+        for category, color in CATEGORY_COLORS.items():
+            fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+            worksheet.conditional_formatting.add(
+                cell_range,
+                FormulaRule(formula=[f'${category_col}2="{category}"'], fill=fill)
+            )
+
+    workbook.save(filename)
+
+
+def write_parquet(df: 'pd.DataFrame', filename: str, expand: Optional[Callable] = None):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+    # Mixed-type object columns (dates next to strings) are stored as text and
+    # list columns as lists of text. Chunks could disagree on column types, so
+    # the table is expanded whole.
+    out = expand(df) if expand is not None else df.copy()
+    for col in out.columns:
+        if out[col].dtype == object:
+            out[col] = out[col].map(_as_text_list if _is_list_column(out[col]) else _as_text)
+    out.to_parquet(filename, index=False)
+
+
+def write_csv(df: 'pd.DataFrame', filename: str, expand: Optional[Callable] = None):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        for number, chunk in enumerate(_chunks(df, expand)):
+            chunk.to_csv(f, index=False, header=number == 0)
+
+
+def write_jsonl(df: 'pd.DataFrame', filename: str, expand: Optional[Callable] = None):
+    with open(filename, 'w', encoding='utf-8') as f:
+        for chunk in _chunks(df, expand):
+            if len(chunk):
+                chunk.to_json(f, orient='records', lines=True, date_format='iso', force_ascii=False)
+
+
+def export_jobs(df: 'pd.DataFrame', filename: str, fmt: Optional[str] = None,
+                category_column: Optional[str] = 'category', expand: Optional[Callable] = None) -> str:
+    """Write jobs in the format given or implied by the file extension.
+
+    ``expand`` turns a slice of ``df`` into the rows to write, e.g. restoring
+    descriptions kept in a ``compact.DescriptionStore``; it is applied a
+    chunk at a time so the full text never sits in memory at once.
+    """
+    fmt = (fmt or os.path.splitext(filename)[1].lstrip('.') or 'xlsx').lower()
+    if fmt == 'xlsx':
+        write_xlsx(df, filename, category_column=category_column, expand=expand)
+    elif fmt == 'csv':
+        write_csv(df, filename, expand)
+    elif fmt == 'parquet':
+        write_parquet(df, filename, expand)
+    elif fmt == 'jsonl':
+        write_jsonl(df, filename, expand)
+    else:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of {', '.join(FORMATS)}")
+    return filename
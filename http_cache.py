@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from llm_cache import CACHE_DIR
+
+# Seconds a cached page is served without asking the site again
+DEFAULT_TTLS = {
+    'linkedin.com': 15 * 60,
+    'indeed.com': 15 * 60,
+}
+
+# Response headers worth keeping with a cached body
+KEPT_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Date', 'Cache-Control']
+
+
+def site_of(url: str) -> str:
+    """Registrable-ish domain of a URL: www.linkedin.com -> linkedin.com."""
+    host = (urlsplit(url).hostname or '').lower()
+    parts = host.split('.')
+    return '.'.join(parts[-2:]) if len(parts) > 2 else host
+
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.sha256(f"GET {url}?{query}".encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """SQLite cache of successful GET responses, bounded by total body size.
+
+    Fresh entries (younger than their site's TTL) are returned without any
+    network I/O. Stale entries with an ETag or Last-Modified are revalidated
+    with a conditional request, so an unchanged page costs a 304 instead of a
+    full download. Least recently used entries are evicted past ``max_bytes``.
+    Request headers are not part of the key, since user agents rotate.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 10 * 60, max_bytes: int = 200 * 1024 * 1024):
+        self.path = path or os.path.join(CACHE_DIR, "http_cache.sqlite")
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self._conn.commit()
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.evict()
+
+    def ttl(self, url: str) -> float:
+        return self.ttls.get(site_of(url), self.default_ttl)
+
+    @staticmethod
+    def _response(url: str, headers: dict, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def _load(self, key: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _store(self, key: str, response: requests.Response, now: float):
+        body = response.content
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, headers, body, size, stored_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, json.dumps(headers), body, len(body), now, now)
+            )
+            self._conn.commit()
+            self.total_bytes += len(body) - (old[0] if old else 0)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def _touch(self, key: str, now: float, refreshed: bool = False):
+        with self._lock:
+            if refreshed:
+                self._conn.execute("UPDATE responses SET stored_at = ?, last_used = ? WHERE key = ?", (now, now, key))
+            else:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+    def get(self, session: requests.Session, url: str, params: Optional[dict] = None,
+            headers: Optional[dict] = None, timeout: Optional[float] = None,
+            throttle: Optional[Callable[[], None]] = None) -> requests.Response:
+        """GET through the cache; ``throttle`` runs only before real network I/O."""
+        key = cache_key(url, params)
+        now = time.time()
+        entry = self._load(key)
+        if entry is not None:
+            cached_url, cached_headers, body, stored_at = entry
+            cached_headers = json.loads(cached_headers)
+            if now - stored_at < self.ttl(url):
+                self._touch(key, now)
+                self.hits += 1
+                return self._response(cached_url, cached_headers, body)
+            # Stale: ask the site whether the page changed
+            headers = dict(headers or {})
+            if 'ETag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        if throttle is not None:
+            throttle()
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+        response.from_cache = False
+        now = time.time()
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, now, refreshed=True)
+            self.revalidated += 1
+            return self._response(cached_url, cached_headers, body)
+        self.misses += 1
+        if response.status_code == 200:
+            self._store(key, response, now)
+        return response
+
+    def evict(self):
+        """Drop the least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+            doomed = []
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                doomed.append((key,))
+                self.total_bytes -= size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            self._conn.commit()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def stats(self) -> str:
+        total = self.hits + self.revalidated + self.misses
+        rate = ((self.hits + self.revalidated) / total * 100) if total else 0.0
+        return (f"HTTP cache: {self.hits} hits, {self.revalidated} revalidated, {self.misses} misses "
+                f"({rate:.0f}% served from cache, {self.total_bytes / 1e6:.1f} MB stored)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from llm_cache import CACHE_DIR
+
+# Fields that make up a posting's content hash
+CONTENT_FIELDS = ['title', 'company', 'location', 'description']
+
+
+def content_hash(title, company, location, description) -> str:
+    digest = hashlib.sha256()
+    for part in (title, company, location, description):
+        text = part if isinstance(part, str) else ""
+        digest.update(" ".join(text.split()).lower().encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def search_key(search: dict, resume: Optional[str] = None) -> str:
+    """Identity of a saved search, independent of its time window.
+
+    The resume is part of the key, so scoring against a new resume treats
+    every posting as new again.
+    """
+    if search.get('name'):
+        identity = {'name': search['name']}
+    else:
+        identity = {key: search.get(key) for key in
+                    ('search_term', 'location', 'sites', 'country', 'job_type', 'is_remote')}
+    digest = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((resume or "").encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+class JobIndex:
+    """SQLite record of postings each saved search has already handled.
+
+    Postings are keyed by search and job URL and carry a content hash, so a
+    posting counts as new until it has been exported once, and again when
+    its content changes. Each search also records its last successful run,
+    from which the next run's ``hours_old`` window is derived.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_DIR, "job_index.sqlite")
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                search TEXT NOT NULL,
+                job_url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                last_verdict TEXT,
+                PRIMARY KEY (search, job_url)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                search TEXT PRIMARY KEY,
+                last_success REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def hashes(jobs: pd.DataFrame) -> List[str]:
+        columns = [jobs[col] if col in jobs.columns else pd.Series([None] * len(jobs), index=jobs.index)
+                   for col in CONTENT_FIELDS]
+        return [content_hash(*values) for values in zip(*columns)]
+
+    @staticmethod
+    def urls(jobs: pd.DataFrame) -> List[List[str]]:
+        """Every URL a row is known by: its own plus any merged duplicates."""
+        own = jobs['job_url'] if 'job_url' in jobs.columns else pd.Series([None] * len(jobs), index=jobs.index)
+        merged = jobs['source_urls'] if 'source_urls' in jobs.columns else pd.Series([None] * len(jobs), index=jobs.index)
+        rows = []
+        for url, sources in zip(own, merged):
+            urls = [url] if isinstance(url, str) and url else []
+            if isinstance(sources, (list, tuple)):
+                urls += [source for source in sources if source not in urls]
+            rows.append(urls)
+        return rows
+
+    def last_success(self, search: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_success FROM runs WHERE search = ?", (search,)).fetchone()
+        return row[0] if row else None
+
+    def hours_since_last_run(self, search: str, now: Optional[float] = None) -> Optional[int]:
+        """Whole hours covering the time since the last successful run, plus one of overlap."""
+        last = self.last_success(search)
+        if last is None:
+            return None
+        elapsed = max(0.0, (now or time.time()) - last)
+        return math.ceil(elapsed / 3600) + 1
+
+    def new_mask(self, search: str, jobs: pd.DataFrame, hashes: Optional[List[str]] = None) -> List[bool]:
+        """True for rows not handled before, or whose content changed since."""
+        hashes = hashes or self.hashes(jobs)
+        all_urls = self.urls(jobs)
+        known = {}
+        wanted = sorted({url for urls in all_urls for url in urls})
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                known.update(self._conn.execute(
+                    f"SELECT job_url, content_hash FROM jobs WHERE search = ? AND job_url IN ({','.join('?' * len(chunk))})",
+                    [search, *chunk]
+                ).fetchall())
+        return [
+            not urls or not any(known.get(url) == digest for url in urls)
+            for urls, digest in zip(all_urls, hashes)
+        ]
+
+    def record(self, search: str, jobs: pd.DataFrame, verdicts: Optional[Iterable] = None,
+               hashes: Optional[List[str]] = None, now: Optional[float] = None):
+        """Upsert rows as seen now, keeping first_seen and any earlier verdict."""
+        now = now or time.time()
+        hashes = hashes or self.hashes(jobs)
+        verdicts = list(verdicts) if verdicts is not None else [None] * len(jobs)
+        rows = [
+            (search, url, digest, now, now, verdict)
+            for urls, digest, verdict in zip(self.urls(jobs), hashes, verdicts)
+            for url in urls
+        ]
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO jobs (search, job_url, content_hash, first_seen, last_seen, last_verdict)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (search, job_url) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen,
+                    last_verdict = COALESCE(excluded.last_verdict, jobs.last_verdict)
+            """, rows)
+            self._conn.commit()
+
+    def touch(self, search: str, jobs: pd.DataFrame, now: Optional[float] = None):
+        """Mark already-handled rows as seen again without changing anything else."""
+        now = now or time.time()
+        rows = [(now, search, url) for urls in self.urls(jobs) for url in urls]
+        with self._lock:
+            self._conn.executemany("UPDATE jobs SET last_seen = ? WHERE search = ? AND job_url = ?", rows)
+            self._conn.commit()
+
+    def mark_success(self, search: str, started: float):
+        """Record a finished run; the next window starts when this run started."""
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO runs (search, last_success) VALUES (?, ?)
+                ON CONFLICT (search) DO UPDATE SET last_success = excluded.last_success
+            """, (search, started))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
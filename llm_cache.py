@@ -0,0 +1,125 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Shared location for on-disk caches, overridable for servers and tests
+CACHE_DIR = os.environ.get(
+    "JOB_SEARCH_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".job_search_cache")
+)
+
+
+class VerdictCache:
+    """SQLite cache of LLM verdicts keyed by resume, job, model and prompt.
+
+    Expired and least recently used entries are evicted on open, on close
+    and every ``evict_every`` inserts, so long-lived instances (the GUIs,
+    the watch daemon) stay within ``max_entries`` too.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 50000,
+                 max_age_days: float = 14, evict_every: int = 1000):
+        self.path = path or os.path.join(CACHE_DIR, "verdicts.sqlite")
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.evict_every = evict_every
+        self._inserts = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                verdict TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_last_used ON verdicts(last_used)")
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(resume: str, job_description: str, model: str, template: str) -> str:
+        """Hash every input that can change the verdict.
+
+        The model name and prompt template are part of the key, so editing
+        either one misses on all old entries and they age out naturally.
+        """
+        digest = hashlib.sha256()
+        for part in (model, template, resume, job_description):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str, count: bool = True) -> Optional[str]:
+        """Cached verdict or None; ``count=False`` leaves the hit/miss stats to the caller."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT verdict, created_at FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age_seconds:
+                self.misses += int(count)
+                return None
+            self._conn.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += int(count)
+            return row[0]
+
+    def record(self, hit: bool):
+        """Count one lookup made of uncounted ``get`` calls."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: str, verdict: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, verdict, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, verdict, now, now)
+            )
+            self._conn.commit()
+            self._inserts += 1
+            due = self._inserts >= self.evict_every
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        with self._lock:
+            self._inserts = 0
+            self._conn.execute(
+                "DELETE FROM verdicts WHERE created_at < ?",
+                (time.time() - self.max_age_seconds,)
+            )
+            self._conn.execute("""
+                DELETE FROM verdicts WHERE key IN (
+                    SELECT key FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self._conn.commit()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"LLM cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+    def close(self):
+        self.evict()
+        with self._lock:
+            self._conn.close()
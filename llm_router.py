@@ -0,0 +1,228 @@
+from collections import deque
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_PORT = 11434
+
+# Ollama endpoints to spread scoring over, e.g. "http://box1:11434,box2"; empty means the local default
+LLM_HOSTS = [host.strip() for host in os.environ.get("JOB_SEARCH_OLLAMA_HOSTS", "").split(",") if host.strip()]
+
+# Seconds one LLM call may take on a host before it is retried elsewhere
+LLM_TIMEOUT = float(os.environ.get("JOB_SEARCH_OLLAMA_TIMEOUT", "120"))
+
+
+def host_url(host: str) -> str:
+    """``box1``, ``box1:11434`` or a full URL, as a base URL without a trailing slash."""
+    host = host.strip().rstrip("/")
+    if "://" not in host:
+        host = f"http://{host}"
+    if host.count(":") < 2:
+        host = f"{host}:{DEFAULT_PORT}"
+    return host
+
+
+class HostState:
+    """Load, health and call statistics of one endpoint."""
+
+    def __init__(self, url: str, samples: int = 1000):
+        self.url = url
+        self.healthy = True
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.latency = None
+        self._samples = samples
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.tokens = 0
+        self.busy = 0.0
+        self.latencies = deque(maxlen=self._samples)
+
+
+def _is_timeout(error: Exception) -> bool:
+    return isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower() \
+        or "timed out" in str(error).lower()
+
+
+class OllamaRouter:
+    """Spread LLM calls over several Ollama hosts.
+
+    Each call goes to the healthy host with the fewest calls in flight,
+    ties broken by the lower recent latency, so faster machines take more
+    of the work. A call that fails or times out (``timeout`` is enforced by
+    the client each host's chain is built with) is retried on another host,
+    up to ``max_attempts`` hosts. After ``max_failures`` consecutive
+    failures a host is taken out of rotation until a health check (GET
+    /api/tags, every ``health_interval`` seconds on a background thread)
+    succeeds again. When every host is down, calls still try them all.
+    """
+
+    def __init__(self, hosts: List[str], timeout: float = LLM_TIMEOUT, max_attempts: Optional[int] = None,
+                 max_failures: int = 2, health_interval: float = 15.0,
+                 log: Optional[Callable[[str], None]] = None):
+        if not hosts:
+            raise ValueError("OllamaRouter needs at least one host")
+        self.hosts = {}
+        for host in hosts:
+            url = host_url(host)
+            self.hosts.setdefault(url, HostState(url))
+        self.timeout = timeout
+        self.max_attempts = max_attempts or len(self.hosts)
+        self.max_failures = max(1, int(max_failures))
+        self.health_interval = health_interval
+        self.log = log or (lambda message: None)
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._checker = None
+        if health_interval:
+            self._checker = threading.Thread(target=self._health_loop, daemon=True, name="ollama-health")
+            self._checker.start()
+
+    def pick(self, exclude=()) -> Optional[HostState]:
+        """Least-loaded host not in ``exclude``, preferring healthy ones; reserves a slot on it."""
+        with self._lock:
+            candidates = [host for host in self.hosts.values() if host.url not in exclude]
+            healthy = [host for host in candidates if host.healthy]
+            pool = healthy or candidates
+            if not pool:
+                return None
+            host = min(pool, key=lambda item: (item.in_flight, item.latency or 0.0))
+            host.in_flight += 1
+            return host
+
+    def call(self, function: Callable[[str], Any], count_tokens: Optional[Callable[[Any], int]] = None):
+        """Run ``function(base_url)`` on the best host, retrying on others if it fails."""
+        tried = []
+        error = None
+        for _ in range(self.max_attempts):
+            host = self.pick(tried)
+            if host is None:
+                break
+            tried.append(host.url)
+            start = time.perf_counter()
+            try:
+                result = function(host.url)
+            except Exception as e:
+                error = e
+                self._failed(host, e, time.perf_counter() - start)
+                continue
+            self._succeeded(host, time.perf_counter() - start, count_tokens(result) if count_tokens else 0)
+            return result
+        raise error if error is not None else RuntimeError("No Ollama host available")
+
+    def _succeeded(self, host: HostState, elapsed: float, tokens: int):
+        with self._lock:
+            host.in_flight -= 1
+            host.calls += 1
+            host.tokens += tokens
+            host.busy += elapsed
+            host.latencies.append(elapsed)
+            # Exponentially weighted, so a host that slows down loses its ties quickly
+            host.latency = elapsed if host.latency is None else 0.8 * host.latency + 0.2 * elapsed
+            host.consecutive_failures = 0
+
+    def _failed(self, host: HostState, error: Exception, elapsed: float):
+        with self._lock:
+            host.in_flight -= 1
+            host.failures += 1
+            host.busy += elapsed
+            timed_out = _is_timeout(error)
+            host.timeouts += int(timed_out)
+            host.consecutive_failures += 1
+            went_down = host.healthy and host.consecutive_failures >= self.max_failures
+            if went_down:
+                host.healthy = False
+        reason = "timed out" if timed_out else f"failed: {str(error)}"
+        self.log(f"LLM call on {host.url} {reason}" + (", taking it out of rotation" if went_down else ""))
+
+    def check(self, host: HostState) -> bool:
+        import httpx
+        try:
+            ok = httpx.get(f"{host.url}/api/tags", timeout=min(5.0, self.timeout)).status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        with self._lock:
+            changed = host.healthy != ok
+            host.healthy = ok
+            if ok:
+                host.consecutive_failures = 0
+        if changed:
+            self.log(f"Ollama host {host.url} is {'back up' if ok else 'down'}")
+        return ok
+
+    def check_all(self) -> Dict[str, bool]:
+        return {url: self.check(host) for url, host in list(self.hosts.items())}
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            self.check_all()
+
+    def reset_stats(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            for host in self.hosts.values():
+                host.reset()
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-host calls, failures, latency percentiles and throughput since the last reset."""
+        import numpy as np
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        report = {}
+        with self._lock:
+            hosts = [(host, list(host.latencies)) for host in self.hosts.values()]
+        for host, latencies in hosts:
+            p50, p90 = np.percentile(latencies, [50, 90]) if latencies else (None, None)
+            report[host.url] = {
+                'healthy': host.healthy,
+                'calls': host.calls,
+                'failures': host.failures,
+                'timeouts': host.timeouts,
+                'p50_seconds': None if p50 is None else round(float(p50), 3),
+                'p90_seconds': None if p90 is None else round(float(p90), 3),
+                'calls_per_minute': round(host.calls / elapsed * 60, 1),
+                'tokens_per_second': round(host.tokens / host.busy, 1) if host.busy else 0.0,
+            }
+        return report
+
+    def report(self) -> List[str]:
+        lines = []
+        for url, row in self.stats().items():
+            latency = f"p50 {row['p50_seconds']:.2f}s / p90 {row['p90_seconds']:.2f}s" if row['calls'] else "no calls"
+            lines.append(f"{url}{'' if row['healthy'] else ' (down)'}: {row['calls']} calls, "
+                         f"{row['failures']} failed ({row['timeouts']} timeouts), {latency}, "
+                         f"{row['calls_per_minute']} calls/min, ~{row['tokens_per_second']} tokens/s")
+        return lines
+
+    def close(self):
+        self._stop.set()
+
+
+class RoutedChain:
+    """Drop-in for a ``prompt | llm`` chain that sends each ``invoke`` through a router.
+
+    ``build(base_url)`` makes the chain for one host; chains are built on
+    first use and reused.
+    """
+
+    def __init__(self, router: OllamaRouter, build: Callable[[str], Any],
+                 count_tokens: Optional[Callable[[str], int]] = None):
+        self.router = router
+        self.build = build
+        self.count_tokens = count_tokens
+        self._chains = {}
+        self._lock = threading.Lock()
+
+    def chain(self, url: str):
+        with self._lock:
+            if url not in self._chains:
+                self._chains[url] = self.build(url)
+            return self._chains[url]
+
+    def invoke(self, inputs: dict):
+        return self.router.call(lambda url: self.chain(url).invoke(inputs), self.count_tokens)
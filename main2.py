@@ -1,8 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from jobspy import scrape_jobs
 import csv
-from datetime import datetime
+from exporter import FORMATS
+from pipeline import JobPipeline, build_search, RUN_MODULES, SITES
+from worker import TaskRunner, Cancelled, warm_imports
 
 class JobSearchApp:
     def __init__(self, root):
@@ -21,7 +22,7 @@ class JobSearchApp:
         
         # Job Sites
         ttk.Label(main_frame, text="Job Sites:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.sites = ["indeed", "linkedin", "zip_recruiter", "glassdoor", "google"]
+        self.sites = SITES
         self.site_vars = {}
         site_frame = ttk.Frame(main_frame)
         site_frame.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=5)
@@ -61,24 +62,54 @@ class JobSearchApp:
         self.country.set("USA")
         self.country.grid(row=7, column=1, sticky=tk.W, pady=5)
         
+        # Export Format
+        ttk.Label(main_frame, text="Export format:").grid(row=8, column=0, sticky=tk.W, pady=5)
+        self.export_format = ttk.Combobox(main_frame, values=FORMATS, state="readonly")
+        self.export_format.set("xlsx")
+        self.export_format.grid(row=8, column=1, sticky=tk.W, pady=5)
+        
         # Progress Text
         self.progress_text = tk.Text(main_frame, height=10, width=60)
-        self.progress_text.grid(row=8, column=0, columnspan=2, pady=10)
+        self.progress_text.grid(row=9, column=0, columnspan=2, pady=10)
         
-        # Search Button
-        ttk.Button(main_frame, text="Search Jobs", command=self.search_jobs).grid(row=9, column=0, columnspan=2, pady=10)
+        # Search and Cancel Buttons
+        self.search_button = ttk.Button(main_frame, text="Search Jobs", command=self.search_jobs)
+        self.search_button.grid(row=10, column=0, pady=10)
+        self.cancel_button = ttk.Button(main_frame, text="Cancel", command=self.cancel_search, state=tk.DISABLED)
+        self.cancel_button.grid(row=10, column=1, sticky=tk.W, pady=10)
         
         # Configure grid weights
         root.grid_rowconfigure(0, weight=1)
         root.grid_columnconfigure(0, weight=1)
         main_frame.grid_columnconfigure(1, weight=1)
         
+        # Search runs on a worker thread; the Tk loop drains its progress queue
+        self.tasks = TaskRunner(root, self.show_progress, on_finished=self.search_finished)
+
+        # Load pandas and jobspy while the user fills in the form
+        warm_imports(root, RUN_MODULES)
+        
     def log_progress(self, message):
-        self.progress_text.insert(tk.END, f"{message}\n")
+        self.tasks.log(message)
+        
+    def show_progress(self, messages):
+        # One insert and one scroll for every batch of queued lines
+        self.progress_text.insert(tk.END, "\n".join(messages) + "\n")
         self.progress_text.see(tk.END)
-        self.root.update()
+        
+    def cancel_search(self):
+        self.log_progress("Cancelling search...")
+        self.cancel_button.config(state=tk.DISABLED)
+        self.tasks.cancel()
+        
+    def search_finished(self):
+        self.search_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
         
     def search_jobs(self):
+        """Read the form on the Tk thread, then search in the background"""
+        if self.tasks.running:
+            return
         try:
             # Clear previous progress
             self.progress_text.delete(1.0, tk.END)
@@ -98,68 +129,43 @@ class JobSearchApp:
                 messagebox.showerror("Error", "Please select at least one job site")
                 return
             
+            # Prepare the saved search
+            search = build_search(
+                sites=selected_sites,
+                search_term=self.search_term.get().strip(),
+                location=self.location.get().strip(),
+                results_wanted=int(self.results_wanted.get()),
+                hours_old=24,  # First run only; later runs fetch what is new since the last one
+                country=self.country.get(),
+                job_type=self.job_type.get() or None,
+                is_remote=self.is_remote.get(),
+                export_format=self.export_format.get(),
+            )
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {str(e)}")
+            return
+        
+        self.search_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.tasks.start(lambda: self.run_search(search))
+        
+    def run_search(self, search):
+        """Scrape and export on the worker thread"""
+        pipeline = JobPipeline(log=self.log_progress, cancel_event=self.tasks.cancel_event)
+        try:
             self.log_progress("Starting job search...")
-            
-            # Prepare parameters
-            params = {
-                "site_name": selected_sites,
-                "search_term": self.search_term.get().strip(),
-                "location": self.location.get().strip(),
-                "results_wanted": int(self.results_wanted.get()),
-                "hours_old": 24,  # Filter for last 24 hours
-                "country_indeed": self.country.get()
-            }
-            
-            # Add optional parameters if selected
-            if self.job_type.get():
-                params["job_type"] = self.job_type.get()
-            
-            if self.is_remote.get():
-                params["is_remote"] = True
-            
-            self.log_progress("Searching for jobs...")
-            jobs = scrape_jobs(**params)
-            
-            if len(jobs) == 0:
-                self.log_progress("No jobs found matching your criteria.")
+            summary = pipeline.run(search)
+            if not summary['filename']:
                 return
             
-            # Drop unwanted columns
-            columns_to_drop = [
-                'company_industry',
-                'job_url_direct',
-                'job_type',
-                'is_remote',
-                'job_level',
-                'job_function',
-                'emails',
-                'company_url',
-                'company_logo',
-                'company_url_direct',
-                'company_addresses',
-                'company_num_employees',
-                'company_revenue',
-                'company_description'
-            ]
-            
-            # Drop columns if they exist in the DataFrame
-            jobs = jobs.drop(columns=[col for col in columns_to_drop if col in jobs.columns])
-            
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"job_search_results_{timestamp}.xlsx"
-            
-            # Export to Excel
-            jobs.to_excel(filename, index=False)
-            self.log_progress(f"Found {len(jobs)} jobs")
-            self.log_progress(f"Results exported to: {filename}")
-            
             # Show success message
-            messagebox.showinfo("Success", f"Search completed!\nFound {len(jobs)} jobs\nResults saved to {filename}")
+            self.tasks.call(messagebox.showinfo, "Success", f"Search completed!\nFound {summary['jobs']} jobs\nResults saved to {summary['filename']}")
             
+        except Cancelled:
+            raise
         except Exception as e:
             self.log_progress(f"Error: {str(e)}")
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            self.tasks.call(messagebox.showerror, "Error", f"An error occurred: {str(e)}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,248 @@
+from collections import defaultdict
+from contextlib import contextmanager
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Directory for metrics files when a search does not set one; unset means none are written
+METRICS_DIR = os.environ.get("JOB_SEARCH_METRICS_DIR")
+
+PREFIX = "job_search_"
+
+# Help text for the Prometheus text file
+DESCRIPTIONS = {
+    'stage_seconds': "Wall time of each pipeline stage in the last run.",
+    'site_scrape_seconds': "Seconds until each job board returned, failed or timed out.",
+    'site_jobs': "Jobs returned by each job board.",
+    'site_up': "1 if the job board returned results without error.",
+    'jobs': "Jobs left after each pipeline step.",
+    'llm_latency_seconds': "Latency of individual LLM calls.",
+    'llm_queue_depth': "LLM calls submitted but not yet finished, sampled as each one completes.",
+    'llm_prompt_tokens': "Estimated prompt tokens sent to the LLM, by scoring mode.",
+    'llm_completion_tokens': "Estimated tokens in LLM replies.",
+    'llm_calls': "LLM calls made, by outcome.",
+    'llm_host_up': "1 if the Ollama host is in rotation.",
+    'llm_host_calls': "LLM calls answered by each Ollama host, by outcome.",
+    'llm_host_latency_seconds': "Latency percentiles of each Ollama host's calls.",
+    'llm_host_calls_per_minute': "Calls each Ollama host answered per minute of the run.",
+    'llm_host_tokens_per_second': "Estimated completion tokens per second each Ollama host generated while busy.",
+    'export_bytes': "Size of the exported results file.",
+    'last_run_timestamp_seconds': "Unix time the last run started.",
+    'last_run_success': "1 if the last run finished without an error.",
+    'profiled_stage': "Stage whose cProfile stats were dumped with this run.",
+}
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+def _write_atomic(path: str, text: str):
+    # Collectors may read at any moment, so never leave a half-written file
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+class RunMetrics:
+    """Timings and counts for one pipeline run, exportable as JSON or Prometheus text.
+
+    Stages are timed with ``stage``; LLM calls and queue samples go through
+    ``observe`` from any thread. With ``profile`` set, every stage also runs
+    under cProfile and the slowest one's stats can be dumped afterwards.
+    cProfile only sees the thread that entered the stage, so for threaded
+    stages (scrape, score) the profile shows the coordinating code.
+    """
+
+    def __init__(self, search: Optional[str] = None, profile: bool = False):
+        self.search = search or "default"
+        self.profile = profile
+        self.started = time.time()
+        self.stages = {}
+        self.gauges = defaultdict(dict)
+        self.samples = defaultdict(list)
+        self.sites = []
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block; repeated stages of the same name add up."""
+        profiler = cProfile.Profile() if self.profile else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+                if profiler is not None:
+                    self._profiles.setdefault(name, []).append(profiler)
+
+    def gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[name][tuple(labels.items())] = value
+
+    def add(self, name: str, value: float = 1, **labels):
+        key = tuple(labels.items())
+        with self._lock:
+            self.gauges[name][key] = self.gauges[name].get(key, 0) + value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            self.samples[name].append(value)
+
+    def record_sites(self, records: List[dict]):
+        """Per-site results from ``scrape_sites``."""
+        self.sites = [dict(record) for record in records]
+        for record in records:
+            self.gauge('site_scrape_seconds', record['seconds'], site=record['site'])
+            self.gauge('site_jobs', record['jobs'], site=record['site'])
+            self.gauge('site_up', 0 if record['error'] else 1, site=record['site'])
+
+    def record_llm_hosts(self, hosts: Dict[str, dict]):
+        """Per-host results from ``OllamaRouter.stats``."""
+        for host, row in hosts.items():
+            self.gauge('llm_host_up', 1 if row['healthy'] else 0, host=host)
+            self.gauge('llm_host_calls', row['calls'], host=host, outcome="ok")
+            self.gauge('llm_host_calls', row['failures'] - row['timeouts'], host=host, outcome="error")
+            self.gauge('llm_host_calls', row['timeouts'], host=host, outcome="timeout")
+            for quantile in ('p50', 'p90'):
+                if row[f"{quantile}_seconds"] is not None:
+                    self.gauge('llm_host_latency_seconds', row[f"{quantile}_seconds"],
+                               host=host, quantile=f"0.{quantile[1:]}")
+            self.gauge('llm_host_calls_per_minute', row['calls_per_minute'], host=host)
+            self.gauge('llm_host_tokens_per_second', row['tokens_per_second'], host=host)
+
+    def distribution(self, name: str) -> Optional[dict]:
+        import numpy as np
+        with self._lock:
+            values = np.asarray(self.samples.get(name, []), dtype=float)
+        if len(values) == 0:
+            return None
+        summary = {'count': int(len(values)), 'sum': float(values.sum()), 'max': float(values.max())}
+        for quantile, value in zip(QUANTILES, np.percentile(values, [q * 100 for q in QUANTILES])):
+            summary[f"p{int(quantile * 100)}"] = float(value)
+        return summary
+
+    def slowest_stage(self) -> Optional[str]:
+        return max(self.stages, key=self.stages.get) if self.stages else None
+
+    def report(self) -> str:
+        if not self.stages:
+            return "Stage times: none recorded"
+        parts = [f"{name} {seconds:.1f}s" for name, seconds in self.stages.items()]
+        latency = self.distribution('llm_latency_seconds')
+        if latency:
+            parts.append(f"LLM p50 {latency['p50']:.2f}s / p90 {latency['p90']:.2f}s over {latency['count']} calls")
+        return "Stage times: " + ", ".join(parts)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            gauges = {
+                name: [dict(labels, value=value) for labels, value in values.items()]
+                for name, values in self.gauges.items()
+            }
+            names = list(self.samples)
+        return {
+            'search': self.search,
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            'slowest_stage': self.slowest_stage(),
+            'sites': self.sites,
+            'gauges': gauges,
+            'distributions': {name: self.distribution(name) for name in names},
+        }
+
+    def write_json(self, path: str):
+        _write_atomic(path, json.dumps(self.as_dict(), indent=2, default=str))
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text format, labelled with the search name."""
+        search = {'search': self.search}
+        lines = []
+
+        def header(name, kind):
+            lines.append(f"# HELP {PREFIX}{name} {DESCRIPTIONS.get(name, name)}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        header('stage_seconds', 'gauge')
+        for stage, seconds in self.stages.items():
+            lines.append(f"{PREFIX}stage_seconds{_labels(dict(search, stage=stage))} {seconds:.6f}")
+
+        with self._lock:
+            gauges = {name: dict(values) for name, values in self.gauges.items()}
+        for name, values in gauges.items():
+            header(name, 'gauge')
+            for labels, value in values.items():
+                lines.append(f"{PREFIX}{name}{_labels(dict(search, **dict(labels)))} {value}")
+
+        for name in list(self.samples):
+            summary = self.distribution(name)
+            if summary is None:
+                continue
+            header(name, 'summary')
+            for quantile in QUANTILES:
+                labels = _labels(dict(search, quantile=str(quantile)))
+                lines.append(f"{PREFIX}{name}{labels} {summary[f'p{int(quantile * 100)}']:.6f}")
+            lines.append(f"{PREFIX}{name}_sum{_labels(search)} {summary['sum']:.6f}")
+            lines.append(f"{PREFIX}{name}_count{_labels(search)} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        _write_atomic(path, self.prometheus())
+
+    def dump_profile(self, path: str) -> Optional[str]:
+        """Write cProfile stats of the slowest stage; returns its name, or None without profiles."""
+        stage = max(self._profiles, key=self.stages.get) if self._profiles else None
+        if stage is None:
+            return None
+        profiles = self._profiles[stage]
+        import pstats
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        stats.dump_stats(path)
+        return stage
+
+    def write(self, directory: str) -> Dict[str, str]:
+        """Write the JSON report, the Prometheus text file and any profile to ``directory``.
+
+        The text file keeps one name per search, so a node exporter textfile
+        collector always reads the latest run; the JSON and profile are
+        timestamped.
+        """
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.search)
+        timestamp = datetime.fromtimestamp(self.started).strftime("%Y%m%d_%H%M%S")
+        paths = {
+            'json': os.path.join(directory, f"{slug}_{timestamp}.metrics.json"),
+            'prometheus': os.path.join(directory, f"{PREFIX}{slug}.prom"),
+        }
+        if self._profiles:
+            profile_path = os.path.join(directory, f"{slug}_{timestamp}.prof")
+            stage = self.dump_profile(profile_path)
+            paths['profile'] = profile_path
+            self.gauge('profiled_stage', 1, stage=stage)
+        self.write_json(paths['json'])
+        self.write_prometheus(paths['prometheus'])
+        return paths
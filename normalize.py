@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+import html
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+BLANK_LINES = re.compile(r"\n{3,}")
+RELATIVE_DATE = re.compile(r"(\d+)\+?\s*(hour|hr|day|week|month)")
+DATE_FORMATS = ['%Y-%m-%d', '%b %d, %Y', '%d %b %Y', '%Y/%m/%d']
+
+# Columns cleaned to a single line of text
+TEXT_COLUMNS = ['title', 'company', 'location']
+
+
+def _printable(text: str) -> str:
+    return ''.join(char for char in text if char.isprintable())
+
+
+def clean_text(text, default: Optional[str] = 'N/A') -> Optional[str]:
+    """Unescape entities, collapse whitespace and drop non-printable characters."""
+    if not isinstance(text, str) or not text:
+        return default
+    if '&' in text:
+        text = html.unescape(text)
+    text = ' '.join(text.split())
+    if not text.isprintable():
+        text = _printable(text)
+    return text.strip()
+
+
+def clean_description(text) -> Optional[str]:
+    """Like ``clean_text`` but keeps line breaks, which mark description sections."""
+    if not isinstance(text, str):
+        return None
+    if '&' in text:
+        text = html.unescape(text)
+    # str.split per line is much cheaper than a whitespace regex over the text
+    text = '\n'.join([' '.join(line.split()) for line in text.split('\n')]).strip()
+    if not text.replace('\n', '').isprintable():
+        text = '\n'.join(_printable(line) for line in text.split('\n'))
+    if '\n\n\n' in text:
+        text = BLANK_LINES.sub('\n\n', text)
+    return text
+
+
+def _map_distinct(values: pd.Series, clean, missing=None) -> pd.Series:
+    """Apply ``clean`` once per distinct value and broadcast the results back.
+
+    Scraped columns repeat heavily (the same company or location on every
+    card, the same posting from several boards), so this does a fraction of
+    the string work of cleaning row by row.
+    """
+    codes, distinct = pd.factorize(values.astype(object), use_na_sentinel=True)
+    cleaned = np.empty(len(distinct) + 1, dtype=object)
+    cleaned[:-1] = [clean(value) for value in distinct]
+    cleaned[-1] = missing
+    # Missing values have code -1, which picks the trailing slot
+    return pd.Series(cleaned[codes], index=values.index, name=values.name)
+
+
+def clean_text_column(values: pd.Series, default: Optional[str] = None) -> pd.Series:
+    """``clean_text`` over a whole column; empty results become ``default``."""
+    return _map_distinct(values, lambda value: clean_text(value, default) or default, default)
+
+
+def clean_description_column(values: pd.Series) -> pd.Series:
+    """``clean_description`` over a whole column."""
+    return _map_distinct(values, clean_description)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(text: str, now_hour: datetime) -> Optional[str]:
+    # "Posted 3 days ago", "30+ days ago", "Just posted", "Today", ...
+    if 'ago' in text:
+        match = RELATIVE_DATE.search(text)
+        if match is None:
+            return now_hour.strftime('%Y-%m-%d')
+        number, unit = int(match.group(1)), match.group(2)
+        if unit in ('hour', 'hr'):
+            delta = timedelta(hours=number)
+        elif unit == 'day':
+            delta = timedelta(days=number)
+        elif unit == 'week':
+            delta = timedelta(weeks=number)
+        else:
+            delta = timedelta(days=number * 30)
+        return (now_hour - delta).strftime('%Y-%m-%d')
+    if 'today' in text or 'just posted' in text:
+        return now_hour.strftime('%Y-%m-%d')
+    if 'yesterday' in text:
+        return (now_hour - timedelta(days=1)).strftime('%Y-%m-%d')
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def parse_date(text, now: Optional[datetime] = None) -> Optional[str]:
+    """Normalise a posting date to YYYY-MM-DD, or None if it is not recognised.
+
+    Results are memoised per string and clock hour: whole hours subtracted
+    from any moment within one hour land on the same date, so "3 hours ago"
+    is still exact.
+    """
+    if not isinstance(text, str):
+        return None
+    now = now or datetime.now()
+    return _parse_date(text.lower().strip(), now.replace(minute=0, second=0, microsecond=0))
+
+
+def normalize_dates(values: pd.Series, now: Optional[datetime] = None) -> pd.Series:
+    """Posting dates as datetime64, whether they arrive as dates or as text.
+
+    Each distinct string is parsed once; dates, timestamps and ISO strings
+    go through pandas' vectorised converter.
+    """
+    is_text = values.map(lambda value: isinstance(value, str))
+    parsed = values.astype(object).copy()
+    if is_text.any():
+        text = values[is_text]
+        mapping = {value: parse_date(value, now) for value in text.unique()}
+        parsed[is_text] = text.map(mapping)
+    return pd.to_datetime(parsed, errors='coerce').dt.normalize()
+
+
+def parse_date_cache_info():
+    return _parse_date.cache_info()
+
+
+def normalize_jobs(jobs: pd.DataFrame) -> pd.DataFrame:
+    """Copy of ``jobs`` with text columns, descriptions and posting dates cleaned."""
+    if len(jobs) == 0:
+        return jobs
+    jobs = jobs.copy()
+    for col in TEXT_COLUMNS:
+        if col in jobs.columns:
+            jobs[col] = clean_text_column(jobs[col])
+    if 'description' in jobs.columns:
+        jobs['description'] = clean_description_column(jobs['description'])
+    if 'date_posted' in jobs.columns:
+        jobs['date_posted'] = normalize_dates(jobs['date_posted'])
+    return jobs
@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jobs import JobScraper
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rate_limit import DomainRateLimiter
+
+
+class AsyncJobScraper:
+    """Fetch LinkedIn and Indeed result pages concurrently with aiohttp.
+
+    All sites share one pooled keep-alive connector. Politeness is enforced
+    per domain twice over: at most ``per_site`` requests in flight, and a
+    token bucket on the request rate. Pages are parsed on a thread pool so
+    the event loop keeps sending requests while HTML is being parsed.
+    Records have the same shape as ``JobScraper``'s, which does the parsing.
+    """
+
+    def __init__(self, debug_mode: bool = False, per_site: int = 3, max_connections: int = 10,
+                 rate_limiter: Optional[DomainRateLimiter] = None, timeout: float = 10,
+                 parse_workers: int = 4, parser: Optional[JobScraper] = None):
+        self.parser = parser or JobScraper(debug_mode=debug_mode, use_cache=False)
+        self.logger = self.parser.logger
+        self.per_site = per_site
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter or DomainRateLimiter(default_rate=1.0, default_burst=per_site)
+        self.timeout = timeout
+        self.parse_workers = parse_workers
+        self.jobs_data = []
+        self.sites = {
+            'linkedin': {
+                'name': 'LinkedIn', 'domain': 'linkedin.com', 'url': self.parser.LINKEDIN_URL,
+                'params': self.parser.linkedin_params, 'parse': self.parser.parse_linkedin,
+            },
+            'indeed': {
+                'name': 'Indeed', 'domain': 'indeed.com', 'url': self.parser.INDEED_URL,
+                'params': self.parser.indeed_params, 'parse': self.parser.parse_indeed,
+            },
+        }
+        self.pages_fetched = 0
+
+    async def _throttle(self, domain: str):
+        # Never block the loop: sleep asynchronously until the bucket has a token
+        while True:
+            wait = self.rate_limiter.try_acquire(domain)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _scrape_page(self, session: aiohttp.ClientSession, site: dict, semaphore: asyncio.Semaphore,
+                           parse_pool: ThreadPoolExecutor, job_title: str, location: str,
+                           page: int, pages: int) -> List[Dict]:
+        try:
+            async with semaphore:
+                await self._throttle(site['domain'])
+                self.logger.info(f"Scraping {site['name']} page {page + 1}/{pages}")
+                async with session.get(site['url'], params=site['params'](job_title, location, page),
+                                       headers=self.parser.get_headers()) as response:
+                    if response.status != 200:
+                        self.logger.debug(f"{site['name']} page {page + 1} returned {response.status}")
+                        return []
+                    page_html = await response.text()
+            self.pages_fetched += 1
+            jobs = await asyncio.get_running_loop().run_in_executor(parse_pool, site['parse'], page_html)
+            if not jobs:
+                self.logger.warning(f"No job cards found on {site['name']} page {page + 1}")
+            return jobs
+        except Exception as e:
+            self.logger.error(f"Error scraping {site['name']} page {page + 1}: {str(e)}")
+            return []
+
+    async def scrape(self, job_title: str, location: str = '', pages: int = 3,
+                     sites: Iterable[str] = ('linkedin', 'indeed')) -> List[Dict]:
+        """Scrape every page of every site at once; results keep site and page order."""
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_site,
+                                         keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        started = time.perf_counter()
+        self.pages_fetched = 0
+        with ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="parse") as parse_pool:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                tasks = []
+                for name in sites:
+                    site = self.sites[name]
+                    semaphore = asyncio.Semaphore(self.per_site)
+                    tasks += [
+                        self._scrape_page(session, site, semaphore, parse_pool, job_title, location, page, pages)
+                        for page in range(pages)
+                    ]
+                results = await asyncio.gather(*tasks)
+
+        for jobs in results:
+            self.jobs_data.extend(jobs)
+        elapsed = time.perf_counter() - started
+        self.logger.info(
+            f"Fetched {self.pages_fetched} pages in {elapsed:.1f}s "
+            f"({self.pages_fetched / max(elapsed, 1e-9):.1f} pages/s), {sum(map(len, results))} jobs"
+        )
+        return self.jobs_data
+
+    def run(self, job_title: str, location: str = '', pages: int = 3,
+            sites: Iterable[str] = ('linkedin', 'indeed')) -> List[Dict]:
+        """Blocking entry point for scripts."""
+        return asyncio.run(self.scrape(job_title, location, pages, sites))
+
+    def export_to_excel(self, filename: str = 'job_listings.xlsx'):
+        self.parser.jobs_data = self.jobs_data
+        self.parser.export_to_excel(filename)
+
+
+def main():
+    job_title = input("Enter the job title you're looking for: ").strip()
+    location = input("Enter location (press Enter to skip): ").strip()
+    pages = input("Enter number of pages to scrape per platform (default is 3): ").strip()
+    pages = int(pages) if pages.isdigit() and int(pages) > 0 else 3
+
+    scraper = AsyncJobScraper()
+    scraper.run(job_title, location, pages)
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    scraper.export_to_excel(f'job_listings_{timestamp}.xlsx')
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,57 @@
+import os
+import sys
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime, timedelta
-import time
-import re
+from datetime import datetime
 from typing import List, Dict, Optional
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 import logging
 from fake_useragent import UserAgent
-import html
+from lxml import etree
+from lxml import html as lxml_html
+
+# Shared helpers live in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_cache import HttpCache
+from normalize import clean_text, parse_date
+from rate_limit import DomainRateLimiter
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Job cards on a results page, compiled once
+LINKEDIN_CARDS = etree.XPath(f"//div[{_has_class('job-search-card')}]")
+INDEED_CARDS = [
+    etree.XPath(f"//div[{_has_class('job_seen_beacon')}]"),
+    # Alternative class name on older layouts
+    etree.XPath(f"//div[{_has_class('tapItem')}]"),
+]
+
+# Field -> (tag, class) alternatives, most preferred first; None matches any element of the tag
+LINKEDIN_FIELDS = {
+    'title': [('h3', 'base-search-card__title')],
+    'company': [('h4', 'base-search-card__subtitle')],
+    'location': [('span', 'job-search-card__location')],
+    'date': [('time', None)],
+    'link': [('a', 'base-card__full-link')],
+    'salary': [('span', 'job-search-card__salary-info')],
+}
+INDEED_FIELDS = {
+    'title': [('h2', 'jobTitle'), ('a', 'jcs-JobTitle')],
+    'company': [('span', 'companyName'), ('div', 'company_location')],
+    'location': [('div', 'companyLocation'), ('div', 'company_location')],
+    'date': [('span', 'date'), ('span', 'date-posted')],
+    'link': [('a', None)],
+    'salary': [('div', 'salary-snippet')],
+}
 
 class JobScraper:
-    def __init__(self, debug_mode: bool = False):
+    LINKEDIN_URL = 'https://www.linkedin.com/jobs/search'
+    INDEED_URL = 'https://www.indeed.com/jobs'
+
+    def __init__(self, debug_mode: bool = False, rate_limiter: Optional[DomainRateLimiter] = None,
+                 http_cache: Optional[HttpCache] = None, use_cache: bool = True):
         # Set up logging
         logging.basicConfig(
             level=logging.DEBUG if debug_mode else logging.INFO,
@@ -35,6 +74,26 @@ class JobScraper:
         self.ua = UserAgent()
         self.jobs_data = []
         self.debug_mode = debug_mode
+        
+        # Per-domain token buckets replace a fixed sleep after every page;
+        # the default allows one page every 2 seconds per site
+        self.rate_limiter = rate_limiter or DomainRateLimiter(default_rate=0.5, default_burst=1)
+        
+        # On-disk page cache in front of the session; cached pages skip the rate limit
+        self.http_cache = (http_cache or HttpCache()) if use_cache else None
+
+    def fetch(self, domain: str, url: str, params: dict) -> requests.Response:
+        """GET a page through the cache, waiting for the domain's rate limit only on real requests."""
+        throttle = lambda: self.rate_limiter.acquire(domain)
+        if self.http_cache is None:
+            throttle()
+            return self.session.get(url, params=params, headers=self.get_headers(), timeout=10)
+        return self.http_cache.get(self.session, url, params=params, headers=self.get_headers(),
+                                   timeout=10, throttle=throttle)
+
+    def log_cache_stats(self):
+        if self.http_cache is not None:
+            self.logger.info(self.http_cache.stats())
 
     def get_headers(self) -> dict:
         """Generate new headers with rotating user agent."""
@@ -49,183 +108,154 @@ class JobScraper:
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text data."""
-        if not text:
-            return 'N/A'
-        # Decode HTML entities
-        text = html.unescape(text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        # Remove non-printable characters
-        text = ''.join(char for char in text if char.isprintable())
-        return text.strip()
+        return clean_text(text)
 
     def format_date(self, date_str: str) -> str:
         """Convert various date formats to a standardized format."""
-        try:
-            date_str = date_str.lower().strip()
-            
-            # Handle "posted X days/hours ago" format
-            if 'ago' in date_str:
-                number = int(re.findall(r'\d+', date_str)[0])
-                if 'day' in date_str:
-                    date = datetime.now() - timedelta(days=number)
-                elif 'hour' in date_str:
-                    date = datetime.now() - timedelta(hours=number)
-                elif 'week' in date_str:
-                    date = datetime.now() - timedelta(weeks=number)
-                elif 'month' in date_str:
-                    date = datetime.now() - timedelta(days=number * 30)
-                else:
-                    date = datetime.now()
-                return date.strftime('%Y-%m-%d')
-            
-            # Handle "Today" and "Yesterday"
-            if 'today' in date_str:
-                return datetime.now().strftime('%Y-%m-%d')
-            if 'yesterday' in date_str:
-                return (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-            
-            # Try parsing various date formats
-            for fmt in ['%Y-%m-%d', '%b %d, %Y', '%d %b %Y', '%Y/%m/%d']:
-                try:
-                    return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
-                except ValueError:
+        # Memoised: the same "3 days ago" strings repeat on every page
+        return parse_date(date_str) or datetime.now().strftime('%Y-%m-%d')
+
+    def parse_cards(self, page_html: str, card_xpaths: List[etree.XPath], fields: Dict[str, list]) -> List[Dict]:
+        """Collect each card's fields in one walk over its elements.
+
+        ``fields`` maps a field name to (tag, class) alternatives in order of
+        preference; the first card XPath that finds anything selects the cards.
+        Returns one dict per card of field name -> matching element or None.
+        """
+        if not page_html or not page_html.strip():
+            return []
+        root = lxml_html.fromstring(page_html)
+        cards = []
+        for xpath in card_xpaths:
+            cards = xpath(root)
+            if cards:
+                break
+        
+        # (tag, class) -> [(field, preference)], so each element is looked up once
+        wanted = {}
+        for field, alternatives in fields.items():
+            for preference, key in enumerate(alternatives):
+                wanted.setdefault(key, []).append((field, preference))
+        
+        parsed = []
+        for card in cards:
+            found = {}
+            for element in card.iter():
+                if not isinstance(element.tag, str):
                     continue
-            
-            return datetime.now().strftime('%Y-%m-%d')
-        except Exception as e:
-            self.logger.warning(f"Date parsing error for '{date_str}': {str(e)}")
-            return datetime.now().strftime('%Y-%m-%d')
+                for cls in (element.get('class') or '').split() + [None]:
+                    for field, preference in wanted.get((element.tag, cls), ()):
+                        if field not in found or preference < found[field][0]:
+                            found[field] = (preference, element)
+            parsed.append({field: found[field][1] if field in found else None for field in fields})
+        return parsed
+
+    def parse_linkedin(self, page_html: str) -> List[Dict]:
+        """Extract job records from one LinkedIn search results page."""
+        jobs = []
+        for card in self.parse_cards(page_html, [LINKEDIN_CARDS], LINKEDIN_FIELDS):
+            try:
+                title, company, location, posted, link, salary = (
+                    card['title'], card['company'], card['location'], card['date'], card['link'], card['salary']
+                )
+                job_data = {
+                    'platform': 'LinkedIn',
+                    'title': self.clean_text(title.text_content() if title is not None else 'N/A'),
+                    'company': self.clean_text(company.text_content() if company is not None else 'N/A'),
+                    'location': self.clean_text(location.text_content() if location is not None else 'N/A'),
+                    'date_posted': self.format_date(posted.attrib['datetime'] if posted is not None else datetime.now().strftime('%Y-%m-%d')),
+                    'link': link.attrib['href'] if link is not None else 'N/A',
+                    'salary': self.clean_text(salary.text_content() if salary is not None else 'Not specified')
+                }
+                jobs.append(job_data)
+            except Exception as e:
+                self.logger.warning(f"Error parsing LinkedIn job card: {str(e)}")
+                continue
+        return jobs
+
+    def parse_indeed(self, page_html: str) -> List[Dict]:
+        """Extract job records from one Indeed search results page."""
+        jobs = []
+        cards = self.parse_cards(page_html, INDEED_CARDS, INDEED_FIELDS)
+        self.logger.debug(f"Found {len(cards)} job cards on Indeed page")
+        for card in cards:
+            try:
+                title, company, location, posted, link, salary = (
+                    card['title'], card['company'], card['location'], card['date'], card['link'], card['salary']
+                )
+                job_data = {
+                    'platform': 'Indeed',
+                    'title': self.clean_text(title.text_content() if title is not None else 'N/A'),
+                    'company': self.clean_text(company.text_content() if company is not None else 'N/A'),
+                    'location': self.clean_text(location.text_content() if location is not None else 'N/A'),
+                    'date_posted': self.format_date(posted.text_content() if posted is not None else datetime.now().strftime('%Y-%m-%d')),
+                    'link': 'https://www.indeed.com' + link.attrib['href'] if link is not None else 'N/A',
+                    'salary': self.clean_text(salary.text_content() if salary is not None else 'Not specified')
+                }
+                jobs.append(job_data)
+            except Exception as e:
+                self.logger.warning(f"Error parsing Indeed job card: {str(e)}")
+                continue
+        return jobs
+
+    @staticmethod
+    def linkedin_params(job_title: str, location: str, page: int) -> dict:
+        return {
+            'keywords': job_title,
+            'location': location,
+            'start': page * 25,  # LinkedIn uses 25 jobs per page
+            'sortBy': 'DD'
+        }
+
+    @staticmethod
+    def indeed_params(job_title: str, location: str, page: int) -> dict:
+        return {
+            'q': job_title,
+            'l': location,
+            'sort': 'date',
+            'start': page * 10  # Indeed uses 10 jobs per page
+        }
 
     def scrape_linkedin(self, job_title: str, location: str = '', pages: int = 3) -> List[Dict]:
         """Scrape job listings from LinkedIn with pagination."""
-        base_url = 'https://www.linkedin.com/jobs/search'
-        
         for page in range(pages):
             try:
-                search_params = {
-                    'keywords': job_title,
-                    'location': location,
-                    'start': page * 25,  # LinkedIn uses 25 jobs per page
-                    'sortBy': 'DD'
-                }
-                
                 self.logger.info(f"Scraping LinkedIn page {page + 1}/{pages}")
-                response = self.session.get(
-                    base_url, 
-                    params=search_params, 
-                    headers=self.get_headers(),
-                    timeout=10
-                )
+                response = self.fetch('linkedin.com', self.LINKEDIN_URL,
+                                      self.linkedin_params(job_title, location, page))
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    job_cards = soup.find_all('div', class_='job-search-card')
-                    
-                    if not job_cards:
+                    jobs = self.parse_linkedin(response.text)
+                    if not jobs:
                         self.logger.warning(f"No job cards found on LinkedIn page {page + 1}")
                         continue
-                    
-                    for card in job_cards:
-                        try:
-                            job_data = {
-                                'platform': 'LinkedIn',
-                                'title': self.clean_text(card.find('h3', class_='base-search-card__title').text if card.find('h3', class_='base-search-card__title') else 'N/A'),
-                                'company': self.clean_text(card.find('h4', class_='base-search-card__subtitle').text if card.find('h4', class_='base-search-card__subtitle') else 'N/A'),
-                                'location': self.clean_text(card.find('span', class_='job-search-card__location').text if card.find('span', class_='job-search-card__location') else 'N/A'),
-                                'date_posted': self.format_date(card.find('time')['datetime'] if card.find('time') else datetime.now().strftime('%Y-%m-%d')),
-                                'link': card.find('a', class_='base-card__full-link')['href'] if card.find('a', class_='base-card__full-link') else 'N/A',
-                                'salary': self.clean_text(card.find('span', class_='job-search-card__salary-info').text if card.find('span', class_='job-search-card__salary-info') else 'Not specified')
-                            }
-                            self.jobs_data.append(job_data)
-                        except Exception as e:
-                            self.logger.warning(f"Error parsing LinkedIn job card: {str(e)}")
-                            continue
-                
-                # Respect rate limits
-                time.sleep(2)
+                    self.jobs_data.extend(jobs)
                 
             except Exception as e:
                 self.logger.error(f"Error scraping LinkedIn page {page + 1}: {str(e)}")
                 continue
         
+        self.log_cache_stats()
         return self.jobs_data
 
     def scrape_indeed(self, job_title: str, location: str = '', pages: int = 3) -> List[Dict]:
         """Scrape job listings from Indeed with pagination and debugging."""
-        base_url = 'https://www.indeed.com/jobs'
-        
         for page in range(pages):
             try:
-                search_params = {
-                    'q': job_title,
-                    'l': location,
-                    'sort': 'date',
-                    'start': page * 10  # Indeed uses 10 jobs per page
-                }
-                
                 self.logger.info(f"Scraping Indeed page {page + 1}/{pages}")
-                response = self.session.get(
-                    base_url, 
-                    params=search_params, 
-                    headers=self.get_headers(),
-                    timeout=10
-                )
+                response = self.fetch('indeed.com', self.INDEED_URL,
+                                      self.indeed_params(job_title, location, page))
                 
                 self.logger.debug(f"Indeed Response Status: {response.status_code}")
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    job_cards = soup.find_all('div', class_='job_seen_beacon')
-                    
-                    self.logger.debug(f"Found {len(job_cards)} job cards on Indeed page {page + 1}")
-                    
-                    if not job_cards:
-                        # Try alternative class names
-                        job_cards = soup.find_all('div', class_='tapItem')
-                        self.logger.debug(f"Found {len(job_cards)} job cards using alternative class")
-                    
-                    for card in job_cards:
-                        try:
-                            # Enhanced selectors for Indeed's structure
-                            title_elem = (
-                                card.find('h2', class_='jobTitle') or 
-                                card.find('a', class_='jcs-JobTitle')
-                            )
-                            company_elem = (
-                                card.find('span', class_='companyName') or 
-                                card.find('div', class_='company_location')
-                            )
-                            location_elem = (
-                                card.find('div', class_='companyLocation') or 
-                                card.find('div', class_='company_location')
-                            )
-                            date_elem = (
-                                card.find('span', class_='date') or 
-                                card.find('span', class_='date-posted')
-                            )
-                            
-                            job_data = {
-                                'platform': 'Indeed',
-                                'title': self.clean_text(title_elem.text if title_elem else 'N/A'),
-                                'company': self.clean_text(company_elem.text if company_elem else 'N/A'),
-                                'location': self.clean_text(location_elem.text if location_elem else 'N/A'),
-                                'date_posted': self.format_date(date_elem.text if date_elem else datetime.now().strftime('%Y-%m-%d')),
-                                'link': 'https://www.indeed.com' + card.find('a')['href'] if card.find('a') else 'N/A',
-                                'salary': self.clean_text(card.find('div', class_='salary-snippet').text if card.find('div', class_='salary-snippet') else 'Not specified')
-                            }
-                            self.jobs_data.append(job_data)
-                        except Exception as e:
-                            self.logger.warning(f"Error parsing Indeed job card: {str(e)}")
-                            continue
-                
-                # Respect rate limits
-                time.sleep(2)
+                    self.jobs_data.extend(self.parse_indeed(response.text))
                 
             except Exception as e:
                 self.logger.error(f"Error scraping Indeed page {page + 1}: {str(e)}")
                 continue
         
+        self.log_cache_stats()
         return self.jobs_data
 
     def export_to_excel(self, filename: str = 'job_listings.xlsx'):
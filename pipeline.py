@@ -0,0 +1,501 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from checkpoint import ScoringCheckpoint, job_key
+from metrics import METRICS_DIR, RunMetrics
+from worker import Cancelled
+
+# pandas, jobspy and the processing modules load on first run, keeping GUI startup fast
+if TYPE_CHECKING:
+    import pandas as pd
+    from dedup import JobDeduplicator
+    from job_index import JobIndex
+    from resume import ResumeProfile
+
+SITES = ["indeed", "linkedin", "zip_recruiter", "glassdoor", "google"]
+
+# Modules a run imports on first use, for front ends to warm in the background
+RUN_MODULES = ['pandas', 'scrape_orchestrator', 'normalize', 'compact', 'dedup', 'job_index', 'exporter']
+
+# Defaults for every key a saved search may set
+DEFAULT_SEARCH = {
+    'name': None,
+    'search_term': '',
+    'location': '',
+    'sites': SITES,
+    'results_wanted': 20,
+    'job_type': None,
+    'is_remote': False,
+    'country': 'USA',
+    # Maximum posting age; with 'incremental' it only applies to a search's
+    # first run, later runs cover the time since the last successful one
+    'hours_old': None,
+    # Only score and export postings this search has not handled before
+    'incremental': True,
+    # Seconds each site may take before its results are given up on
+    'site_timeout': 120,
+    # Collapse the same posting found on several boards into one row
+    'dedupe': True,
+    # Drop unused columns as each site's results arrive and store repetitive
+    # text columns (site, company, location, ...) as categoricals
+    'compact': True,
+    # Resume as a file path, or already-extracted text
+    'resume': None,
+    'resume_text': None,
+    # ResumeProfile of resume_text when the caller already has one (see resume.load_resume)
+    'resume_profile': None,
+    # Prompt the LLM with a short profile (titles, skills, years, locations) instead of the full resume
+    'condense_resume': True,
+    # Score jobs against the resume with the LLM
+    'analyze': False,
+    'llm_workers': 4,
+    # Ollama endpoints to spread LLM calls over (see llm_router); None uses JOB_SEARCH_OLLAMA_HOSTS
+    'llm_hosts': None,
+    'batch_size': 1,
+    'use_cache': True,
+    'similarity_threshold': 0.35,
+    'top_k': None,
+    'token_budget': 600,
+    'export_format': 'xlsx',
+    'output_dir': '.',
+    # Write a JSON report and a Prometheus text file of stage timings here
+    'metrics_dir': METRICS_DIR,
+    # Run each stage under cProfile and dump the slowest one next to the metrics
+    'profile': False,
+}
+
+# Columns dropped from plain (unscored) exports
+COLUMNS_TO_DROP = [
+    'company_industry',
+    'job_url_direct',
+    'job_type',
+    'is_remote',
+    'job_level',
+    'job_function',
+    'emails',
+    'company_url',
+    'company_logo',
+    'company_url_direct',
+    'company_addresses',
+    'company_num_employees',
+    'company_revenue',
+    'company_description'
+]
+
+# Leading columns of scored exports
+EXPORT_COLUMNS = [
+    'site', 'title', 'company', 'location', 'date_posted',
+    'salary_min', 'salary_max', 'salary_interval', 'job_url', 'source_urls',
+    'description', 'similarity', 'category'
+]
+
+
+def build_search(**overrides) -> dict:
+    """Saved search with defaults filled in; unknown keys are rejected."""
+    unknown = set(overrides) - set(DEFAULT_SEARCH)
+    if unknown:
+        raise ValueError(f"Unknown search settings: {', '.join(sorted(unknown))}")
+    search = dict(DEFAULT_SEARCH)
+    search.update({key: value for key, value in overrides.items() if value is not None})
+    return search
+
+
+def scrape_params(search: dict) -> dict:
+    """Translate a saved search into scrape_jobs keyword arguments."""
+    params = {
+        'site_name': list(search['sites']),
+        'search_term': search['search_term'],
+        'location': search['location'],
+        'results_wanted': int(search['results_wanted']),
+        'country_indeed': search['country'],
+    }
+    if search['hours_old']:
+        params['hours_old'] = int(search['hours_old'])
+    if search['job_type']:
+        params['job_type'] = search['job_type']
+    if search['is_remote']:
+        params['is_remote'] = True
+    return params
+
+
+class JobPipeline:
+    """Scrape, filter, score and export saved searches without any UI.
+
+    The Tk front ends and the CLI share this class. LLM components are
+    created on first use and kept, so consecutive runs reuse one warm chain.
+    Every heavy module is imported on first use, so constructing a pipeline
+    (and importing this module) costs almost nothing.
+    """
+
+    def __init__(self, log: Optional[Callable[[str], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 scorer=None, prefilter=None, condenser=None,
+                 deduplicator: Optional['JobDeduplicator'] = None,
+                 job_index: Optional['JobIndex'] = None,
+                 on_results: Optional[Callable[[dict, 'pd.DataFrame'], None]] = None):
+        self.log = log or print
+        # Called with the search and its exported jobs after every export
+        self.on_results = on_results
+        self.cancel_event = cancel_event or threading.Event()
+        self._deduplicator = deduplicator
+        self._job_index = job_index
+        self._scorer = scorer
+        self._prefilter = prefilter
+        self._condenser = condenser
+        # Metrics of the current (or last) run
+        self.metrics = RunMetrics()
+
+    @property
+    def scorer(self):
+        if self._scorer is None:
+            from llm_cache import VerdictCache
+            from scoring import JobScorer
+            self._scorer = JobScorer(log=self.log, cache=VerdictCache())
+        return self._scorer
+
+    @property
+    def prefilter(self):
+        if self._prefilter is None:
+            from prefilter import EmbeddingCache, EmbeddingPrefilter
+            self._prefilter = EmbeddingPrefilter(cache=EmbeddingCache(), log=self.log)
+        return self._prefilter
+
+    @property
+    def deduplicator(self) -> 'JobDeduplicator':
+        if self._deduplicator is None:
+            from dedup import JobDeduplicator
+            self._deduplicator = JobDeduplicator()
+        return self._deduplicator
+
+    @property
+    def job_index(self) -> 'JobIndex':
+        if self._job_index is None:
+            from job_index import JobIndex
+            self._job_index = JobIndex()
+        return self._job_index
+
+    @property
+    def condenser(self):
+        if self._condenser is None:
+            from condense import DescriptionCondenser
+            self._condenser = DescriptionCondenser()
+        return self._condenser
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+
+    def run(self, search: dict) -> dict:
+        """Run one saved search end to end and return a summary.
+
+        Stage timings are logged at the end, and written to
+        ``metrics_dir`` even when the run fails part way.
+        """
+        search = build_search(**search)
+        metrics = self.metrics = RunMetrics(search['name'], profile=search['profile'])
+        metrics.gauge('last_run_timestamp_seconds', round(metrics.started, 3))
+        metrics.gauge('last_run_success', 0)
+        try:
+            summary = self._run(search, metrics)
+            metrics.gauge('last_run_success', 1)
+            summary['stage_seconds'] = {name: round(seconds, 2) for name, seconds in metrics.stages.items()}
+            return summary
+        finally:
+            self.log(metrics.report())
+            if search['metrics_dir']:
+                try:
+                    paths = metrics.write(search['metrics_dir'])
+                    self.log(f"Metrics written to {paths['json']}")
+                except OSError as e:
+                    self.log(f"Could not write metrics: {str(e)}")
+
+    def _run(self, search: dict, metrics: RunMetrics) -> dict:
+        started = time.time()
+        # Checkpoints are keyed without the derived time window, so a rerun still resumes
+        base_params = scrape_params(search)
+
+        resume = profile = None
+        if search['analyze']:
+            resume, profile = search['resume_text'], search['resume_profile']
+            if resume is None and search['resume']:
+                from resume import load_resume
+                with metrics.stage('resume'):
+                    resume, profile = load_resume(search['resume'])
+
+        index_key = None
+        if search['incremental']:
+            from job_index import search_key
+            index_key = search_key(search, resume)
+            hours = self.job_index.hours_since_last_run(index_key, started)
+            if hours is not None and 'indeed' in search['sites'] and (search['job_type'] or search['is_remote']):
+                # jobspy's Indeed scraper drops job_type and is_remote when hours_old is set
+                self.log("Keeping the full time window so Indeed honours the job type and remote filters; "
+                         "postings handled by earlier runs are still skipped")
+            elif hours is not None:
+                search['hours_old'] = hours
+                self.log(f"Last successful run was under {hours} hours ago, fetching newer postings only")
+        params = scrape_params(search)
+
+        self.log("Searching for jobs...")
+        ingest = None
+        if search['compact'] and not search['analyze']:
+            # Plain exports never show these, so they are not kept past each site's arrival
+            from functools import partial
+            from compact import prune_columns
+            ingest = partial(prune_columns, drop=COLUMNS_TO_DROP)
+        with metrics.stage('scrape'):
+            jobs, sites = self.scrape(params, search['site_timeout'], ingest)
+        metrics.record_sites(sites)
+        metrics.gauge('jobs', len(jobs), step="scraped")
+        if len(jobs) == 0:
+            self.log("No jobs found matching your criteria.")
+            return {'name': search['name'], 'jobs': 0, 'filename': None, 'sites': sites}
+
+        # Entities, stray whitespace and mixed date formats differ between boards
+        from normalize import normalize_jobs
+        with metrics.stage('normalize'):
+            jobs = normalize_jobs(jobs)
+            if search['compact']:
+                from compact import categorize
+                jobs = categorize(jobs)
+
+        if search['dedupe']:
+            # Before scoring, so each posting costs one LLM call however many boards list it
+            with metrics.stage('dedupe'):
+                jobs = self.deduplicator.dedupe(jobs)
+            self.log(self.deduplicator.report())
+            metrics.gauge('jobs', len(jobs), step="deduplicated")
+
+        seen = 0
+        if index_key is not None:
+            with metrics.stage('index'):
+                hashes = self.job_index.hashes(jobs)
+                new = self.job_index.new_mask(index_key, jobs, hashes)
+                seen = len(new) - sum(new)
+                self.job_index.touch(index_key, jobs[[not flag for flag in new]])
+                jobs = jobs[new].reset_index(drop=True)
+                hashes = [digest for digest, flag in zip(hashes, new) if flag]
+            metrics.gauge('jobs', len(jobs), step="new")
+            self.log(f"{len(jobs)} new or changed jobs, {seen} already handled by earlier runs")
+            if len(jobs) == 0:
+                self.close_window(index_key, started, sites)
+                return {'name': search['name'], 'jobs': 0, 'seen': seen, 'filename': None, 'sites': sites}
+
+        self.check_cancelled()
+        checkpoint = None
+        if search['analyze']:
+            jobs, checkpoint = self.analyze(jobs, resume, base_params, search, profile)
+        else:
+            # Drop columns if they exist in the DataFrame
+            jobs = jobs.drop(columns=[col for col in COLUMNS_TO_DROP if col in jobs.columns])
+
+        self.check_cancelled()
+        with metrics.stage('export'):
+            filename = self.export(jobs, search)
+        metrics.gauge('jobs', len(jobs), step="exported")
+        metrics.gauge('export_bytes', os.path.getsize(filename))
+        if checkpoint is not None:
+            # Results are safely on disk, the checkpoint is no longer needed
+            checkpoint.complete()
+        if index_key is not None:
+            with metrics.stage('index'):
+                self.remember(index_key, jobs, hashes, started, sites)
+        if self.on_results is not None:
+            self.on_results(search, jobs)
+        self.log(f"Found {len(jobs)} jobs")
+        self.log(f"Results exported to: {filename}")
+
+        summary = {'name': search['name'], 'jobs': len(jobs), 'seen': seen, 'filename': filename, 'sites': sites}
+        if 'category' in jobs.columns:
+            summary['categories'] = jobs['category'].value_counts().to_dict()
+        return summary
+
+    def remember(self, index_key: str, jobs: 'pd.DataFrame', hashes: List[str], started: float,
+                 sites: List[dict]):
+        """Record exported jobs in the index and close the run's time window if nothing failed."""
+        failed_analyses = 0
+        if 'category' in jobs.columns:
+            from scoring import ANALYSIS_ERROR
+            # Failed analyses stay unrecorded so the next run retries them
+            ok = (jobs['category'] != ANALYSIS_ERROR).to_list()
+            failed_analyses = len(ok) - sum(ok)
+            jobs = jobs[ok]
+            hashes = [digest for digest, flag in zip(hashes, ok) if flag]
+            self.job_index.record(index_key, jobs, jobs['category'].to_list(), hashes)
+        else:
+            self.job_index.record(index_key, jobs, hashes=hashes)
+        if failed_analyses:
+            self.log(f"{failed_analyses} analyses failed, the next run searches the same time window again")
+            return
+        self.close_window(index_key, started, sites)
+
+    def close_window(self, index_key: str, started: float, sites: List[dict]):
+        """Start the next run's window at this run, unless a site failed.
+
+        The next run only fetches postings newer than the last successful
+        one, so a site that failed or timed out would otherwise never be
+        searched for this window again. Postings already handled are
+        skipped by the index either way.
+        """
+        failed = [record['site'] for record in sites if record['error']]
+        if failed:
+            self.log(f"{', '.join(failed)} failed, the next run searches the same time window again")
+            return
+        self.job_index.mark_success(index_key, started)
+
+    def scrape(self, params: dict, timeout: float,
+               ingest: Optional[Callable[['pd.DataFrame'], 'pd.DataFrame']] = None) -> Tuple['pd.DataFrame', List[dict]]:
+        """Scrape every site in parallel; fails only if no site succeeded."""
+        from scrape_orchestrator import scrape_sites
+        jobs, sites = scrape_sites(params, timeout=timeout, log=self.log, cancel_event=self.cancel_event,
+                                   ingest=ingest)
+        if sites and all(record['error'] for record in sites):
+            raise RuntimeError("All job sites failed: " + "; ".join(
+                f"{record['site']}: {record['error']}" for record in sites
+            ))
+        return jobs, sites
+
+    def analyze(self, jobs: 'pd.DataFrame', resume: Optional[str], params: dict,
+                search: dict, profile: Optional['ResumeProfile'] = None) -> Tuple['pd.DataFrame', ScoringCheckpoint]:
+        """Add similarity and category columns, checkpointing every verdict.
+
+        ``profile`` is the resume's cached profile; without it one is built
+        from the text. The checkpoint is returned so the caller can delete it
+        once the results have been exported.
+        """
+        from scoring import ANALYSIS_ERROR
+
+        total_jobs = len(jobs)
+        descriptions = jobs['description'].tolist()
+
+        # The embedding prefilter compares against the whole resume, the LLM sees the profile
+        prompt_resume = resume
+        if resume and search['condense_resume']:
+            from resume import condensed_resume
+            prompt_resume = condensed_resume(resume, profile)
+            if prompt_resume != resume:
+                self.log(f"Scoring against the resume profile ({len(prompt_resume)} of {len(resume)} characters)")
+            else:
+                self.log("Scoring against the full resume, a profile would not be shorter")
+
+        # Strip boilerplate and trim descriptions before they reach the models
+        self.condenser.token_budget = search['token_budget']
+        if self.condenser.token_budget:
+            self.condenser.reset_stats()
+            with self.metrics.stage('condense'):
+                descriptions = self.condenser.condense_all(descriptions)
+            self.log(self.condenser.report())
+
+        # Reuse verdicts streamed to disk by an interrupted run of this search
+        # Prefilter rejections are checkpointed too, so a changed threshold or top-k must not resume them
+        settings = {key: search[key] for key in ('similarity_threshold', 'top_k', 'token_budget', 'batch_size')}
+        settings.update(model=self.scorer.model, template=self.scorer.template,
+                        batch_template=self.scorer.batch_template, embed_model=self.prefilter.model)
+        checkpoint = ScoringCheckpoint(ScoringCheckpoint.make_run_id(params, prompt_resume, settings))
+        finished = checkpoint.load()
+        keys = [job_key(url, index) for index, url in enumerate(jobs['job_url'])]
+        categories = [finished[key]['category'] if key in finished else None for key in keys]
+        if finished:
+            resumed = sum(category is not None for category in categories)
+            self.log(f"Resuming previous run: {resumed} jobs already analyzed")
+        similarities = None
+
+        def record(index, category):
+            categories[index] = category
+            if category == ANALYSIS_ERROR:
+                # Leave failed jobs out so a resumed run retries them
+                return
+            row = {
+                'title': jobs['title'].iat[index],
+                'company': jobs['company'].iat[index],
+                'category': category,
+            }
+            if similarities is not None:
+                row['similarity'] = round(float(similarities[index]), 3)
+            checkpoint.append(keys[index], row)
+
+        # Rank jobs against the resume so clear mismatches skip the LLM
+        self.check_cancelled()
+        to_score = [index for index in range(total_jobs) if categories[index] is None]
+        if resume and to_score:
+            try:
+                self.prefilter.threshold = search['similarity_threshold']
+                self.prefilter.top_k = search['top_k']
+                with self.metrics.stage('prefilter'):
+                    similarities = self.prefilter.similarities(resume, descriptions)
+                jobs['similarity'] = similarities.round(3)
+                keep = self.prefilter.select(similarities)
+                for index in to_score:
+                    if not keep[index]:
+                        record(index, "Not Apply")
+                to_score = [index for index in to_score if keep[index]]
+                self.log(f"Prefilter kept {len(to_score)}/{total_jobs} jobs for LLM analysis")
+            except Exception as e:
+                self.log(f"Embedding prefilter unavailable, analyzing all jobs: {str(e)}")
+
+        # Analyze jobs concurrently, streaming each verdict to the checkpoint
+        self.check_cancelled()
+        scorer = self.scorer
+        scorer.max_workers = max(1, int(search['llm_workers']))
+        scorer.batch_size = max(1, int(search['batch_size']))
+        scorer.use_cache = bool(search['use_cache'])
+        if search['llm_hosts'] is not None:
+            scorer.use_hosts(search['llm_hosts'])
+        if scorer.cache is not None:
+            scorer.cache.reset_stats()
+        if scorer.router is not None:
+            scorer.router.reset_stats()
+        scorer.stats.reset()
+        scorer.metrics = self.metrics
+        self.log(f"Analyzing {len(to_score)} jobs with up to {scorer.max_workers} parallel requests")
+        completed = 0
+
+        def report(index, category):
+            nonlocal completed
+            completed += 1
+            record(to_score[index], category)
+            self.log(f"Analyzed job {completed}/{len(to_score)}")
+
+        try:
+            with self.metrics.stage('score'):
+                scorer.score_all(
+                    prompt_resume, [descriptions[index] for index in to_score],
+                    on_result=report, cancel_event=self.cancel_event
+                )
+        finally:
+            checkpoint.close()
+            for mode, tokens in scorer.stats.tokens.items():
+                if scorer.stats.jobs[mode]:
+                    self.metrics.gauge('llm_prompt_tokens', tokens, mode=mode)
+            if scorer.router is not None:
+                self.metrics.record_llm_hosts(scorer.router.stats())
+        self.check_cancelled()
+        if scorer.router is not None:
+            for line in scorer.router.report():
+                self.log(line)
+        if scorer.use_cache and scorer.cache is not None:
+            self.log(scorer.cache.stats())
+        self.log(scorer.stats.report())
+
+        # Build the final table in one pass, keeping the original row order
+        jobs['category'] = categories
+        jobs = jobs[
+            [col for col in EXPORT_COLUMNS if col in jobs.columns] +
+            [col for col in jobs.columns if col not in EXPORT_COLUMNS]
+        ]
+        return jobs, checkpoint
+
+    def export(self, jobs: 'pd.DataFrame', search: dict) -> str:
+        # Generate filename with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = f"{search['name']}_" if search['name'] else ""
+        filename = os.path.join(
+            search['output_dir'], f"{prefix}job_search_results_{timestamp}.{search['export_format']}"
+        )
+        os.makedirs(search['output_dir'], exist_ok=True)
+        from exporter import export_jobs
+        export_jobs(jobs, filename)
+        return filename
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+from langchain_ollama import OllamaEmbeddings
+
+from llm_cache import CACHE_DIR
+
+EMBED_MODEL = "nomic-embed-text"
+
+
+class EmbeddingCache:
+    """SQLite store of embedding vectors keyed by model and content hash."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_DIR, "embeddings.sqlite")
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> dict:
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: dict):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingPrefilter:
+    """Rank jobs by resume similarity so clear mismatches skip the LLM."""
+
+    def __init__(self, model: str = EMBED_MODEL, threshold: float = 0.35,
+                 top_k: Optional[int] = None, batch_size: int = 32,
+                 cache: Optional[EmbeddingCache] = None,
+                 log: Optional[Callable[[str], None]] = None):
+        self.model = model
+        self.threshold = threshold
+        self.top_k = top_k
+        self.batch_size = max(1, int(batch_size))
+        self.cache = cache
+        self.log = log or (lambda message: None)
+        self._embeddings = None
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            self._embeddings = OllamaEmbeddings(model=self.model)
+        return self._embeddings
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return one L2-normalised row per text, embedding only cache misses."""
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        keys = [EmbeddingCache.make_key(self.model, text) for text in texts]
+        vectors = self.cache.get_many(keys) if self.cache else {}
+
+        # Embed each distinct missing text once, in batches
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+        text_by_key = dict(zip(keys, texts))
+        fresh = {}
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            for key, vector in zip(batch, self.embeddings.embed_documents([text_by_key[k] for k in batch])):
+                fresh[key] = np.asarray(vector, dtype=np.float32)
+        if fresh and self.cache:
+            self.cache.put_many(fresh)
+        vectors.update(fresh)
+
+        if missing:
+            self.log(f"Embedded {len(missing)} of {len(texts)} texts, the rest came from cache")
+
+        matrix = np.vstack([vectors[key] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def similarities(self, resume: str, descriptions: List[str]) -> np.ndarray:
+        """Cosine similarity of every description to the resume."""
+        if not descriptions:
+            return np.empty(0, dtype=np.float32)
+        resume_vector = self.embed([resume])[0]
+        return self.embed(descriptions) @ resume_vector
+
+    def select(self, similarities: np.ndarray) -> np.ndarray:
+        """Boolean mask of jobs worth sending to the LLM."""
+        keep = similarities >= self.threshold
+        if self.top_k is not None and self.top_k < len(similarities):
+            ranked = np.argsort(-similarities, kind="stable")
+            in_top_k = np.zeros(len(similarities), dtype=bool)
+            in_top_k[ranked[:self.top_k]] = True
+            keep &= in_top_k
+        return keep
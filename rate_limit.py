@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        try:
+            rate, capacity = float(rate), float(capacity)
+        except (TypeError, ValueError):
+            raise ValueError(f"Rate limit rate and burst must be numbers, got {rate!r} and {capacity!r}") from None
+        if not rate > 0:
+            raise ValueError(f"Rate limit must be above 0 requests per second, got {rate!r}")
+        if not capacity >= 1:
+            raise ValueError(f"Rate limit burst must be at least 1, got {capacity!r}")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Take tokens if available and return 0, else return seconds to wait."""
+        # A request larger than the bucket would never fit; charge a full bucket
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Block until tokens are taken; returns False if cancelled first."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if cancel_event is not None and cancel_event.wait(min(wait, 0.5)):
+                return False
+            if cancel_event is None:
+                time.sleep(wait)
+
+
+class DomainRateLimiter:
+    """One token bucket per domain, so a busy host never throttles an idle one.
+
+    ``limits`` maps a domain to {'rate': tokens per second, 'burst': capacity};
+    other domains get the defaults.
+    """
+
+    def __init__(self, default_rate: float = 0.5, default_burst: float = 5,
+                 limits: Optional[Dict[str, dict]] = None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.limits = limits or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        # Buckets are made on first use; check every setting now rather than mid-run
+        TokenBucket(default_rate, default_burst)
+        for domain in self.limits:
+            self._settings(domain)
+
+    def _settings(self, domain: str) -> TokenBucket:
+        limit = self.limits.get(domain, {})
+        try:
+            return TokenBucket(limit.get('rate', self.default_rate), limit.get('burst', self.default_burst))
+        except ValueError as e:
+            raise ValueError(f"{domain}: {str(e)}") from None
+
+    def bucket(self, domain: str) -> TokenBucket:
+        with self._lock:
+            if domain not in self._buckets:
+                self._buckets[domain] = self._settings(domain)
+            return self._buckets[domain]
+
+    def try_acquire(self, domain: str, tokens: float = 1) -> float:
+        return self.bucket(domain).try_acquire(tokens)
+
+    def acquire(self, domain: str, tokens: float = 1,
+                cancel_event: Optional[threading.Event] = None) -> bool:
+        return self.bucket(domain).acquire(tokens, cancel_event)
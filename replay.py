@@ -0,0 +1,508 @@
+"""Record live HTTP traffic once, then rerun the app offline against it.
+
+Usage: python replay.py record fixtures/run.jsonl.gz -- cli.py searches.json
+       python replay.py replay fixtures/run.jsonl.gz -- cli.py searches.json
+       python replay.py replay fixtures/matrix.jsonl.gz -- cli.py --matrix matrix.json
+       python replay.py replay fixtures/legacy.jsonl.gz -- outdated/jobs.py
+
+The script must have a main() that runs unattended, so the Tk front ends
+cannot be replayed; use cli.py with the same saved search instead.
+
+Record mode runs the script normally and captures every HTTP exchange made
+through requests (JobScraper, jobspy), tls_client (jobspy's Glassdoor),
+httpx (the Ollama client) and aiohttp (outdated/async_jobs.py) into a
+gzipped JSONL archive. Replay mode starts
+a local stub server that serves the archive and points those same clients
+at it, so job boards and Ollama are never contacted and every run sees the
+same pages and the same LLM answers.
+
+Exchanges are matched by method, URL (query sorted) and request body.
+Repeated identical requests get their recorded responses in order. Both
+modes run with a fresh cache directory, so caches cannot hide requests, and
+finish with a timing report per pipeline stage and per remote host.
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Response headers that describe the stored body rather than the resource
+DROPPED_HEADERS = {'content-length', 'content-encoding', 'transfer-encoding', 'connection',
+                   'keep-alive', 'set-cookie'}
+
+# (module, attribute path, stage) timed when the module is loaded
+STAGES = [
+    ('pipeline', 'JobPipeline.scrape', 'scrape'),
+    ('scheduler', 'SearchScheduler.run', 'scrape'),
+    ('jobs', 'JobScraper.fetch', 'scrape'),
+    ('async_jobs', 'AsyncJobScraper.scrape', 'scrape'),
+    ('jobs', 'JobScraper.parse_linkedin', 'parse'),
+    ('jobs', 'JobScraper.parse_indeed', 'parse'),
+    ('normalize', 'normalize_jobs', 'normalize'),
+    ('dedup', 'JobDeduplicator.dedupe', 'dedupe'),
+    ('condense', 'DescriptionCondenser.condense_all', 'condense'),
+    ('prefilter', 'EmbeddingPrefilter.similarities', 'prefilter'),
+    ('scoring', 'JobScorer.score_all', 'score'),
+    ('pipeline', 'JobPipeline.export', 'export'),
+    ('jobs', 'JobScraper.export_to_excel', 'export'),
+]
+
+
+def exchange_key(method: str, url: str, body) -> str:
+    """Identity of a request: method, URL with sorted query, and body digest."""
+    parts = urlsplit(str(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    if body is None:
+        body = b''
+    elif isinstance(body, str):
+        body = body.encode('utf-8')
+    elif not isinstance(body, (bytes, bytearray)):
+        # Streaming bodies cannot be read twice; match on URL alone
+        body = b''
+    digest = hashlib.sha256()
+    digest.update(method.upper().encode())
+    digest.update(b'\0')
+    digest.update(urlunsplit((parts.scheme, parts.netloc, parts.path, query, '')).encode())
+    digest.update(b'\0')
+    digest.update(bytes(body))
+    return digest.hexdigest()[:32]
+
+
+class StageTimer:
+    """Wall time and call counts per stage and per remote host, thread-safe."""
+
+    def __init__(self):
+        self.stages = defaultdict(lambda: [0, 0.0])
+        self.hosts = defaultdict(lambda: [0, 0.0, 0])
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage][0] += 1
+            self.stages[stage][1] += seconds
+
+    def add_request(self, url: str, seconds: float, size: int):
+        host = urlsplit(str(url)).netloc
+        with self._lock:
+            entry = self.hosts[host]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += size
+
+    def wrap(self, owner, name: str, stage: str):
+        original = getattr(owner, name)
+        if getattr(original, '_replay_stage', None):
+            return
+        timer = self
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                timer.add_stage(stage, time.perf_counter() - start)
+
+        if hasattr(original, '__code__') and original.__code__.co_flags & 0x80:
+            # Coroutine functions are timed until they finish, not until they return a coroutine
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    timer.add_stage(stage, time.perf_counter() - start)
+
+        timed.__name__ = getattr(original, '__name__', name)
+        timed.__doc__ = getattr(original, '__doc__', None)
+        timed._replay_stage = stage
+        setattr(owner, name, timed)
+
+    def instrument(self):
+        """Wrap every known stage whose module has been imported."""
+        for module_name, path, stage in STAGES:
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            owner = module
+            *parents, name = path.split('.')
+            for parent in parents:
+                owner = getattr(owner, parent, None)
+            if owner is not None and hasattr(owner, name):
+                self.wrap(owner, name, stage)
+
+    def report(self) -> List[str]:
+        lines = [f"{'stage':<12} {'calls':>6} {'seconds':>9}"]
+        for stage, (calls, seconds) in sorted(self.stages.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{stage:<12} {calls:>6} {seconds:>9.2f}")
+        lines.append(f"{'host':<28} {'requests':>8} {'seconds':>9} {'MB':>7}")
+        for host, (count, seconds, size) in sorted(self.hosts.items()):
+            lines.append(f"{host:<28} {count:>8} {seconds:>9.2f} {size / 1e6:>7.2f}")
+        return lines
+
+    def as_dict(self) -> dict:
+        return {
+            'stages': {stage: {'calls': calls, 'seconds': round(seconds, 4)}
+                       for stage, (calls, seconds) in self.stages.items()},
+            'hosts': {host: {'requests': count, 'seconds': round(seconds, 4), 'bytes': size}
+                      for host, (count, seconds, size) in self.hosts.items()},
+        }
+
+
+class FixtureArchive:
+    """Recorded exchanges, in the order they happened, grouped by request key."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.exchanges = defaultdict(list)
+        self._cursor = defaultdict(int)
+        self._lock = threading.Lock()
+        self.misses = []
+
+    def load(self) -> 'FixtureArchive':
+        with gzip.open(self.path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                exchange = json.loads(line)
+                self.exchanges[exchange['key']].append(exchange)
+        return self
+
+    def add(self, method: str, url: str, body, status: int, headers: dict, content: bytes, elapsed: float):
+        exchange = {
+            'key': exchange_key(method, url, body),
+            'method': method.upper(),
+            'url': str(url),
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+            'body': base64.b64encode(content or b'').decode('ascii'),
+            'elapsed': round(elapsed, 4),
+        }
+        with self._lock:
+            self.exchanges[exchange['key']].append(exchange)
+
+    def next(self, key: str) -> Optional[dict]:
+        """The next recorded response for a key; the last one repeats once used up."""
+        with self._lock:
+            recorded = self.exchanges.get(key)
+            if not recorded:
+                return None
+            index = min(self._cursor[key], len(recorded) - 1)
+            self._cursor[key] += 1
+            return recorded[index]
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        rows = sorted((exchange for group in self.exchanges.values() for exchange in group),
+                      key=lambda exchange: exchange['url'])
+        temp = self.path + '.tmp'
+        with gzip.open(temp, 'wt', encoding='utf-8') as file:
+            for exchange in rows:
+                file.write(json.dumps(exchange) + '\n')
+        os.replace(temp, self.path)
+
+    def __len__(self):
+        return sum(len(group) for group in self.exchanges.values())
+
+
+class ReplayServer:
+    """Local HTTP stub that answers /<key> from a fixture archive."""
+
+    def __init__(self, archive: FixtureArchive):
+        self.archive = archive
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                key = self.path.strip('/').split('?')[0]
+                exchange = server.archive.next(key)
+                if exchange is None:
+                    server.archive.misses.append(self.headers.get('X-Replay-Url', key))
+                    body = json.dumps({'error': 'no recorded exchange'}).encode()
+                    status, headers = 404, {'Content-Type': 'application/json'}
+                else:
+                    body = base64.b64decode(exchange['body'])
+                    status, headers = exchange['status'], exchange['headers']
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = _serve
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class HttpHooks:
+    """Patch requests, tls_client, httpx and aiohttp to record into, or replay from, an archive."""
+
+    def __init__(self, mode: str, archive: FixtureArchive, timer: StageTimer,
+                 server: Optional[ReplayServer] = None):
+        self.mode = mode
+        self.archive = archive
+        self.timer = timer
+        self.server = server
+        self._originals = []
+
+    def _stub_url(self, method: str, url: str, body) -> str:
+        return f"{self.server.url}/{exchange_key(method, url, body)}"
+
+    def _patch(self, owner, name, replacement):
+        self._originals.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def install(self):
+        self._hook_requests()
+        self._hook_httpx()
+        self._hook_tls_client()
+        self._hook_aiohttp()
+        return self
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+    def _hook_requests(self):
+        import requests
+        hooks = self
+        send = requests.Session.send
+
+        def hooked_send(session, request, **kwargs):
+            url, body = request.url, request.body
+            start = time.perf_counter()
+            if hooks.mode == 'replay':
+                request = request.copy()
+                request.headers['X-Replay-Url'] = url
+                request.url = hooks._stub_url(request.method, url, body)
+            response = send(session, request, **kwargs)
+            content = response.content
+            elapsed = time.perf_counter() - start
+            hooks.timer.add_request(url, elapsed, len(content or b''))
+            if hooks.mode == 'record':
+                hooks.archive.add(request.method, url, body, response.status_code,
+                                  dict(response.headers), content, elapsed)
+            else:
+                response.url = url
+            return response
+
+        self._patch(requests.Session, 'send', hooked_send)
+
+    def _hook_httpx(self):
+        try:
+            import httpx
+        except ImportError:
+            return
+        hooks = self
+        send = httpx.Client.send
+        async_send = httpx.AsyncClient.send
+
+        def redirected(request):
+            body = request.content
+            headers = dict(request.headers)
+            headers.pop('host', None)
+            headers['X-Replay-Url'] = str(request.url)
+            return httpx.Request(request.method, hooks._stub_url(request.method, str(request.url), body),
+                                 headers=headers, content=body)
+
+        def finish(request, response, content, start):
+            elapsed = time.perf_counter() - start
+            hooks.timer.add_request(request.url, elapsed, len(content))
+            if hooks.mode == 'record':
+                hooks.archive.add(request.method, str(request.url), request.content, response.status_code,
+                                  dict(response.headers), content, elapsed)
+
+        def hooked_send(client, request, **kwargs):
+            start = time.perf_counter()
+            outgoing = redirected(request) if hooks.mode == 'replay' else request
+            response = send(client, outgoing, **kwargs)
+            # Read streamed bodies now; httpx still lets the caller iterate them afterwards
+            content = response.read()
+            finish(request, response, content, start)
+            return response
+
+        async def hooked_async_send(client, request, **kwargs):
+            start = time.perf_counter()
+            outgoing = redirected(request) if hooks.mode == 'replay' else request
+            response = await async_send(client, outgoing, **kwargs)
+            content = await response.aread()
+            finish(request, response, content, start)
+            return response
+
+        self._patch(httpx.Client, 'send', hooked_send)
+        self._patch(httpx.AsyncClient, 'send', hooked_async_send)
+
+    def _hook_tls_client(self):
+        try:
+            import tls_client
+        except ImportError:
+            return
+        import requests
+        hooks = self
+        execute = tls_client.Session.execute_request
+        # The hooked signature's ``json`` argument shadows the module
+        dumps = json.dumps
+
+        def hooked_execute(session, method, url, params=None, data=None, headers=None, json=None, **kwargs):
+            full_url = requests.Request(method, url, params=params).prepare().url
+            body = data if data is not None else (dumps(json) if json is not None else None)
+            start = time.perf_counter()
+            if hooks.mode == 'replay':
+                # The stub speaks plain HTTP, so answer through requests
+                response = requests.request(method, hooks._stub_url(method, full_url, body),
+                                            headers={'X-Replay-Url': full_url}, data=body)
+                response.url = full_url
+            else:
+                response = execute(session, method, url, params=params, data=data, headers=headers,
+                                   json=json, **kwargs)
+            content = response.content or b''
+            elapsed = time.perf_counter() - start
+            hooks.timer.add_request(full_url, elapsed, len(content))
+            if hooks.mode == 'record':
+                hooks.archive.add(method, full_url, body, response.status_code,
+                                  dict(response.headers), content, elapsed)
+            return response
+
+        self._patch(tls_client.Session, 'execute_request', hooked_execute)
+
+    def _hook_aiohttp(self):
+        try:
+            import aiohttp
+        except ImportError:
+            return
+        import requests
+        hooks = self
+        request = aiohttp.ClientSession._request
+        dumps = json.dumps
+
+        async def hooked_request(session, method, str_or_url, *, params=None, data=None, json=None,
+                                 headers=None, **kwargs):
+            full_url = requests.Request(method, str(str_or_url), params=params).prepare().url
+            body = data if data is not None else (dumps(json) if json is not None else None)
+            start = time.perf_counter()
+            if hooks.mode == 'replay':
+                headers = {**(headers or {}), 'X-Replay-Url': full_url}
+                response = await request(session, method, hooks._stub_url(method, full_url, body),
+                                         data=body, headers=headers, **kwargs)
+            else:
+                response = await request(session, method, str_or_url, params=params, data=data, json=json,
+                                         headers=headers, **kwargs)
+            # aiohttp keeps the body once read, so the caller's text()/read() still work
+            content = await response.read()
+            elapsed = time.perf_counter() - start
+            hooks.timer.add_request(full_url, elapsed, len(content))
+            if hooks.mode == 'record':
+                hooks.archive.add(method, full_url, body, response.status,
+                                  dict(response.headers), content, elapsed)
+            return response
+
+        self._patch(aiohttp.ClientSession, '_request', hooked_request)
+
+
+def run_script(script: str, args: List[str], timer: StageTimer):
+    """Import the script as a module, time its stages, then call its main()."""
+    path = os.path.abspath(script)
+    sys.path.insert(0, os.path.dirname(path))
+    sys.argv = [path] + args
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    timer.instrument()
+    if not hasattr(module, 'main'):
+        raise SystemExit(f"{script} has no main() to run")
+    return module.main()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record or replay HTTP fixtures around a script run.")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("archive", help="fixture archive (.jsonl.gz)")
+    parser.add_argument("script", help="script to run, followed by its arguments")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    parser.add_argument("--cache-dir", help="cache directory for the run (default: a fresh temporary one)")
+    parser.add_argument("--report", help="also write the timing report to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Caches would answer repeat requests without HTTP, so start from an empty one
+    os.environ["JOB_SEARCH_CACHE_DIR"] = args.cache_dir or tempfile.mkdtemp(prefix="job_search_replay_")
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, os.path.join(ROOT, "outdated"))
+
+    timer = StageTimer()
+    # Import stage modules up front so their methods are timed even when the
+    # script imports them lazily; optional ones may be missing
+    for module_name in sorted({module_name for module_name, _, _ in STAGES}):
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass
+    timer.instrument()
+
+    archive = FixtureArchive(args.archive)
+    server = None
+    if args.mode == "replay":
+        archive.load()
+        server = ReplayServer(archive).start()
+        print(f"Replaying {len(archive)} recorded exchanges from {args.archive}", flush=True)
+    hooks = HttpHooks(args.mode, archive, timer, server).install()
+
+    started = time.perf_counter()
+    result = 0
+    try:
+        result = run_script(args.script, [arg for arg in args.args if arg != "--"], timer) or 0
+    except SystemExit as e:
+        result = e.code if isinstance(e.code, int) else 0
+    finally:
+        hooks.uninstall()
+        if server is not None:
+            server.stop()
+        if args.mode == "record":
+            archive.save()
+            print(f"Recorded {len(archive)} exchanges to {args.archive}")
+        elif archive.misses:
+            print(f"{len(archive.misses)} requests had no recorded response, e.g. {archive.misses[0]}")
+
+        elapsed = time.perf_counter() - started
+        print(f"Run finished in {elapsed:.2f}s")
+        for line in timer.report():
+            print(line)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as file:
+                json.dump({'mode': args.mode, 'seconds': round(elapsed, 4), **timer.as_dict(),
+                           'misses': archive.misses}, file, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
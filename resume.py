@@ -0,0 +1,282 @@
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import PyPDF2
+from docx import Document
+
+from llm_cache import CACHE_DIR
+
+# Bump when extraction or profiling changes, so cached entries are rebuilt
+PARSER_VERSION = 1
+
+# PDFs with more pages than this are extracted on several processes
+PARALLEL_PAGES = 8
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Go', 'Golang', 'Rust', 'C++', 'C#', 'Ruby', 'PHP',
+    'Scala', 'Kotlin', 'Swift', 'R', 'MATLAB', 'Bash', 'SQL', 'NoSQL', 'PostgreSQL', 'MySQL',
+    'SQLite', 'MongoDB', 'Redis', 'Cassandra', 'DynamoDB', 'Elasticsearch', 'Snowflake', 'BigQuery',
+    'Redshift', 'Databricks', 'Spark', 'PySpark', 'Hadoop', 'Hive', 'Kafka', 'Airflow', 'dbt',
+    'Flink', 'pandas', 'NumPy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'Keras', 'XGBoost',
+    'LangChain', 'LLM', 'NLP', 'Computer Vision', 'Machine Learning', 'Deep Learning',
+    'Data Analysis', 'Data Engineering', 'Data Modeling', 'ETL', 'Statistics', 'A/B Testing',
+    'Tableau', 'Power BI', 'Looker', 'Excel', 'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes',
+    'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions', 'CI/CD', 'Linux', 'Git', 'REST', 'GraphQL',
+    'gRPC', 'Microservices', 'Django', 'Flask', 'FastAPI', 'Spring', 'Node.js', 'React', 'Angular',
+    'Vue', 'HTML', 'CSS', 'iOS', 'Android', 'Agile', 'Scrum', 'Jira', 'Product Management',
+    'Project Management', 'Stakeholder Management', 'Leadership', 'Salesforce', 'SAP',
+]
+SKILL_PATTERN = re.compile(
+    r"(?<![\w+#.])(" + "|".join(re.escape(skill) for skill in sorted(SKILLS, key=len, reverse=True)) + r")(?![\w+#])",
+    re.IGNORECASE
+)
+CANONICAL_SKILLS = {skill.lower(): skill for skill in SKILLS}
+
+ROLE_WORDS = (r"engineer|developer|scientist|analyst|manager|architect|designer|consultant|"
+              r"administrator|specialist|director|lead|intern|researcher|programmer|officer")
+# Words before the role must be capitalised, so "worked as a data engineer" is not a title
+TITLE_PATTERN = re.compile(
+    r"\b((?:(?i:senior|sr\.?|junior|jr\.?|lead|staff|principal|head of|chief|associate)\s+)?"
+    r"(?:[A-Z][\w/&+.-]*\s+){0,3}(?i:" + ROLE_WORDS + r"))\b"
+)
+EXPLICIT_YEARS = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)(?:\s+of)?(?:\s+\w+){0,3}\s+experience", re.IGNORECASE)
+DATE_RANGE = re.compile(
+    r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)", re.IGNORECASE
+)
+US_STATES = (
+    "AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ NM NY "
+    "NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC ON BC QC AB"
+).split()
+LOCATION_PATTERN = re.compile(r"\b([A-Z][a-z]+(?:[ .][A-Z][a-z]+){0,2}),\s*(" + "|".join(US_STATES) + r")\b")
+REMOTE_PATTERN = re.compile(r"\bremote\b", re.IGNORECASE)
+
+
+def file_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _pdf_pages(file_path: str, start: int, stop: int) -> str:
+    """Text of pages [start, stop); the top-level function so worker processes can run it."""
+    with open(file_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages
+        # A newline between pages keeps the last line of one from running into the next
+        return "".join((pages[number].extract_text() or "") + "\n" for number in range(start, stop))
+
+
+def extract_pdf(file_path: str, max_workers: Optional[int] = None) -> str:
+    """PDF text, split into page ranges over several processes for long files.
+
+    Page extraction is pure Python and CPU bound, so threads would not help.
+    Short resumes are read in-process, where a pool would cost more than it saves.
+    """
+    with open(file_path, 'rb') as file:
+        page_count = len(PyPDF2.PdfReader(file).pages)
+    workers = min(max_workers or os.cpu_count() or 1, page_count // (PARALLEL_PAGES // 2) or 1)
+    if page_count <= PARALLEL_PAGES or workers <= 1:
+        return _pdf_pages(file_path, 0, page_count)
+
+    step = -(-page_count // workers)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        parts = executor.map(_pdf_pages, [file_path] * len(ranges), *zip(*ranges))
+        return "".join(parts)
+
+
+def extract_docx(file_path: str) -> str:
+    doc = Document(file_path)
+    parts = [paragraph.text + "\n" for paragraph in doc.paragraphs]
+    # Also extract text from tables if present
+    for table in doc.tables:
+        for row in table.rows:
+            parts.append(" ".join(cell.text for cell in row.cells) + " \n")
+    return "".join(parts)
+
+
+def extract_text(file_path: str) -> Optional[str]:
+    """Raw resume text from a PDF or DOCX file, or None for other file types."""
+    if file_path.endswith('.pdf'):
+        return extract_pdf(file_path)
+    elif file_path.endswith('.docx'):
+        return extract_docx(file_path)
+    return None
+
+
+def _ranked(matches: List[str], limit: int) -> List[str]:
+    """Distinct values, most frequent first, ties in order of first appearance."""
+    counts = {}
+    for match in matches:
+        counts[match] = counts.get(match, 0) + 1
+    order = {value: position for position, value in enumerate(counts)}
+    return sorted(counts, key=lambda value: (-counts[value], order[value]))[:limit]
+
+
+class ResumeProfile:
+    """The parts of a resume that decide job fit, in a few hundred characters.
+
+    Sent to the LLM in place of the full resume, so every scoring prompt
+    is shorter; see ``condensed_resume`` for the fallback when nothing
+    could be recognised.
+    """
+
+    FIELDS = ('titles', 'skills', 'years', 'locations')
+
+    def __init__(self, titles: Optional[List[str]] = None, skills: Optional[List[str]] = None,
+                 years: Optional[int] = None, locations: Optional[List[str]] = None):
+        self.titles = titles or []
+        self.skills = skills or []
+        self.years = years
+        self.locations = locations or []
+
+    @classmethod
+    def from_text(cls, text: str, max_skills: int = 30, max_titles: int = 5) -> "ResumeProfile":
+        # Short names like "Go" and "R" only count with their exact capitalisation
+        skills = [CANONICAL_SKILLS[match.lower()] for match in SKILL_PATTERN.findall(text)
+                  if len(match) > 2 or match == CANONICAL_SKILLS[match.lower()]]
+
+        # Titles are headline-like: short lines that name a role
+        titles = []
+        for line in text.splitlines():
+            line = line.strip()
+            if 0 < len(line) <= 80:
+                titles += [" ".join(match.split()) for match in TITLE_PATTERN.findall(line)]
+        titles = [title for title in titles if len(title.split()) > 1 or title[0].isupper()]
+
+        explicit = [int(number) for number in EXPLICIT_YEARS.findall(text)]
+        if explicit:
+            years = max(explicit)
+        else:
+            current = time.localtime().tm_year
+            ranges = [(int(start), current if not end.isdigit() else int(end))
+                      for start, end in DATE_RANGE.findall(text)]
+            ranges = [(start, end) for start, end in ranges if start <= end <= current]
+            years = (max(end for _, end in ranges) - min(start for start, _ in ranges)) if ranges else None
+
+        locations = [f"{city}, {state}" for city, state in LOCATION_PATTERN.findall(text)]
+        if REMOTE_PATTERN.search(text):
+            locations.append("Remote")
+
+        return cls(
+            titles=_ranked(titles, max_titles),
+            skills=_ranked(skills, max_skills),
+            years=years,
+            locations=_ranked(locations, 3),
+        )
+
+    def is_empty(self) -> bool:
+        return not (self.titles or self.skills or self.years)
+
+    def summary(self) -> str:
+        lines = []
+        if self.titles:
+            lines.append("Titles: " + ", ".join(self.titles))
+        if self.years:
+            lines.append(f"Experience: {self.years} years")
+        if self.skills:
+            lines.append("Skills: " + ", ".join(self.skills))
+        if self.locations:
+            lines.append("Locations: " + ", ".join(self.locations))
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResumeProfile":
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+
+def condensed_resume(text: Optional[str], profile: Optional[ResumeProfile] = None) -> Optional[str]:
+    """Profile summary to prompt with, or the raw text if no profile could be built
+    or the summary would not be shorter than the resume itself."""
+    if not text:
+        return text
+    profile = profile or ResumeProfile.from_text(text)
+    if profile.is_empty():
+        return text
+    summary = profile.summary()
+    return summary if len(summary) < len(text) else text
+
+
+class ResumeCache:
+    """SQLite cache of extracted resume text and profiles keyed by file content hash.
+
+    Re-uploading the same file, under any name, skips extraction entirely.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(CACHE_DIR, "resumes.sqlite")
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resumes (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(content_hash: str) -> str:
+        return f"{PARSER_VERSION}:{content_hash}"
+
+    def get(self, key: str) -> Optional[Tuple[str, ResumeProfile]]:
+        with self._lock:
+            row = self._conn.execute("SELECT text, profile FROM resumes WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], ResumeProfile.from_dict(json.loads(row[1]))
+
+    def put(self, key: str, text: str, profile: ResumeProfile):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resumes (key, text, profile, created_at) VALUES (?, ?, ?, ?)",
+                (key, text, json.dumps(profile.to_dict()), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def _shared_cache() -> ResumeCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResumeCache()
+        return _default_cache
+
+
+def load_resume(file_path: str, cache: Optional[ResumeCache] = None) -> Tuple[Optional[str], Optional[ResumeProfile]]:
+    """Text and profile of a resume file, extracted once per distinct file content."""
+    if not file_path.endswith(('.pdf', '.docx')):
+        return None, None
+    cache = cache or _shared_cache()
+    key = ResumeCache.make_key(file_hash(file_path))
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    text = extract_text(file_path)
+    profile = ResumeProfile.from_text(text)
+    cache.put(key, text, profile)
+    return text, profile
@@ -0,0 +1,196 @@
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import product
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from jobspy import scrape_jobs
+
+from compact import concat_jobs
+from pipeline import SITES, build_search, scrape_params
+from rate_limit import DomainRateLimiter
+from worker import Cancelled
+
+SITE_DOMAINS = {
+    'indeed': 'indeed.com',
+    'linkedin': 'linkedin.com',
+    'zip_recruiter': 'ziprecruiter.com',
+    'glassdoor': 'glassdoor.com',
+    'google': 'google.com',
+}
+
+# Results per page on each board, used to estimate page requests per task
+SITE_PAGE_SIZE = {
+    'indeed': 100,
+    'linkedin': 25,
+    'zip_recruiter': 20,
+    'glassdoor': 30,
+    'google': 10,
+}
+
+# Keys of a search matrix that are not plain saved-search settings
+MATRIX_KEYS = ['search_terms', 'locations', 'countries', 'rate_limits', 'default_rate', 'default_burst']
+
+
+def expand_matrix(matrix: dict) -> List[dict]:
+    """Cross search terms, locations, countries and sites into one task each.
+
+    Every other key of the matrix is copied into each task as a saved-search
+    setting. Tasks hold a single site so each can be rate limited by domain.
+    """
+    varied = MATRIX_KEYS + ['search_term', 'location', 'country', 'sites']
+    base = {key: value for key, value in matrix.items() if key not in varied}
+    terms = matrix.get('search_terms') or [matrix.get('search_term', '')]
+    locations = matrix.get('locations') or [matrix.get('location', '')]
+    countries = matrix.get('countries') or [matrix.get('country', 'USA')]
+    sites = matrix.get('sites') or SITES
+
+    return [
+        build_search(**base, search_term=term, location=location, country=country, sites=[site])
+        for term, location, country, site in product(terms, locations, countries, sites)
+    ]
+
+
+def estimated_pages(task: dict) -> int:
+    site = task['sites'][0]
+    return max(1, math.ceil(int(task['results_wanted']) / SITE_PAGE_SIZE.get(site, 25)))
+
+
+def scrape_task(task: dict) -> pd.DataFrame:
+    """Default task runner: one scrape_jobs call for the task's single site."""
+    return scrape_jobs(**scrape_params(task))
+
+
+class SearchScheduler:
+    """Run search-matrix tasks under a global concurrency cap.
+
+    A task is only handed to a worker once its domain's token bucket can pay
+    for its estimated pages, so workers never sit blocked on a busy domain
+    while tasks for idle domains wait. Domains are served round robin.
+    """
+
+    def __init__(self, max_concurrency: int = 4, limiter: Optional[DomainRateLimiter] = None,
+                 log: Optional[Callable[[str], None]] = None,
+                 cancel_event: Optional[threading.Event] = None):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limiter = limiter or DomainRateLimiter()
+        self.log = log or print
+        self.cancel_event = cancel_event or threading.Event()
+        self.stats = {}
+
+    def _record(self, domain: str, started: float, finished: float, jobs: int, pages: int, error: bool):
+        stats = self.stats.setdefault(domain, {
+            'tasks': 0, 'errors': 0, 'jobs': 0, 'pages': 0, 'first': started, 'last': finished
+        })
+        stats['tasks'] += 1
+        stats['errors'] += int(error)
+        stats['jobs'] += jobs
+        stats['pages'] += pages
+        stats['first'] = min(stats['first'], started)
+        stats['last'] = max(stats['last'], finished)
+
+    def run(self, tasks: List[dict], runner: Callable[[dict], pd.DataFrame] = scrape_task,
+            ingest: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> pd.DataFrame:
+        """Run every task and return all results, tagged with the query that found them.
+
+        ``ingest`` is applied to each task's frame as it arrives (e.g.
+        ``compact.compact_jobs``), so only its result is kept until the merge.
+        """
+        self.stats = {}
+        queues = OrderedDict()
+        for task in tasks:
+            queues.setdefault(SITE_DOMAINS.get(task['sites'][0], task['sites'][0]), deque()).append(task)
+
+        frames = []
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="matrix")
+
+        def timed(task):
+            started = time.perf_counter()
+            try:
+                return started, runner(task), None
+            except Exception as e:
+                return started, None, e
+
+        try:
+            while queues or running:
+                if self.cancel_event.is_set():
+                    raise Cancelled()
+
+                # Fill free slots with tasks whose domain can pay for them now
+                next_wait = 0.5
+                while len(running) < self.max_concurrency and queues:
+                    dispatched = False
+                    for domain in list(queues):
+                        task = queues[domain][0]
+                        delay = self.limiter.try_acquire(domain, estimated_pages(task))
+                        if delay:
+                            next_wait = min(next_wait, delay)
+                            continue
+                        queues[domain].popleft()
+                        if queues[domain]:
+                            queues.move_to_end(domain)
+                        else:
+                            del queues[domain]
+                        running[executor.submit(timed, task)] = (domain, task)
+                        dispatched = True
+                        break
+                    if not dispatched:
+                        break
+
+                if not running:
+                    self.cancel_event.wait(next_wait)
+                    continue
+
+                done, _ = wait(running, timeout=next_wait, return_when=FIRST_COMPLETED)
+                for future in done:
+                    domain, task = running.pop(future)
+                    started, frame, error = future.result()
+                    finished = time.perf_counter()
+                    label = f"{task['search_term']!r} in {task['location'] or 'anywhere'} ({task['country']}) on {task['sites'][0]}"
+                    if error is not None:
+                        self._record(domain, started, finished, 0, 0, True)
+                        self.log(f"{label}: failed: {error}")
+                        continue
+                    pages = max(1, math.ceil(len(frame) / SITE_PAGE_SIZE.get(task['sites'][0], 25)))
+                    self._record(domain, started, finished, len(frame), pages, False)
+                    self.log(f"{label}: {len(frame)} jobs in {finished - started:.1f}s")
+                    if len(frame):
+                        frame = frame.assign(
+                            query_term=task['search_term'],
+                            query_location=task['location'],
+                            query_country=task['country'],
+                        )
+                        frames.append(ingest(frame) if ingest is not None else frame)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for line in self.report():
+            self.log(line)
+        # ingest may have categorized each frame; keep the columns categorical through the merge
+        return concat_jobs(frames)
+
+    def throughput(self) -> Dict[str, dict]:
+        """Per-domain totals plus jobs and pages per minute of active time."""
+        report = {}
+        for domain, stats in self.stats.items():
+            minutes = max(stats['last'] - stats['first'], 1e-6) / 60
+            report[domain] = {
+                'tasks': stats['tasks'],
+                'errors': stats['errors'],
+                'jobs': stats['jobs'],
+                'pages': stats['pages'],
+                'jobs_per_minute': round(stats['jobs'] / minutes, 1),
+                'pages_per_minute': round(stats['pages'] / minutes, 1),
+            }
+        return report
+
+    def report(self) -> List[str]:
+        return [
+            f"{domain}: {row['tasks']} tasks ({row['errors']} failed), {row['jobs']} jobs, "
+            f"~{row['pages']} pages; {row['jobs_per_minute']} jobs/min, {row['pages_per_minute']} pages/min"
+            for domain, row in self.throughput().items()
+        ]
@@ -0,0 +1,356 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from langchain_ollama.llms import OllamaLLM
+from langchain_core.prompts import ChatPromptTemplate
+
+from llm_cache import VerdictCache
+from llm_router import LLM_HOSTS, OllamaRouter, RoutedChain
+
+MODEL_NAME = "llama3.2:latest"
+
+PROMPT_TEMPLATE = """
+            Based on the following resume and job description, categorize this job as either:
+            1. "Not Apply" (clear mismatches)
+            2. "Should Apply" (good fit with some gaps)
+            3. "Must Apply" (excellent fit)
+
+            Resume:
+            {resume}
+
+            Job Description:
+            {job_description}
+
+            Respond with only one of the three categories listed above.
+            """
+
+BATCH_PROMPT_TEMPLATE = """
+            Based on the following resume, categorize each of the numbered jobs below as either:
+            1. "Not Apply" (clear mismatches)
+            2. "Should Apply" (good fit with some gaps)
+            3. "Must Apply" (excellent fit)
+
+            Resume:
+            {resume}
+
+            Jobs:
+            {jobs}
+
+            Respond with only a JSON object that maps every job number to one of the
+            three categories listed above, for example {{"1": "Must Apply", "2": "Not Apply"}}.
+            """
+
+CATEGORIES = ["Not Apply", "Should Apply", "Must Apply"]
+NO_RESUME = "Not Apply (No Resume)"
+ANALYSIS_ERROR = "Analysis Error"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def parse_batch_response(response: str, count: int) -> Dict[int, str]:
+    """Extract {job number: category} from a batch reply, skipping anything invalid."""
+    match = re.search(r"\{.*\}", response, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    verdicts = {}
+    for key, value in data.items():
+        number = re.search(r"\d+", str(key))
+        if not number or not isinstance(value, str):
+            continue
+        job_id = int(number.group(0))
+        category = next((c for c in CATEGORIES if c.lower() == value.strip().lower()), None)
+        if 1 <= job_id <= count and category:
+            verdicts[job_id] = category
+    return verdicts
+
+
+class TokenStats:
+    """Estimated prompt tokens spent per job, split by scoring mode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.tokens = {"batched": 0, "unbatched": 0}
+        self.jobs = {"batched": 0, "unbatched": 0}
+
+    def add(self, mode: str, tokens: int, jobs: int):
+        with self._lock:
+            self.tokens[mode] += tokens
+            self.jobs[mode] += jobs
+
+    def report(self) -> str:
+        parts = []
+        for mode in ("unbatched", "batched"):
+            if self.jobs[mode]:
+                per_job = self.tokens[mode] / self.jobs[mode]
+                parts.append(f"{mode} {per_job:.0f} tokens/job over {self.jobs[mode]} jobs")
+        return "Prompt size: " + ("; ".join(parts) if parts else "no LLM calls")
+
+
+class JobScorer:
+    """Categorize job descriptions against a resume using one shared Ollama chain.
+
+    With ``hosts`` (by default JOB_SEARCH_OLLAMA_HOSTS) the chain is an
+    ``OllamaRouter`` over those endpoints instead of the local default, so
+    ``max_workers`` calls are spread across machines.
+    """
+
+    def __init__(self, model: str = MODEL_NAME, template: str = PROMPT_TEMPLATE,
+                 max_workers: int = 4, log: Optional[Callable[[str], None]] = None,
+                 cache: Optional[VerdictCache] = None, batch_size: int = 1,
+                 batch_template: str = BATCH_PROMPT_TEMPLATE, keep_alive: Optional[str] = None,
+                 hosts: Optional[List[str]] = None):
+        self.model = model
+        # How long Ollama keeps the model loaded after a call (e.g. "90m"); None uses its default
+        self.keep_alive = keep_alive
+        self.template = template
+        self.batch_template = batch_template
+        self.max_workers = max(1, int(max_workers))
+        # Jobs packed into one prompt; 1 scores each job on its own
+        self.batch_size = max(1, int(batch_size))
+        self.log = log or (lambda message: None)
+        self.cache = cache
+        # Set to False to bypass the cache for a single run
+        self.use_cache = True
+        self.stats = TokenStats()
+        # Optional metrics.RunMetrics receiving per-call latency and queue depth
+        self.metrics = None
+        self.hosts = list(LLM_HOSTS if hosts is None else hosts)
+        # Set once the first chain is built when hosts are configured
+        self.router = None
+        self._chain = None
+        self._batch_chain = None
+        self._chain_lock = threading.Lock()
+
+    def _build_chain(self, template: str, **llm_options):
+        prompt = ChatPromptTemplate.from_template(template)
+        if not self.hosts:
+            return prompt | OllamaLLM(model=self.model, keep_alive=self.keep_alive, **llm_options)
+        if self.router is None:
+            self.router = OllamaRouter(self.hosts, log=self.log)
+        timeout = self.router.timeout
+        return RoutedChain(
+            self.router,
+            lambda url: prompt | OllamaLLM(model=self.model, base_url=url, keep_alive=self.keep_alive,
+                                           client_kwargs={'timeout': timeout}, **llm_options),
+            estimate_tokens,
+        )
+
+    @property
+    def chain(self):
+        """Build the prompt | llm chain on first use and reuse it afterwards."""
+        if self._chain is None:
+            with self._chain_lock:
+                if self._chain is None:
+                    self._chain = self._build_chain(self.template)
+        return self._chain
+
+    @property
+    def batch_chain(self):
+        """Chain for multi-job prompts, with Ollama constrained to JSON output."""
+        if self._batch_chain is None:
+            with self._chain_lock:
+                if self._batch_chain is None:
+                    self._batch_chain = self._build_chain(self.batch_template, format="json")
+        return self._batch_chain
+
+    def use_hosts(self, hosts: List[str]):
+        """Switch to other Ollama endpoints; chains are rebuilt on next use."""
+        if isinstance(hosts, str):
+            hosts = [host.strip() for host in hosts.split(",") if host.strip()]
+        hosts = list(hosts)
+        if hosts == self.hosts:
+            return
+        with self._chain_lock:
+            if self.router is not None:
+                self.router.close()
+            self.hosts = hosts
+            self.router = None
+            self._chain = None
+            self._batch_chain = None
+
+    def use_keep_alive(self, keep_alive: Optional[str]):
+        """Change how long Ollama keeps the model loaded; chains are rebuilt on next use."""
+        if keep_alive == self.keep_alive:
+            return
+        with self._chain_lock:
+            self.keep_alive = keep_alive
+            self._chain = None
+            self._batch_chain = None
+
+    def _cache_key(self, resume: str, job_description: str, batched: bool = False) -> Optional[str]:
+        """Key under the template that produces the verdict: the batch prompt or the single one."""
+        if self.cache is None or not self.use_cache:
+            return None
+        template = self.batch_template if batched else self.template
+        return VerdictCache.make_key(resume, job_description, self.model, template)
+
+    def _cached(self, resume: str, job_description: str) -> Optional[str]:
+        """Cached verdict from the current mode's prompt, or from a single call in batch mode."""
+        if self.cache is None or not self.use_cache:
+            return None
+        if self.batch_size == 1:
+            return self.cache.get(self._cache_key(resume, job_description))
+        # Two probes, counted as one lookup
+        cached = self.cache.get(self._cache_key(resume, job_description, batched=True), count=False)
+        if cached is None:
+            cached = self.cache.get(self._cache_key(resume, job_description), count=False)
+        self.cache.record(cached is not None)
+        return cached
+
+    def _timed(self, chain, inputs: dict) -> str:
+        if self.metrics is None:
+            return chain.invoke(inputs)
+        start = time.perf_counter()
+        try:
+            result = chain.invoke(inputs)
+        except Exception:
+            self.metrics.add('llm_calls', outcome="error")
+            raise
+        self.metrics.observe('llm_latency_seconds', time.perf_counter() - start)
+        self.metrics.add('llm_calls', outcome="ok")
+        self.metrics.add('llm_completion_tokens', estimate_tokens(result))
+        return result
+
+    def _invoke(self, resume: str, job_description: str) -> str:
+        self.stats.add("unbatched", estimate_tokens(self.template) + estimate_tokens(resume)
+                       + estimate_tokens(str(job_description)), 1)
+        result = self._timed(self.chain, {
+            "resume": resume,
+            "job_description": job_description
+        })
+        return result.strip()
+
+    def _invoke_batch(self, resume: str, descriptions: List[str],
+                      cancel_event: Optional[threading.Event] = None) -> List[Tuple[str, bool, bool]]:
+        """Score several jobs in one prompt, falling back to single calls.
+
+        Returns (category, ok, batched) per description; ok is False for jobs
+        that errored or were skipped after cancellation and should not be
+        kept, batched is False for verdicts from the single-call fallback.
+        """
+        jobs = "\n\n".join(
+            f"Job {number}:\n{description}" for number, description in enumerate(descriptions, start=1)
+        )
+        try:
+            self.stats.add("batched", estimate_tokens(self.batch_template) + estimate_tokens(resume)
+                           + estimate_tokens(jobs), len(descriptions))
+            verdicts = parse_batch_response(
+                self._timed(self.batch_chain, {"resume": resume, "jobs": jobs}), len(descriptions)
+            )
+        except Exception as e:
+            self.log(f"Batch analysis failed, scoring jobs one at a time: {str(e)}")
+            verdicts = {}
+
+        if len(verdicts) < len(descriptions):
+            self.log(f"Batch reply covered {len(verdicts)}/{len(descriptions)} jobs, scoring the rest individually")
+
+        results = []
+        for number, description in enumerate(descriptions, start=1):
+            if number in verdicts:
+                results.append((verdicts[number], True, True))
+                continue
+            if cancel_event is not None and cancel_event.is_set():
+                results.append((ANALYSIS_ERROR, False, False))
+                continue
+            try:
+                results.append((self._invoke(resume, description), True, False))
+            except Exception as e:
+                self.log(f"Error in job analysis: {str(e)}")
+                results.append((ANALYSIS_ERROR, False, False))
+        return results
+
+    def score_all(self, resume: Optional[str], descriptions: List[str],
+                  on_result: Optional[Callable[[int, str], None]] = None,
+                  cancel_event: Optional[threading.Event] = None) -> List[str]:
+        """Categorize descriptions with at most max_workers LLM calls in flight.
+
+        With batch_size > 1, up to batch_size jobs share one prompt. Results
+        are returned in input order. A failing job is recorded as
+        "Analysis Error" without holding up the others. ``on_result`` is
+        called from the calling thread as each job finishes. Setting
+        ``cancel_event`` drops every call that has not started yet; those
+        jobs are left as None.
+        """
+        results = [None] * len(descriptions)
+        if not resume:
+            for index in range(len(descriptions)):
+                results[index] = NO_RESUME
+                if on_result:
+                    on_result(index, NO_RESUME)
+            return results
+
+        # Answer what we can from the cache before touching the LLM
+        pending = {}
+        for index, description in enumerate(descriptions):
+            cached = self._cached(resume, description)
+            if cached is not None:
+                results[index] = cached
+                if on_result:
+                    on_result(index, cached)
+            else:
+                pending[index] = description
+
+        if not pending:
+            return results
+
+        indices = list(pending)
+        groups = [indices[start:start + self.batch_size] for start in range(0, len(indices), self.batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for group in groups:
+                group_descriptions = [pending[index] for index in group]
+                if self.batch_size > 1:
+                    future = executor.submit(self._invoke_batch, resume, group_descriptions, cancel_event)
+                else:
+                    future = executor.submit(self._invoke, resume, group_descriptions[0])
+                futures[future] = group
+
+            outstanding = len(futures)
+            for future in as_completed(futures):
+                outstanding -= 1
+                if self.metrics is not None:
+                    self.metrics.observe('llm_queue_depth', outstanding)
+                group = futures[future]
+                try:
+                    outcome = future.result()
+                    if self.batch_size == 1:
+                        outcome = [(outcome, True, False)]
+                except Exception as e:
+                    self.log(f"Error in job analysis: {str(e)}")
+                    outcome = [(ANALYSIS_ERROR, False, False)] * len(group)
+
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                for index, (category, ok, batched) in zip(group, outcome):
+                    if cancelled and not ok:
+                        continue
+                    key = self._cache_key(resume, pending[index], batched)
+                    if ok and key is not None:
+                        self.cache.put(key, category)
+                    results[index] = category
+                    if on_result:
+                        on_result(index, category)
+
+                if cancelled:
+                    for other in futures:
+                        other.cancel()
+                    break
+
+        return results
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from jobspy import scrape_jobs
+
+from compact import concat_jobs
+from worker import Cancelled
+
+
+def _scrape_site(params: dict, site: str) -> pd.DataFrame:
+    site_params = dict(params)
+    site_params['site_name'] = [site]
+    return scrape_jobs(**site_params)
+
+
+def scrape_sites(params: dict, timeout: float = 120, log: Optional[Callable[[str], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 poll_interval: float = 0.2,
+                 ingest: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Run one scrape_jobs call per site in parallel and merge what comes back.
+
+    Each site gets its own ``timeout`` in seconds. A site that fails or runs
+    late is recorded and skipped, so the other sites' results survive.
+    scrape_jobs cannot be interrupted, so a late site's thread is abandoned
+    and its eventual result discarded. ``ingest`` is applied to each site's
+    frame as it arrives, e.g. to drop unused columns before the merge.
+
+    Returns the merged jobs (in the order sites were given) and one record
+    per site: {'site', 'jobs', 'seconds', 'error'}.
+    """
+    log = log or (lambda message: None)
+    sites = list(params['site_name'])
+    if not sites:
+        return pd.DataFrame(), []
+
+    executor = ThreadPoolExecutor(max_workers=len(sites), thread_name_prefix="scrape")
+    started = time.perf_counter()
+    futures = {executor.submit(_scrape_site, params, site): site for site in sites}
+    frames = {}
+    records = {}
+
+    try:
+        pending = set(futures)
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                raise Cancelled()
+
+            done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            elapsed = time.perf_counter() - started
+            for future in done:
+                site = futures[future]
+                try:
+                    frame = future.result()
+                except Exception as e:
+                    records[site] = {'site': site, 'jobs': 0, 'seconds': round(elapsed, 2), 'error': str(e)}
+                    log(f"{site}: failed after {elapsed:.1f}s: {str(e)}")
+                    continue
+                frames[site] = ingest(frame) if ingest is not None and len(frame) else frame
+                records[site] = {'site': site, 'jobs': len(frame), 'seconds': round(elapsed, 2), 'error': None}
+                log(f"{site}: {len(frame)} jobs in {elapsed:.1f}s")
+
+            if elapsed > timeout:
+                for future in pending:
+                    site = futures[future]
+                    future.cancel()
+                    records[site] = {'site': site, 'jobs': 0, 'seconds': round(elapsed, 2),
+                                     'error': f"timed out after {timeout:.0f}s"}
+                    log(f"{site}: timed out after {timeout:.0f}s, skipping")
+                pending = set()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    merged = [frames[site] for site in sites if site in frames and len(frames[site])]
+    jobs = concat_jobs(merged)
+    return jobs, [records[site] for site in sites]
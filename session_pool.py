@@ -0,0 +1,102 @@
+import importlib
+import threading
+import time
+
+# jobspy modules that build a session per scrape, keyed by site name
+JOBSPY_MODULES = {
+    'indeed': 'jobspy.scrapers.indeed',
+    'linkedin': 'jobspy.scrapers.linkedin',
+    'zip_recruiter': 'jobspy.scrapers.ziprecruiter',
+    'glassdoor': 'jobspy.scrapers.glassdoor',
+    'google': 'jobspy.scrapers.google',
+}
+
+
+class SessionPool:
+    """Reuse jobspy's HTTP sessions across scrapes instead of opening new ones.
+
+    scrape_jobs builds a fresh session (and TLS connections) for every site
+    on every call. While installed, each site's ``create_session`` hands back
+    the session made earlier with the same settings, so repeated runs keep
+    their connections alive. Sessions older than ``max_age`` seconds are
+    closed and replaced, which also bounds the cookies they collect.
+
+    One session per site and settings is shared, so concurrent scrapes of
+    the same site (e.g. a search matrix) should not run under the pool.
+    """
+
+    def __init__(self, max_age: float = 3600):
+        self.max_age = max_age
+        self.created = 0
+        self.reused = 0
+        self._sessions = {}
+        self._originals = []
+        self._lock = threading.Lock()
+
+    def session(self, site: str, create, **kwargs):
+        key = (site, tuple(sorted((name, repr(value)) for name, value in kwargs.items())))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and now - entry[1] < self.max_age:
+                self.reused += 1
+                return entry[0]
+            if entry is not None:
+                self._close(entry[0])
+            session = create(**kwargs)
+            self._sessions[key] = (session, now)
+            self.created += 1
+            return session
+
+    @staticmethod
+    def _close(session):
+        close = getattr(session, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def install(self) -> "SessionPool":
+        """Route every jobspy scraper's ``create_session`` through the pool."""
+        for site, module_name in JOBSPY_MODULES.items():
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                continue
+            original = getattr(module, 'create_session', None)
+            if original is None:
+                continue
+
+            def pooled(*, _site=site, _create=original, **kwargs):
+                return self.session(_site, _create, **kwargs)
+
+            self._originals.append((module, original))
+            module.create_session = pooled
+        return self
+
+    def uninstall(self):
+        for module, original in reversed(self._originals):
+            module.create_session = original
+        self._originals = []
+
+    def clear(self):
+        """Close every pooled session; the next scrape of each site opens a new one."""
+        with self._lock:
+            for session, _ in self._sessions.values():
+                self._close(session)
+            self._sessions = {}
+
+    def stats(self, reset: bool = False) -> str:
+        report = f"HTTP sessions: {self.reused} reused, {self.created} opened, {len(self._sessions)} pooled"
+        if reset:
+            self.created = self.reused = 0
+        return report
+
+    def __enter__(self) -> "SessionPool":
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+        self.clear()
+
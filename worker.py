@@ -0,0 +1,128 @@
+import importlib
+import queue
+import threading
+from typing import Callable, Iterable, List, Optional
+
+
+class Cancelled(Exception):
+    """Raised inside a background task once the user presses Cancel."""
+
+
+def run_cancellable(func: Callable, cancel_event: threading.Event, poll_interval: float = 0.2):
+    """Run a blocking call on a helper thread, giving up early if cancelled.
+
+    Calls like scrape_jobs cannot be interrupted, so on cancel the helper
+    thread is left to finish in the background and its result is discarded.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    while thread.is_alive():
+        thread.join(poll_interval)
+        if cancel_event.is_set():
+            raise Cancelled()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+class TaskRunner:
+    """Run one task at a time on a worker thread and relay its output to Tk.
+
+    Worker code only talks to the UI through ``log`` and ``call``, which put
+    items on a queue. The Tk loop drains the queue on a timer, inserting all
+    pending log lines in a single update. ``log`` is also safe to use from
+    the Tk thread itself.
+    """
+
+    def __init__(self, root, on_logs: Callable[[List[str]], None],
+                 on_finished: Optional[Callable[[], None]] = None, poll_ms: int = 100):
+        self.root = root
+        self.on_logs = on_logs
+        self.on_finished = on_finished
+        self.poll_ms = poll_ms
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self._thread = None
+        self._finish_pending = False
+        self.root.after(self.poll_ms, self._drain)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, target: Callable[[], None]):
+        if self.running:
+            return
+        self.cancel_event = threading.Event()
+        self._finish_pending = True
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+
+    def _run(self, target):
+        try:
+            target()
+        except Cancelled:
+            self.log("Search cancelled")
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise Cancelled()
+
+    def log(self, message: str):
+        """Queue a progress line; safe to call from any thread."""
+        self.queue.put(("log", message))
+
+    def call(self, func: Callable, *args):
+        """Queue func(*args) to run on the Tk thread, e.g. a messagebox."""
+        self.queue.put(("call", func, args))
+
+    def _drain(self):
+        logs = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == "log":
+                logs.append(item[1])
+            else:
+                # Show earlier log lines before running the callback
+                if logs:
+                    self.on_logs(logs)
+                    logs = []
+                item[1](*item[2])
+        if logs:
+            self.on_logs(logs)
+
+        if self._finish_pending and not self.running and self.queue.empty():
+            self._finish_pending = False
+            if self.on_finished:
+                self.on_finished()
+        self.root.after(self.poll_ms, self._drain)
+
+
+def warm_imports(root, modules: Iterable[str], delay_ms: int = 200):
+    """Import heavy modules on a daemon thread once the window has drawn.
+
+    The first search or upload then finds them already loaded. Failures are
+    ignored here; the real import raises them when the feature is used.
+    """
+    def load():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+    root.after(delay_ms, lambda: threading.Thread(target=load, name="warm-imports", daemon=True).start())